@@ -19,7 +19,7 @@ ANSIBLE_METADATA = {'metadata_version': '1.1',
 DOCUMENTATION = """
 ---
 module: nxos_facts
-version_added: 2.10
+version_added: "2.10"
 short_description: Get facts about nxos devices.
 description:
   - Collects facts from network devices running the nxos operating
@@ -50,6 +50,29 @@ options:
         specific subset should not be collected.
     required: false
     version_added: "2.9"
+  gather_concurrency:
+    description:
+      - The number of network resources gathered in parallel over the device
+        connection. C(1) gathers them one after another.
+    type: int
+    default: 1
+    version_added: "2.10"
+  facts_cache_path:
+    description:
+      - Path of a JSON file in which the resource facts read from the device
+        are cached, keyed by host and resource.
+      - Later tasks against the same host read the facts from the cache while
+        the entry is younger than I(facts_cache_ttl) and the device reports
+        the same C(show accounting log last-index).
+      - The entries of a host are dropped whenever its config is edited.
+    type: path
+    version_added: "2.10"
+  facts_cache_ttl:
+    description:
+      - Seconds a cached facts entry stays valid.
+    type: int
+    default: 300
+    version_added: "2.10"
 """
 
 EXAMPLES = """
@@ -4,23 +4,11 @@
 # GNU General Public License v3.0+
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-#############################################
-#                WARNING                    #
-#############################################
 #
-# This file is auto generated by the resource
-#   module builder playbook.
+# This file was first generated by the resource module builder and is now
+# maintained by hand. Keep the options documented here in step with
+# module_utils/network/nxos/argspec/static_routes/static_routes.py.
 #
-# Do not edit this file manually.
-#
-# Changes to this file will be over written
-#   by the resource module builder.
-#
-# Changes should be made in the model used to
-#   generate this file or in the resource module
-#   builder template.
-#
-#############################################
 
 """
 The module file for nxos_static_routes
@@ -50,6 +38,80 @@ options:
     description:
       - Used to parse given commands into structured format, only in parsed state
     type: str
+  batch_size:
+    description:
+      - Push the commands in batches of at most this many commands, one after
+        another, instead of all at once.
+      - Batches are split at C(vrf context) boundaries where possible, a vrf
+        context too large for one batch is continued in the next with the
+        C(vrf context) line repeated.
+    type: int
+    version_added: "2.10"
+  config_session:
+    description:
+      - Name of an NX-OS configure session to enter the commands in. The
+        session is committed once every batch is in, so the change is applied
+        as a whole, or aborted if a batch fails.
+    type: str
+    version_added: "2.10"
+  facts_cache_path:
+    description:
+      - Path of a JSON file in which the resource facts read from the device
+        are cached, keyed by host and resource.
+      - Later tasks against the same host read the facts from the cache while
+        the entry is younger than I(facts_cache_ttl) and the device reports
+        the same C(show accounting log last-index).
+      - The entries of a host are dropped whenever its config is edited.
+    type: path
+    version_added: "2.10"
+  facts_cache_ttl:
+    description:
+      - Seconds a cached facts entry stays valid.
+    type: int
+    default: 300
+    version_added: "2.10"
+  gather_mode:
+    description:
+      - How the static routes configuration is read from the device.
+      - C(section) reads the global routes and the vrf context blocks with a
+        single C(show running-config | section) command.
+      - C(full) reads the whole C(show running-config) once and splits it locally.
+      - C(split) reads the global routes and the vrf context blocks with one
+        command each.
+      - C(json) reads the routes as structured data with
+        C(show ip static-route vrf all | json) and
+        C(show ipv6 static-route vrf all | json), and falls back to
+        C(section) when the device does not answer in JSON.
+    type: str
+    choices: ['section', 'full', 'split', 'json']
+    default: section
+    version_added: "2.10"
+  facts_store_path:
+    description:
+      - Path of an SQLite file in which the parsed static routes facts are
+        stored, keyed by a hash of the config text they were parsed from.
+      - Later runs that gather or parse the same config text load the facts
+        from the store instead of parsing it again.
+    type: path
+    version_added: "2.10"
+  facts_store_max_bytes:
+    description:
+      - Size of the stored facts beyond which the least recently used entries
+        of I(facts_store_path) are evicted.
+    type: int
+    default: 67108864
+    version_added: "2.10"
+  facts_validation:
+    description:
+      - How the static routes facts are validated against the argspec.
+      - C(fast) validates and normalizes them in one pass with a validator
+        built once from the argspec, falling back to C(strict) for data it
+        cannot validate.
+      - C(strict) runs them through the generic module argspec validation.
+    type: str
+    choices: ['fast', 'strict']
+    default: fast
+    version_added: "2.10"
   config:
     description:
       - A list of configurations for static routes
@@ -132,6 +194,27 @@ options:
       - rendered
       - parsed
     default: merged
+  verify_after:
+    description:
+      - Read the configuration back from the device to build I(after).
+      - By default I(after) is computed from I(before) and the commands
+        pushed, which saves a round trip to the device.
+    type: bool
+    default: False
+    version_added: "2.10"
+  trace:
+    description:
+      - Time the gather, fetch, parse, validate, diff and edit_config phases of
+        the run and return the spans in I(timings).
+    type: bool
+    default: False
+    version_added: "2.10"
+  trace_path:
+    description:
+      - Path of a file the spans are appended to, one JSON object per line.
+      - Turns the tracing on, like I(trace).
+    type: path
+    version_added: "2.10"
 """
 EXAMPLES = """
 # Using deleted:
@@ -389,6 +472,22 @@ commands:
   returned: always
   type: list
   sample: ['command 1', 'command 2', 'command 3']
+plan:
+  description: The number of commands and their size in bytes and, once
+    pushed, the seconds the device took to apply them, in total and for every
+    batch.
+  returned: when changed
+  type: dict
+  sample: {'commands': 20001, 'bytes': 1302035, 'apply_time': 41.2,
+           'batches': [{'commands': 1000, 'elapsed': 2.1}]}
+timings:
+  description: The timed spans of the run, with the epoch time each started at,
+    the seconds it took, its id and the id of the span it is nested in as its
+    parent, e.g. the gather a fetch is part of.
+  returned: when trace or trace_path is set
+  type: list
+  sample: [{'name': 'fetch', 'resource': 'static_routes', 'commands': 1,
+            'start': 1571234567.1, 'elapsed': 0.812, 'id': 2, 'parent': 1}]
 """
 
 
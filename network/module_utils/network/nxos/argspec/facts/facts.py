@@ -24,4 +24,7 @@ class FactsArgs(object):  # pylint: disable=R0903
         'gather_subset': dict(default=['!config'], type='list'),
         'gather_network_resources': dict(choices=choices,
                                          type='list'),
+        'gather_concurrency': dict(default=1, type='int'),
+        'facts_cache_path': dict(type='path'),
+        'facts_cache_ttl': dict(default=300, type='int'),
     }
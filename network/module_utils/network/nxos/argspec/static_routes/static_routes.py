@@ -4,23 +4,13 @@
 # GNU General Public License v3.0+
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
-#############################################
-#                WARNING                    #
-#############################################
 #
-# This file is auto generated by the resource
-#   module builder playbook.
+# This file was first generated by the resource module builder and is now
+# maintained by hand. The config options follow the resource model, the
+# other options tune how the module gathers, validates and pushes the
+# config. Keep the options documented in library/nxos_static_routes.py in
+# step with this file.
 #
-# Do not edit this file manually.
-#
-# Changes to this file will be over written
-#   by the resource module builder.
-#
-# Changes should be made in the model used to
-#   generate this file or in the resource module
-#   builder template.
-#
-#############################################
 """
 The arg spec for the nxos_static_routes module
 """
@@ -92,6 +82,36 @@ class Static_routesArgs(object):  # pylint: disable=R0903
             },
             'type': 'list'
         },
+        'batch_size': {
+            'type': 'int'
+        },
+        'config_session': {
+            'type': 'str'
+        },
+        'facts_cache_path': {
+            'type': 'path'
+        },
+        'facts_cache_ttl': {
+            'default': 300,
+            'type': 'int'
+        },
+        'facts_store_max_bytes': {
+            'default': 67108864,
+            'type': 'int'
+        },
+        'facts_store_path': {
+            'type': 'path'
+        },
+        'facts_validation': {
+            'choices': ['fast', 'strict'],
+            'default': 'fast',
+            'type': 'str'
+        },
+        'gather_mode': {
+            'choices': ['section', 'full', 'split', 'json'],
+            'default': 'section',
+            'type': 'str'
+        },
         'running_config': {
             'type': 'str'
         },
@@ -104,5 +124,16 @@ class Static_routesArgs(object):  # pylint: disable=R0903
             'merged',
             'type':
             'str'
+        },
+        'trace': {
+            'default': False,
+            'type': 'bool'
+        },
+        'trace_path': {
+            'type': 'path'
+        },
+        'verify_after': {
+            'default': False,
+            'type': 'bool'
         }
     }  # pylint: disable=C0301
@@ -0,0 +1,185 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Reconciliation of the static routes of many nxos devices
+It is in this file that the static routes of every device of an inventory
+are brought to their desired state from one process, with a bounded
+number of devices in flight, instead of one module process per device.
+"""
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import time
+from multiprocessing.pool import ThreadPool
+
+from ansible.module_utils.network.common.utils import generate_dict
+from ansible.module_utils.network.nxos.argspec.static_routes.static_routes import Static_routesArgs
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+from ansible.module_utils.network.nxos.utils.nxapi import NxapiConnection
+from ansible.module_utils.network.nxos.utils.utils import SpecValidationError, spec_validator
+
+
+class ReconcileError(Exception):
+    pass
+
+
+class ReconcileModule(object):
+    """ Stands in for the AnsibleModule of a device, so that the config
+        and facts classes run unchanged against its connection
+    """
+
+    def __init__(self, params, connection, check_mode=False):
+        self.params = params
+        self.check_mode = check_mode
+        # get_resource_connection returns the connection set on the module
+        self._connection = connection
+        self._socket_path = None
+
+        self.warnings = []
+
+    def warn(self, warning):
+        self.warnings.append(warning)
+
+    def fail_json(self, msg, **kwargs):
+        raise ReconcileError(msg)
+
+
+def nxapi_connection(host_vars):
+    """ The default connection factory, an NX-API connection built from
+        the connection variables of the device, e.g.
+        {'ansible_host': '192.0.2.1', 'ansible_user': 'admin',
+         'ansible_password': '...', 'nxos_use_ssl': False}
+    """
+    return NxapiConnection(
+        host_vars['ansible_host'],
+        host_vars.get('ansible_user'),
+        host_vars.get('ansible_password'),
+        port=host_vars.get('ansible_port'),
+        use_ssl=host_vars.get('nxos_use_ssl', True),
+        validate_certs=host_vars.get('nxos_validate_certs', True),
+        timeout=host_vars.get('ansible_command_timeout', 30))
+
+
+def socket_connection(host_vars):
+    """ The persistent connection whose socket_path the inventory gives
+        for the device, e.g. from a controller that already runs
+        ansible-connection for it
+    """
+    from ansible.module_utils.connection import Connection
+    return Connection(host_vars['socket_path'])
+
+
+_validate_params = spec_validator(Static_routesArgs.argument_spec)
+
+
+def get_params(desired):
+    """ The module params of a device from its desired state
+
+    :param desired: the module options, e.g. state and config
+    :rtype: dictionary
+    :returns: the params validated against the whole argspec, with its
+              defaults
+    """
+    params = generate_dict(Static_routesArgs.argument_spec)
+    try:
+        params.update(_validate_params(desired))
+    except SpecValidationError as exc:
+        raise ReconcileError(str(exc))
+    return params
+
+
+def reconcile_host(host, host_vars, desired, connection_factory=None, check_mode=False):
+    """ Bring the static routes of a device to their desired state
+
+    :param host: the device name
+    :param host_vars: the inventory variables of the device
+    :param desired: the module options of the device, e.g. state and config
+    :param connection_factory: builds the connection from the host_vars
+    :param check_mode: only compute the commands
+    :rtype: dictionary
+    :returns: the module result with the host and the seconds it took,
+              or the host and the error
+    """
+    start = time.time()
+    result = {'host': host}
+    try:
+        params = get_params(desired)
+        connection = (connection_factory or nxapi_connection)(host_vars)
+        module = ReconcileModule(params, connection, check_mode)
+        result.update(Static_routes(module).execute_module())
+        if module.warnings:
+            result['warnings'] = result.get('warnings', []) + module.warnings
+    except Exception as exc:
+        result['failed'] = True
+        result['msg'] = str(exc)
+    result['elapsed'] = time.time() - start
+    return result
+
+
+def iter_reconciled(inventory, desired_state, connection_factory=None,
+                    concurrency=32, check_mode=False):
+    """ Reconcile every device of the inventory, concurrency devices at
+        a time
+
+    :param inventory: {device name: inventory variables}
+    :param desired_state: {device name: module options}, the options under
+                          'default' apply to the devices without an entry
+    :param connection_factory: builds the connection of a device from its
+                               inventory variables, nxapi_connection by default
+    :param concurrency: the most devices in flight
+    :param check_mode: only compute the commands
+    :rtype: generator
+    :returns: the result of reconcile_host for every device, in the order
+              the devices finish
+    """
+    default = desired_state.get('default')
+    hosts = [(host, host_vars, desired_state.get(host, default))
+             for host, host_vars in sorted(inventory.items())]
+
+    def reconcile(item):
+        host, host_vars, desired = item
+        if desired is None:
+            return {'host': host, 'skipped': True, 'msg': 'no desired state'}
+        return reconcile_host(host, host_vars, desired, connection_factory, check_mode)
+
+    pool = ThreadPool(max(1, min(concurrency, len(hosts))))
+    try:
+        for result in pool.imap_unordered(reconcile, hosts):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+def reconcile_files(inventory_path, desired_state_path, output, connection_factory=None,
+                    concurrency=32, check_mode=False):
+    """ Reconcile the devices of an inventory file with the desired state
+        file, writing every result to output as a JSON line
+
+    :param inventory_path: a JSON file of {device name: inventory variables}
+    :param desired_state_path: a JSON file of {device name: module options}
+    :param output: the file object the results are written to
+    :param connection_factory: builds the connection of a device from its
+                               inventory variables
+    :param concurrency: the most devices in flight
+    :param check_mode: only compute the commands
+    :rtype: dictionary
+    :returns: the number of devices changed, failed and in total
+    """
+    with open(inventory_path) as f:
+        inventory = json.load(f)
+    with open(desired_state_path) as f:
+        desired_state = json.load(f)
+    summary = {'hosts': 0, 'changed': 0, 'failed': 0}
+    for result in iter_reconciled(inventory, desired_state, connection_factory,
+                                  concurrency, check_mode):
+        output.write(json.dumps(result, sort_keys=True) + '\n')
+        output.flush()
+        summary['hosts'] += 1
+        summary['changed'] += bool(result.get('changed'))
+        summary['failed'] += bool(result.get('failed'))
+    return summary
@@ -14,12 +14,16 @@ created
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import time
+
 from ansible.module_utils.network.common.cfg.base import ConfigBase
-from ansible.module_utils.network.common.utils import to_list, remove_empties, dict_diff
+from ansible.module_utils.network.common.utils import to_list, remove_empties
 from ansible.module_utils.network.nxos.facts.facts import Facts
-from ansible.module_utils.network.nxos.utils.utils import flatten_dict, search_obj_in_list, get_interface_type, normalize_interface
-
-import q
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+from ansible.module_utils.network.nxos.facts.static_routes.model import AddressFamily, Vrf, from_config, normalize_routes
+from ansible.module_utils.network.nxos.utils.utils import normalize_interface, ContextCommands
+from ansible.module_utils.network.nxos.utils.submit import split_batches, submit_batches
+from ansible.module_utils.network.nxos.utils.trace import get_tracer
 
 
 class Static_routes(ConfigBase):
@@ -38,6 +42,8 @@ class Static_routes(ConfigBase):
 
     def __init__(self, module):
         super(Static_routes, self).__init__(module)
+        # the warnings of the last set_state, e.g. on invalid destinations
+        self._warnings = []
 
     def get_static_routes_facts(self, data=None):
         """ Get the 'facts' (the current configuration)
@@ -59,22 +65,49 @@ class Static_routes(ConfigBase):
         :rtype: A dictionary
         :returns: The result from module execution
         """
+        tracer = get_tracer(self._module)
+        existing_static_routes_facts = self.get_static_routes_facts()
+        result, commands = self.get_result(existing_static_routes_facts)
+        if result['changed'] and not self._module.check_mode:
+            start = time.time()
+            with tracer.span('edit_config', commands=len(commands)):
+                result['plan']['batches'] = self.edit_config(commands)
+            result['plan']['apply_time'] = time.time() - start
+            Facts(self._module).invalidate_cache()
+        if result['changed']:
+            if self._module.params.get('verify_after'):
+                result['after'] = self.get_static_routes_facts()
+            else:
+                result['after'] = self.get_after_facts(
+                    existing_static_routes_facts, commands)
+        if tracer.enabled:
+            result['timings'] = tracer.spans
+        return result
+
+    def get_result(self, existing_static_routes_facts):
+        """ Compute the commands and the module result, short of pushing
+            the commands and of the configuration after them
+
+        :param existing_static_routes_facts: the current configuration
+        :rtype: tuple
+        :returns: the result and the commands to push, result['changed']
+                  tells whether they are to be pushed
+        """
         result = {'changed': False}
         warnings = list()
         commands = list()
         state = self._module.params['state']
-        existing_static_routes_facts = self.get_static_routes_facts()
         result['before'] = existing_static_routes_facts
-        q(state)
         if state == 'gathered':
             result['gathered'] = result['before']
             del result['before']
         else:
-            commands.extend(self.set_config(existing_static_routes_facts))
+            with get_tracer(self._module).span('diff', state=state):
+                commands.extend(self.set_config(existing_static_routes_facts))
+            warnings.extend(self._warnings)
             action_states = ['merged', 'replaced', 'deleted', 'overridden']
             if commands and state in action_states:
-                if not self._module.check_mode:
-                    self._connection.edit_config(commands)
+                result['plan'] = self.get_plan_size(commands)
                 result['changed'] = True
                 result['commands'] = commands
             if state == 'rendered':
@@ -83,13 +116,87 @@ class Static_routes(ConfigBase):
             elif state == 'parsed':
                 result['parsed'] = commands
                 del result['before']
-            changed_static_routes_facts = self.get_static_routes_facts()
-            if result['changed']:
-                result['after'] = changed_static_routes_facts
-
         result['warnings'] = warnings
-        q(result)
-        return result
+        return result, commands
+
+    def edit_config(self, commands):
+        """ Push the commands to the device, in batches of batch_size
+            commands split at 'vrf context ..' boundaries, within the
+            configure session config_session if it is set
+
+        :param commands: the commands
+        :rtype: A list
+        :returns: the number of commands and the seconds it took for every batch
+        """
+        batch_size = self._module.params.get('batch_size')
+        session = self._module.params.get('config_session')
+        if not batch_size and not session:
+            start = time.time()
+            self._connection.edit_config(commands)
+            return [{'commands': len(commands), 'elapsed': time.time() - start}]
+        return submit_batches(self._connection, split_batches(commands, batch_size), session)
+
+    def get_plan_size(self, commands):
+        """ The size of the commands
+
+        :param commands: the commands to push
+        :rtype: A dictionary
+        :returns: the number of commands and their bytes
+        """
+        return {
+            'commands': len(commands),
+            'bytes': sum(len(command) + 1 for command in commands),
+        }
+
+    def get_after_facts(self, existing_static_routes_facts, commands):
+        """ Compute the configuration after the commands are applied,
+            without reading it back from the device
+
+        :param existing_static_routes_facts: the configuration before
+        :param commands: the commands applied to the device
+        :rtype: A list
+        :returns: the configuration after the commands as a list of
+                  dictionaries
+        """
+        config = ContextCommands()
+        # the full command of every next hop, by the part identifying it
+        full_commands = {}
+        parser = Static_routesFacts(self._module)
+        for h in from_config(existing_static_routes_facts):
+            context = self.vrf_context(h.name)
+            for af in h.address_families:
+                for ro in af.routes:
+                    for nh in ro.next_hops:
+                        command = self.route_command(af.afi, ro.dest, nh)
+                        config.add(context, command)
+                        full_commands[(context, self.route_command(
+                            af.afi, ro.dest, nh, True))] = command
+        context = None
+        for command in commands:
+            if command.startswith('vrf context '):
+                context = command
+            elif command.startswith('no '):
+                config.discard(context, command[3:])
+            else:
+                afi, dest, next_hop = parser.get_command(command)
+                key = (context, self.route_command(afi, dest, next_hop, True))
+                # the device replaces the next hop the command names, e.g.
+                # a new preference replaces the old one
+                replaced = full_commands.get(key)
+                if replaced is not None:
+                    config.discard(context, replaced)
+                full_commands[key] = command
+                config.add(context, command)
+        lines = []
+        for header, group in config.groups():
+            if header == self.vrf_context('__global__'):
+                lines.extend(group)
+            else:
+                lines.append(header)
+                lines.extend('  ' + command for command in group)
+        if not lines:
+            return []
+        return self.get_static_routes_facts(lines)
 
     def set_config(self, existing_static_routes_facts):
         """ Collect the configuration from the args passed to the module,
@@ -100,7 +207,6 @@ class Static_routes(ConfigBase):
                   to the desired configuration
         """
         config = self._module.params['config']
-        q(config)
         want = []
         if config:
             for w in config:
@@ -119,165 +225,152 @@ class Static_routes(ConfigBase):
                   to the desired configuration
         """
         state = self._module.params['state']
-        commands = []
+        if state == 'parsed':
+            want = self._module.params['running_config']
+            return self._state_parsed(want)
+        # the state handlers work on the model, not on the dictionaries
+        want = from_config(want)
+        have = from_config(have)
+        # the wanted destinations in the form the device shows them, e.g.
+        # without host bits, like the facts have them
+        self._warnings = normalize_routes(
+            af for vrf in want for af in vrf.address_families)
+        commands = ContextCommands()
+        self.index_have(have)
         if state == 'overridden':
             commands = (self._state_overridden(want, have))
         elif state == 'deleted':
             commands = (self._state_deleted(want, have))
         elif state == 'rendered':
             commands = self._state_rendered(want, have=[])
-        elif state == 'parsed':
-            want = self._module.params['running_config']
-            commands = self._state_parsed(want)
         else:
             for w in want:
                 if state == 'merged':
                     commands.extend(self._state_merged(w, have))
-                    q(commands)
                 elif state == 'replaced':
                     commands.extend(self._state_replaced(w, have))
-                    q(commands)
-        q(commands)
-        return commands
+        return list(commands)
+
+    def index_have(self, have):
+        """ Index the current configuration once per run so that the
+            state handlers look up vrfs, routes and next hops by key
+
+        Only the vrfs are indexed up front, the routes of a vrf are indexed
+        the first time the vrf is looked up, so a run only pays for the
+        vrfs it touches.
+
+        :param have: the current configuration as a list of Vrf
+        """
+        self._have_vrfs = dict((h.name, h) for h in have)
+        self._have_routes = {}
+
+    def get_have_routes(self, vrf):
+        """ The current next hops of a vrf
+
+        :param vrf: the vrf name
+        :rtype: A dictionary
+        :returns: {next hop key: NextHop} by (afi, route key)
+        """
+        routes = self._have_routes.get(vrf)
+        if routes is None:
+            routes = self._have_routes[vrf] = {}
+            h = self._have_vrfs.get(vrf)
+            if h:
+                for af in h.address_families:
+                    for ro in af.routes:
+                        next_hops = routes.setdefault((af.afi, ro.key()), {})
+                        for nh in ro.next_hops:
+                            next_hops[nh.key()] = nh
+        return routes
 
     def _state_parsed(self, want):
-        q(want)
         d = (self.get_static_routes_facts(want))
-        q(d)
         return d
 
     def _state_rendered(self, want, have):
-        commands = []
+        commands = ContextCommands()
         for w in want:
             commands.extend(self.set_commands(w, {}))
-        q(commands)
         return commands
 
     def _state_replaced(self, want, have):
         """ The command generator when state is replaced
 
-        :rtype: A list
+        :rtype: ContextCommands
         :returns: the commands necessary to migrate the current configuration
                   to the desired configuration
         """
-        commands = []
-        delete_commands = []
-        merged_commands = []
-        q(have)
-        obj_in_have = search_obj_in_list(want['vrf'], have, 'vrf')
-        q(obj_in_have)
-        if obj_in_have and obj_in_have != {'vrf': '__global__'}:
-            afi_list = [w['afi'] for w in want['address_families']]
-            q(afi_list)
-            for h in obj_in_have['address_families']:
-                if h['afi'] in afi_list:
-                    q(h['afi'], want)
-                    want_afi = search_obj_in_list(
-                        h['afi'], want['address_families'], 'afi')
-                    q(want_afi)
-                    want_dest_list = [w['dest'] for w in want_afi['routes']]
-                    for ro in h['routes']:
-                        if ro['dest'] in want_dest_list:
-                            q(ro)
-                            want_dest = search_obj_in_list(
-                                ro['dest'], want_afi['routes'], 'dest')
-                            want_next_hops = [
-                                nh for nh in want_dest['next_hops']]
-                            q(want_next_hops)
-                            for next_hop in ro['next_hops']:
-                                if next_hop in want_next_hops:
-                                    {}
-                                else:
-                                    q(next_hop)
-                                    if obj_in_have['vrf'] is '__global__':
-                                        obj_in_have['vrf'] = 'default'
-                                    if h['afi'] == 'ipv4':
-                                        com = 'no ip route ' + \
-                                            ro['dest'] + ' ' + \
-                                            self.add_commands(next_hop)
-                                        q(com)
-
-                                    else:
-                                        com = 'no ipv6 route ' + \
-                                            ro['dest'] + ' ' + \
-                                            self.add_commands(next_hop)
-                                    delete_commands.append(com.strip())
-                                    # string = 'vrf context ' + \
-                                    #     str(obj_in_have['vrf'])
-                                    # if string not in delete_commands:
-                                    #     delete_commands.insert(0, string)
+        commands = ContextCommands()
+        delete_commands = ContextCommands()
+        obj_in_have = self._have_vrfs.get(want.name)
+        if obj_in_have:
+            context = self.vrf_context(obj_in_have.name)
+            want_afs = dict((w.afi, w) for w in want.address_families)
+            for h in obj_in_have.address_families:
+                want_afi = want_afs.get(h.afi)
+                if want_afi:
+                    want_dests = dict((w.key(), w) for w in want_afi.routes)
+                    for ro in h.routes:
+                        want_dest = want_dests.get(ro.key())
+                        if want_dest:
+                            want_next_hops = set(
+                                nh.key() for nh in want_dest.next_hops)
+                            for next_hop in ro.next_hops:
+                                if next_hop.key() not in want_next_hops:
                                     # delete next_hop
+                                    delete_commands.add(context, 'no ' + self.route_command(
+                                        h.afi, ro.dest, next_hop))
                         else:
-                            delete_dict = {'vrf': obj_in_have['vrf'], 'address_families': [
-                                {'afi': h['afi'], 'routes':[ro]}]}
-                            q(delete_dict)
-                            delete_commands.extend(
-                                self.del_commands([delete_dict]))
-                            # delete ro['dest']
+                            # delete ro.dest
+                            delete_commands.extend(self.del_commands(
+                                [Vrf(obj_in_have.name, [AddressFamily(h.afi, [ro])])]))
                 else:
-                    q(h)
+                    # delete h.afi
                     delete_commands.extend(self.del_commands(
-                        [{'address_families': [h], 'vrf': obj_in_have['vrf']}]))
-                    # delete h['afi']
-        q(delete_commands)
-        final_delete_commands = []
-        for d in delete_commands:
-            if d not in final_delete_commands:
-                final_delete_commands.append(d)
-        # if there are two afis, 'vrf context..' is added twice fom del_commands. set() gets unique commands
-        merged_commands = (self.set_commands(want, have))
-        q(merged_commands)
-        if merged_commands:
-            cmds = set(final_delete_commands).intersection(
-                set(merged_commands))
-            for cmd in cmds:
-                merged_commands.remove(cmd)
-        q(merged_commands)
-        commands.extend(final_delete_commands)
+                        [Vrf(obj_in_have.name, [h])]))
+        merged_commands = (self.set_commands(
+            want, self.get_have_routes(want.name)))
+        # the deletes and the merges of a vrf share one 'vrf context ..'
+        commands.extend(delete_commands)
         commands.extend(merged_commands)
-        q(commands)
         return commands
 
     def _state_overridden(self, want, have):
         """ The command generator when state is overridden
 
-        :rtype: A list
+        :rtype: ContextCommands
         :returns: the commands necessary to migrate the current configuration
                   to the desired configuration
         """
-        commands = []
-        q('at overridden')
-        want_vrfs = [w['vrf'] for w in want]
-        q(want_vrfs)
+        commands = ContextCommands()
+        want_vrfs = set(w.name for w in want)
         for h in have:
-            if h['vrf'] not in want_vrfs:
-                q(h['vrf'])
+            if h.name not in want_vrfs:
                 commands.extend(self._state_deleted([h], have))
         for w in want:
-            q('inside over2')
             commands.extend(self._state_replaced(w, have))
         return commands
 
     def _state_merged(self, want, have):
         """ The command generator when state is merged
 
-        :rtype: A list
+        :rtype: ContextCommands
         :returns: the commands necessary to merge the provided into
                   the current configuration
         """
-        return self.set_commands(want, have)
+        return self.set_commands(want, self.get_have_routes(want.name))
 
     def _state_deleted(self, want, have):
         """ The command generator when state is deleted
 
-        :rtype: A list
+        :rtype: ContextCommands
         :returns: the commands necessary to remove the current configuration
                   of the provided objects
         """
-        commands = []
+        commands = ContextCommands()
         if want:
             for w in want:
-                obj_in_have = search_obj_in_list(w['vrf'], have, 'vrf')
+                obj_in_have = self._have_vrfs.get(w.name)
                 if obj_in_have:
                     commands.extend(self.del_commands([obj_in_have]))
         else:
@@ -285,118 +378,91 @@ class Static_routes(ConfigBase):
                 commands = self.del_commands(have)
         return commands
 
+    def vrf_context(self, vrf):
+        """ The 'vrf context ..' header the routes of a vrf are entered in
+        """
+        if vrf == '__global__':
+            vrf = 'default'
+        return 'vrf context ' + str(vrf)
+
     def del_commands(self, have):
-        commands = []
+        """ Generate the commands removing every next hop of the given
+            vrfs, address families or routes
+
+        :param have: the configuration to remove, as a list of Vrf
+        :rtype: ContextCommands
+        :returns: the commands necessary to remove it
+        """
+        commands = ContextCommands()
         for h in have:
-            if h != {'vrf': '__global__'}:
-                if h['vrf'] == '__global__':
-                    h['vrf'] = 'default'
-                commands.append('vrf context ' + h['vrf'])
-                for af in h['address_families']:
-                    for route in af['routes']:
-                        for next_hop in route['next_hops']:
-                            if af['afi'] == 'ipv4':
-                                command = 'no ip route ' + \
-                                    route['dest'] + ' ' + \
-                                    self.add_commands(next_hop)
-                            else:
-                                command = 'no ipv6 route ' + \
-                                    route['dest'] + ' ' + \
-                                    self.add_commands(next_hop)
-                            commands.append(command.strip())
+            context = self.vrf_context(h.name)
+            for af in h.address_families:
+                for route in af.routes:
+                    for next_hop in route.next_hops:
+                        commands.add(context, 'no ' + self.route_command(
+                            af.afi, route.dest, next_hop))
         return commands
 
+    def route_command(self, afi, dest, next_hop, identity=False):
+        """ The 'ip(v6) route ..' command of a next hop, with identity only
+            the part of it that identifies the next hop
+        """
+        if afi == 'ipv4':
+            com = 'ip route '
+        else:
+            com = 'ipv6 route '
+        if identity:
+            return (com + dest + ' ' + self.next_hop_id(next_hop)).strip()
+        return (com + dest + ' ' + self.add_commands(next_hop)).strip()
+
+    def next_hop_id(self, want):
+        intf = ip = vrf = ''
+        if want.interface is not None:
+            intf = normalize_interface(want.interface) + ' '
+        if want.forward_router_address is not None:
+            ip = want.forward_router_address + ' '
+        if want.dest_vrf is not None:
+            vrf = 'vrf ' + str(want.dest_vrf) + ' '
+        return intf + ip + vrf
+
     def add_commands(self, want):
         command = ''
-        params = want.keys()
         pref = vrf = ip = intf = name = tag = track = ''
-        if 'admin_distance' in params:
-            pref = str(want['admin_distance']) + ' '
-        if 'track' in params:
-            track = 'track ' + str(want['track'])+' '
-        if 'dest_vrf' in params:
-            vrf = 'vrf '+str(want['dest_vrf']) + ' '
-        if 'forward_router_address' in params:
-            ip = want['forward_router_address']+' '
-        if 'interface' in params:
-            intf = normalize_interface(want['interface'])+' '
-        if 'route_name' in params:
-            name = 'name ' + str(want['route_name'])+' '
-        if 'tag' in params:
-            tag = 'tag '+str(want['tag'])+' '
+        if want.admin_distance is not None:
+            pref = str(want.admin_distance) + ' '
+        if want.track is not None:
+            track = 'track ' + str(want.track)+' '
+        if want.dest_vrf is not None:
+            vrf = 'vrf '+str(want.dest_vrf) + ' '
+        if want.forward_router_address is not None:
+            ip = want.forward_router_address+' '
+        if want.interface is not None:
+            intf = normalize_interface(want.interface)+' '
+        if want.route_name is not None:
+            name = 'name ' + str(want.route_name)+' '
+        if want.tag is not None:
+            tag = 'tag '+str(want.tag)+' '
         command = intf+ip+vrf+name+tag+track+pref
         return command
 
-    def set_commands(self, want, have):
-        commands = []
-        h1 = h2 = h3 = {}
-        want = remove_empties(want)
-        vrf_list = []
-        if have:
-            vrf_list = [h['vrf'] for h in have]
-        if want['vrf'] in vrf_list and have != [{'vrf': '__global__'}]:
-            for x in have:
-                if x['vrf'] == want['vrf']:
-                    h1 = x  # this has the 'have' dict with same vrf as want
-            if 'address_families' in h1.keys():
-                afi_list = [h['afi'] for h in h1['address_families']]
-                for af in want['address_families']:
-                    if af['afi'] in afi_list:
-                        for x in h1['address_families']:
-                            if x['afi'] == af['afi']:
-                                h2 = x  # this has the have dict with same vrf and afi as want
-                        dest_list = [h['dest'] for h in h2['routes']]
-                        for ro in af['routes']:
-                            # q(dest_list)
-                            if ro['dest'] in dest_list:
-                                for x in h2['routes']:
-                                    if x['dest'] == ro['dest']:
-                                        h3 = x  # this has the have dict with same vrf, afi and dest as want
-                                next_hop_list = [h for h in h3['next_hops']]
-                                for nh in ro['next_hops']:
-                                    if 'interface' in nh.keys():
-                                        nh['interface'] = normalize_interface(
-                                            nh['interface'])
-                                    if nh not in next_hop_list:
-                                        # no match for next hop in have
-                                        commands = self.set_next_hop(
-                                            want, h2, nh, ro, commands)
-                                        vrf_list.append(want['vrf'])
-                            else:
-                                # no match for dest
-                                for nh in ro['next_hops']:
-                                    commands = self.set_next_hop(
-                                        want, h2, nh, ro, commands)
-                    else:
-                        # no match for afi
-                        for ro in af['routes']:
-                            for nh in ro['next_hops']:
-                                commands = self.set_next_hop(
-                                    want, af, nh, ro, commands)
-        else:
-            # no match for vrf
-            vrf_list.append(want['vrf'])
-            for af in want['address_families']:
-                for ro in af['routes']:
-                    for nh in ro['next_hops']:
-                        commands = self.set_next_hop(
-                            want, af, nh, ro, commands)
-        return commands
+    def set_commands(self, want, have_routes):
+        """ Generate the commands for the next hops in want that are
+            not in have
 
-    def set_next_hop(self, want, h2, nh, ro, commands):
-        if want['vrf'] is '__global__':
-            want['vrf'] = 'default'
-        if h2['afi'] == 'ipv4':
-            com = 'ip route ' + \
-                ro['dest'] + ' ' + \
-                self.add_commands(nh)
-        else:
-            com = 'ipv6 route ' + \
-                ro['dest'] + ' ' + \
-                self.add_commands(nh)
-        commands.append(com.strip())
-        string = 'vrf context ' + \
-            str(want['vrf'])
-        if string not in commands:
-            commands.insert(0, string)
+        :param want: the desired configuration of a vrf, as a Vrf
+        :param have_routes: the current next hops of the vrf, keyed by
+                            (afi, route key) and then by next hop key
+        :rtype: ContextCommands
+        :returns: the commands necessary to add the missing next hops
+        """
+        commands = ContextCommands()
+        context = self.vrf_context(want.name)
+        for af in want.address_families:
+            for ro in af.routes:
+                have_next_hops = have_routes.get((af.afi, ro.key()), {})
+                for nh in ro.next_hops:
+                    if nh.key() not in have_next_hops:
+                        # no match for next hop in have
+                        commands.add(context, self.route_command(
+                            af.afi, ro.dest, nh))
         return commands
@@ -0,0 +1,266 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The facts cache for nxos
+It is in this file that the resource facts read from a device are kept,
+keyed by host and resource, so that tasks touching the same host do not
+read the device config again while it is unchanged, and that the blocks
+of config text already parsed are kept so they are not parsed again.
+"""
+import hashlib
+import json
+import marshal
+import os
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+
+from ansible.module_utils._text import to_bytes
+from ansible.module_utils.six import string_types
+
+
+class FactsCache(object):
+    """ An in-memory LRU cache of resource facts
+
+    An entry is used only while it is younger than the ttl and was stored
+    with the same config checksum the device reports now, never without a
+    checksum.
+    """
+
+    def __init__(self, ttl=300, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, host, resource, checksum=None):
+        """ Look up the facts of a resource
+
+        :param host: the device the facts were read from
+        :param resource: the resource name, e.g. static_routes
+        :param checksum: the current config checksum of the device
+        :rtype: the cached facts or None
+        :returns: the facts if the entry is still valid
+        """
+        key = (host, resource)
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        if (checksum is None or entry['checksum'] != checksum or
+                time.time() - entry['time'] > self.ttl):
+            self._save()
+            return None
+        # re-insert as the most recently used entry
+        self._entries[key] = entry
+        return entry['facts']
+
+    def set(self, host, resource, facts, checksum=None):
+        """ Store the facts of a resource, evicting the least recently
+            used entries beyond max_entries
+
+        :param host: the device the facts were read from
+        :param resource: the resource name, e.g. static_routes
+        :param facts: the facts
+        :param checksum: the config checksum the facts were read at
+        """
+        key = (host, resource)
+        self._entries.pop(key, None)
+        self._entries[key] = {'time': time.time(), 'checksum': checksum,
+                              'facts': facts}
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._save()
+
+    def invalidate(self, host, resource=None):
+        """ Drop the entries of a host, e.g. after its config was edited
+
+        :param host: the device
+        :param resource: only drop this resource, all if None
+        """
+        for key in list(self._entries):
+            if key[0] == host and resource in (None, key[1]):
+                del self._entries[key]
+        self._save()
+
+    def _save(self):
+        pass
+
+
+class JsonFileFactsCache(FactsCache):
+    """ A FactsCache kept in a JSON file, so that it is shared between
+        tasks (and so processes) running against the same hosts
+    """
+
+    def __init__(self, path, ttl=300, max_entries=256):
+        super(JsonFileFactsCache, self).__init__(ttl, max_entries)
+        self.path = path
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    for host, resource, entry in json.load(f):
+                        self._entries[(host, resource)] = entry
+            except ValueError:
+                # a corrupt cache is an empty cache
+                self._entries.clear()
+
+    def _save(self):
+        data = [[key[0], key[1], entry] for key, entry in self._entries.items()]
+        tmp = '%s.%d.tmp' % (self.path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.rename(tmp, self.path)
+
+
+class ParseCache(object):
+    """ An in-memory LRU map from the hash of a block of config text to
+        what was parsed from it, so unchanged blocks are not parsed again
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def digest(text):
+        """ The key of a block of config text
+        """
+        return hashlib.sha1(to_bytes(text)).hexdigest()
+
+    def get(self, key):
+        """ Look up what was parsed from a block
+
+        :param key: the digest of the block text
+        :rtype: the parsed block or None
+        :returns: the parsed block if it is cached
+        """
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._entries[key] = value
+        return value
+
+    def set(self, key, value):
+        """ Store what was parsed from a block, evicting the least
+            recently used blocks beyond max_entries
+
+        :param key: the digest of the block text
+        :param value: the parsed block
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class FactsStore(object):
+    """ An on-disk store of parsed facts in an SQLite file, keyed by the
+        hash of the raw config text they were parsed from
+
+    The facts are serialized with marshal, which loads much faster than
+    JSON. An entry written by another Python or marshal version is a miss.
+    Once the entries take more than max_bytes, the least recently used are
+    evicted.
+    """
+
+    # entries are only read back by the same Python and marshal format
+    FORMAT = '%d.%d/%d' % (sys.version_info[0], sys.version_info[1], marshal.version)
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS facts (digest TEXT PRIMARY KEY, format TEXT, '
+            'device TEXT, size INTEGER, used REAL, data BLOB)')
+        self._db.commit()
+
+    @staticmethod
+    def digest(raw):
+        """ The key of raw config text
+
+        :param raw: the config text, the path of a file holding it, or a
+                    list of command outputs
+        :rtype: str or None
+        :returns: the digest, None for anything else, e.g. a file object
+        """
+        sha = hashlib.sha1()
+        if isinstance(raw, (list, tuple)):
+            for output in raw:
+                if not isinstance(output, string_types):
+                    output = json.dumps(output, sort_keys=True)
+                sha.update(to_bytes(output))
+                sha.update(b'\0')
+        elif isinstance(raw, string_types):
+            if '\n' not in raw and os.path.isfile(raw):
+                with open(raw, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        sha.update(chunk)
+            else:
+                sha.update(to_bytes(raw))
+        else:
+            return None
+        return sha.hexdigest()
+
+    def get(self, digest):
+        """ Look up the facts parsed from a config
+
+        :param digest: the digest of the raw config text
+        :rtype: the stored facts or None
+        :returns: the facts if they are stored
+        """
+        row = self._db.execute(
+            'SELECT format, data FROM facts WHERE digest = ?', (digest,)).fetchone()
+        if row is None or row[0] != self.FORMAT:
+            return None
+        try:
+            facts = marshal.loads(bytes(row[1]))
+        except (EOFError, ValueError, TypeError):
+            return None
+        self._db.execute('UPDATE facts SET used = ? WHERE digest = ?', (time.time(), digest))
+        self._db.commit()
+        return facts
+
+    def set(self, digest, facts, device=None):
+        """ Store the facts parsed from a config, evicting the least
+            recently used entries beyond max_bytes
+
+        :param digest: the digest of the raw config text
+        :param facts: the facts, made of dicts, lists, strings and numbers
+        :param device: the device the config was read from, for reference
+        """
+        data = marshal.dumps(facts)
+        self._db.execute(
+            'INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?, ?)',
+            (digest, self.FORMAT, device, len(data), time.time(), sqlite3.Binary(data)))
+        total = self._db.execute('SELECT SUM(size) FROM facts').fetchone()[0] or 0
+        if total > self.max_bytes:
+            evict = []
+            for old_digest, size in self._db.execute(
+                    'SELECT digest, size FROM facts ORDER BY used'):
+                if total <= self.max_bytes:
+                    break
+                evict.append((old_digest,))
+                total -= size
+            self._db.executemany('DELETE FROM facts WHERE digest = ?', evict)
+        self._db.commit()
+
+
+# the FactsStore of every path opened by this process
+_STORES = {}
+
+
+def get_facts_store(path, max_bytes=64 * 1024 * 1024):
+    """ The FactsStore of a path, opened once per process
+
+    :param path: the SQLite file
+    :param max_bytes: the size the entries are evicted beyond
+    :rtype: FactsStore
+    :returns: the store
+    """
+    store = _STORES.get(path)
+    if store is None:
+        store = _STORES[path] = FactsStore(path, max_bytes)
+    store.max_bytes = max_bytes
+    return store
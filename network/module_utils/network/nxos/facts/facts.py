@@ -10,14 +10,48 @@ calls the appropriate facts gathering function
 """
 from ansible.module_utils.network.nxos.argspec.facts.facts import FactsArgs
 from ansible.module_utils.network.common.facts.facts import FactsBase
-from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+
+
+class LazyFactsClass(object):
+    """ A resource facts class that is imported the first time it is used,
+        so a module only imports the resources it gathers
+
+    The loader imports the class with a literal import statement, the
+    module_utils dependency finder of AnsiballZ only sees those.
+    """
+
+    def __init__(self, loader):
+        self.loader = loader
+        self._cls = None
+
+    def load(self):
+        """ Import the facts class
+
+        :rtype: class
+        :returns: the facts class
+        """
+        if self._cls is None:
+            self._cls = self.loader()
+        return self._cls
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+def _load_static_routes():
+    from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+    return Static_routesFacts
 
 
 FACT_LEGACY_SUBSETS = {}
 FACT_RESOURCE_SUBSETS = dict(
-    static_routes=Static_routesFacts,
+    static_routes=LazyFactsClass(_load_static_routes),
 )
 
+# a cheap probe that changes whenever the device config changes, it
+# validates the cached facts
+CHECKSUM_COMMAND = 'show accounting log last-index'
+
 
 class Facts(FactsBase):
     """ The fact class for nxos
@@ -26,8 +60,17 @@ class Facts(FactsBase):
     VALID_LEGACY_GATHER_SUBSETS = frozenset(FACT_LEGACY_SUBSETS.keys())
     VALID_RESOURCE_SUBSETS = frozenset(FACT_RESOURCE_SUBSETS.keys())
 
+    # a FactsCache shared by every Facts of this process, None disables it
+    cache = None
+
     def __init__(self, module):
         super(Facts, self).__init__(module)
+        self._cache = self.cache
+        path = module.params.get('facts_cache_path')
+        if path:
+            from ansible.module_utils.network.nxos.facts.cache import JsonFileFactsCache
+            self._cache = JsonFileFactsCache(
+                path, ttl=module.params.get('facts_cache_ttl') or 300)
 
     def get_facts(self, legacy_facts_type=None, resource_facts_type=None, data=None):
         """ Collect the facts for nxos
@@ -39,9 +82,115 @@ class Facts(FactsBase):
         :return: the facts gathered
         """
         if self.VALID_RESOURCE_SUBSETS:
-            self.get_network_resources_facts(FACT_RESOURCE_SUBSETS, resource_facts_type, data)
+            if self._cache is not None and not data:
+                self.get_cached_network_resources_facts(FACT_RESOURCE_SUBSETS, resource_facts_type)
+            else:
+                self.get_network_resources_facts(FACT_RESOURCE_SUBSETS, resource_facts_type, data)
 
         if self.VALID_LEGACY_GATHER_SUBSETS:
             self.get_network_legacy_facts(FACT_LEGACY_SUBSETS, legacy_facts_type)
 
         return self.ansible_facts, self._warnings
+
+    def get_network_resources_facts(self, facts_resource_obj_map, resource_facts_type=None, data=None):
+        """ Collect the resource facts, in parallel when the module asks
+            for a gather_concurrency above 1
+
+        Every resource fills its own facts tree, the trees are merged in
+        resource name order so the result does not depend on timing.
+
+        :param facts_resource_obj_map: The resource names and their facts classes
+        :param resource_facts_type: List of resource fact types
+        :param data: previously collected conf
+        """
+        workers = self._module.params.get('gather_concurrency') or 1
+        if workers < 2:
+            return super(Facts, self).get_network_resources_facts(
+                facts_resource_obj_map, resource_facts_type, data)
+
+        if not resource_facts_type:
+            resource_facts_type = self._gather_network_resources
+        restorun = self.gen_runable(resource_facts_type, frozenset(facts_resource_obj_map.keys()),
+                                    resource_facts=True)
+        if not restorun:
+            return
+        self.ansible_facts['ansible_net_gather_network_resources'] = list(restorun)
+
+        def gather(attr):
+            facts = {'ansible_network_resources': {}}
+            inst = facts_resource_obj_map[attr](self._module)
+            inst.populate_facts(self._connection, facts, data)
+            return facts['ansible_network_resources']
+
+        # the pool size is the number of requests in flight on the connection
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(min(workers, len(restorun)))
+        try:
+            results = pool.map(gather, sorted(restorun))
+        finally:
+            pool.close()
+            pool.join()
+        for result in results:
+            self.ansible_facts['ansible_network_resources'].update(result)
+
+    def get_cached_network_resources_facts(self, facts_resource_obj_map, resource_facts_type=None):
+        """ Collect the resource facts, reading from the device only the
+            resources that are not in the cache
+
+        The cache is bypassed when the device gives no config checksum.
+
+        :param facts_resource_obj_map: The resource names and their facts classes
+        :param resource_facts_type: List of resource fact types
+        """
+        if not resource_facts_type:
+            resource_facts_type = self._gather_network_resources
+        restorun = self.gen_runable(resource_facts_type, frozenset(facts_resource_obj_map.keys()),
+                                    resource_facts=True)
+        if not restorun:
+            return
+        checksum = self.get_config_checksum()
+        if checksum is None:
+            # without a checksum a cached entry may predate a config change
+            return self.get_network_resources_facts(facts_resource_obj_map, resource_facts_type)
+        host = self.get_host()
+        resources = self.ansible_facts['ansible_network_resources']
+        missing = []
+        for attr in restorun:
+            facts = self._cache.get(host, attr, checksum)
+            if facts is None:
+                missing.append(attr)
+            else:
+                resources[attr] = facts
+        if missing:
+            self.get_network_resources_facts(facts_resource_obj_map, missing)
+            for attr in missing:
+                self._cache.set(host, attr, resources.get(attr), checksum)
+        self.ansible_facts['ansible_net_gather_network_resources'] = list(restorun)
+
+    def invalidate_cache(self, resource=None):
+        """ Drop the cached facts of this host, e.g. after its config was edited
+
+        :param resource: only drop this resource, all if None
+        """
+        if self._cache is not None:
+            self._cache.invalidate(self.get_host(), resource)
+
+    def get_host(self):
+        """ The host the facts are cached for
+        """
+        try:
+            return self._connection.get_option('host')
+        except Exception:
+            return getattr(self._module, '_socket_path', None) or 'localhost'
+
+    def get_config_checksum(self):
+        """ Probe the device for a value that changes with its config
+
+        :rtype: str or None
+        :returns: the probe output, None if the device does not support it
+        """
+        try:
+            checksum = self._connection.get(CHECKSUM_COMMAND).strip()
+        except Exception:
+            return None
+        return checksum or None
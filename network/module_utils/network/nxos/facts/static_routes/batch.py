@@ -0,0 +1,121 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Offline parsing of saved nxos configs into static_routes facts
+It is in this file that many config files (e.g. nightly backups of
+many devices) are parsed in one process pool, without paying the
+module startup for each of them.
+"""
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from ansible.module_utils.six import string_types
+from ansible.module_utils.network.nxos.facts.cache import ParseCache, get_facts_store
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+
+# the vrf blocks parsed by this process. A worker parses many configs,
+# e.g. backups of the same devices, which share most of their vrf blocks
+_BLOCK_CACHE = ParseCache()
+
+
+def parse_config_file(path, store_path=None):
+    """ Parse the static routes of one saved config
+
+    :param path: The path of the config file
+    :param store_path: The FactsStore file to load the facts from, or to
+                       store them in, when the config was not parsed before
+    :rtype: dictionary
+    :returns: the path, the static_routes facts (or the error) and
+              the time it took in seconds
+    """
+    start = time.time()
+    result = {'path': path}
+    try:
+        facts = {'ansible_network_resources': {}}
+        parser = Static_routesFacts(None)
+        parser.block_cache = _BLOCK_CACHE
+        if store_path:
+            parser.facts_store = get_facts_store(store_path)
+        # a missing file is an error, not config text
+        os.stat(path)
+        parser.populate_facts(None, facts, data=path)
+        result['static_routes'] = facts['ansible_network_resources'].get(
+            'static_routes', [])
+    except Exception as exc:
+        result['error'] = str(exc)
+    result['elapsed'] = time.time() - start
+    return result
+
+
+def get_config_files(paths):
+    """ Expand a directory into the config files in it
+
+    :param paths: A directory or an iterable of config file paths
+    :rtype: A list
+    :returns: the config file paths
+    """
+    if isinstance(paths, string_types) and os.path.isdir(paths):
+        return [os.path.join(paths, f) for f in sorted(os.listdir(paths))
+                if os.path.isfile(os.path.join(paths, f))]
+    return list(paths)
+
+
+def iter_parsed_configs(paths, processes=None, chunksize=4, store_path=None):
+    """ Parse many saved configs across a process pool
+
+    :param paths: A directory or an iterable of config file paths
+    :param processes: The pool size, defaults to the cpu count. With 1
+                      the files are parsed in this process
+    :param chunksize: The number of files handed to a worker at once
+    :param store_path: The FactsStore file of the facts parsed before
+    :rtype: generator
+    :returns: the result of parse_config_file for every file, in the
+              order the files finish
+    """
+    files = get_config_files(paths)
+    parse = partial(parse_config_file, store_path=store_path)
+    if processes == 1 or len(files) < 2:
+        for path in files:
+            yield parse(path)
+        return
+    pool = Pool(processes)
+    try:
+        for result in pool.imap_unordered(parse, files, chunksize):
+            yield result
+    finally:
+        pool.close()
+        pool.join()
+
+
+def parse_configs(paths, processes=None, chunksize=4, store_path=None):
+    """ Parse many saved configs and summarize the run
+
+    :param paths: A directory or an iterable of config file paths
+    :param processes: The pool size, defaults to the cpu count
+    :param chunksize: The number of files handed to a worker at once
+    :param store_path: The FactsStore file of the facts parsed before
+    :rtype: dictionary
+    :returns: the static_routes facts by path, the errors by path,
+              the per file timings and the files/sec of the run
+    """
+    start = time.time()
+    summary = {'static_routes': {}, 'errors': {}, 'timings': {}}
+    for result in iter_parsed_configs(paths, processes, chunksize, store_path):
+        summary['timings'][result['path']] = result['elapsed']
+        if 'error' in result:
+            summary['errors'][result['path']] = result['error']
+        else:
+            summary['static_routes'][result['path']] = result['static_routes']
+    elapsed = time.time() - start
+    summary['elapsed'] = elapsed
+    summary['files'] = len(summary['timings'])
+    summary['files_per_sec'] = summary['files'] / elapsed if elapsed else 0.0
+    return summary
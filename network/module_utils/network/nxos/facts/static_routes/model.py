@@ -0,0 +1,220 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The nxos static_routes model
+It is in this file that the compact objects the static routes are parsed
+into and diffed as are defined, along with their conversion from and to
+the dictionaries of the module arguments and facts.
+"""
+from ansible.module_utils.six import string_types
+from ansible.module_utils.six.moves import intern
+from ansible.module_utils.network.nxos.utils.prefixes import AFI_FAMILIES, normalize_address, normalize_prefix, normalize_prefixes
+from ansible.module_utils.network.nxos.utils.utils import normalize_interface
+
+
+NEXT_HOP_KEYS = ('forward_router_address', 'interface', 'dest_vrf',
+                 'route_name', 'tag', 'track', 'admin_distance')
+
+
+def _intern(value):
+    try:
+        return intern(value)
+    except TypeError:
+        # None, or unicode on python 2
+        return value
+
+
+def _int(value):
+    if isinstance(value, string_types) and value.isdigit():
+        return int(value)
+    return value
+
+
+# the canonical form of the addresses, prefixes and interfaces seen, they
+# recur across many routes
+_CANONICAL = {}
+_CANONICAL_MAX = 65536
+
+
+def _canonical(kind, value):
+    if value is None:
+        return None
+    key = (kind, value)
+    canonical = _CANONICAL.get(key)
+    if canonical is None:
+        if kind == 'address':
+            canonical = normalize_address(value)
+        elif kind == 'prefix':
+            canonical = normalize_prefix(value)
+        else:
+            canonical = normalize_interface(value)
+        if len(_CANONICAL) >= _CANONICAL_MAX:
+            _CANONICAL.clear()
+        _CANONICAL[key] = canonical
+    return canonical
+
+
+def canonical_address(value):
+    """ The canonical form of an ip address, e.g. 4011::db1 for 4011::0db1
+    """
+    return _canonical('address', value)
+
+
+def canonical_prefix(value):
+    """ The canonical form of an ip prefix, e.g. 4011::db1/128 for 4011::0DB1/128
+        or 10.0.0.0/8 for 10.0.0.1/8
+    """
+    return _canonical('prefix', value)
+
+
+def canonical_interface(value):
+    """ The canonical form of an interface name, e.g. Ethernet1/1 for eth1/1
+    """
+    return _canonical('interface', value)
+
+
+class NextHop(object):
+    """ A next hop of a static route
+    """
+    __slots__ = NEXT_HOP_KEYS
+
+    def __init__(self, forward_router_address=None, interface=None, dest_vrf=None,
+                 route_name=None, tag=None, track=None, admin_distance=None):
+        # the same next hops, interfaces and vrfs recur across many routes
+        self.forward_router_address = _intern(forward_router_address)
+        self.interface = _intern(interface)
+        self.dest_vrf = _intern(dest_vrf)
+        self.route_name = route_name
+        self.tag = _int(tag)
+        self.track = _int(track)
+        self.admin_distance = _int(admin_distance)
+
+    def key(self):
+        """ The hashable identity of the next hop, the same for next hops
+            that only differ in how their address or interface is spelled
+            or in whether their numbers are strings
+        """
+        return (canonical_address(self.forward_router_address),
+                canonical_interface(self.interface), self.dest_vrf,
+                self.route_name, _int(self.tag), _int(self.track),
+                _int(self.admin_distance))
+
+    @classmethod
+    def from_dict(cls, next_hop):
+        return cls(*[next_hop.get(key) for key in NEXT_HOP_KEYS])
+
+    def to_dict(self):
+        # forward_router_address is required, it is None for a next hop
+        # out of an interface only, e.g. Null0
+        next_hop = dict((key, getattr(self, key)) for key in NEXT_HOP_KEYS
+                        if getattr(self, key) is not None)
+        next_hop.setdefault('forward_router_address', None)
+        return next_hop
+
+
+class Route(object):
+    """ A static route, i.e. a destination and its next hops
+    """
+    __slots__ = ('dest', 'next_hops')
+
+    def __init__(self, dest, next_hops=None):
+        self.dest = dest
+        self.next_hops = next_hops if next_hops is not None else []
+
+    def key(self):
+        """ The hashable identity of the route, its canonical destination
+        """
+        return canonical_prefix(self.dest)
+
+    @classmethod
+    def from_dict(cls, route):
+        return cls(route['dest'], [NextHop.from_dict(nh)
+                                   for nh in route.get('next_hops') or []])
+
+    def to_dict(self):
+        return {'dest': self.dest,
+                'next_hops': [nh.to_dict() for nh in self.next_hops]}
+
+
+class AddressFamily(object):
+    """ The static routes of an address family
+    """
+    __slots__ = ('afi', 'routes')
+
+    def __init__(self, afi, routes=None):
+        self.afi = _intern(afi)
+        self.routes = routes if routes is not None else []
+
+    @classmethod
+    def from_dict(cls, af):
+        return cls(af['afi'], [Route.from_dict(ro)
+                               for ro in af.get('routes') or []])
+
+    def to_dict(self):
+        return {'afi': self.afi,
+                'routes': [ro.to_dict() for ro in self.routes]}
+
+
+class Vrf(object):
+    """ The static routes of a vrf, '__global__' for the global routes
+    """
+    __slots__ = ('name', 'address_families')
+
+    def __init__(self, name, address_families=None):
+        self.name = _intern(name)
+        self.address_families = address_families if address_families is not None else []
+
+    @classmethod
+    def from_dict(cls, vrf):
+        return cls(vrf.get('vrf', '__global__'),
+                   [AddressFamily.from_dict(af)
+                    for af in vrf.get('address_families') or []])
+
+    def to_dict(self):
+        vrf = {'vrf': self.name}
+        if self.address_families:
+            vrf['address_families'] = [af.to_dict() for af in self.address_families]
+        return vrf
+
+
+def normalize_routes(address_families):
+    """ Replace the destinations of the routes by their canonical form,
+        one normalize_prefixes pass per address family
+
+    :param address_families: the AddressFamily objects
+    :rtype: A list
+    :returns: a warning for every destination that is invalid or had host
+              bits set, invalid destinations are left as they are
+    """
+    warnings = []
+    for af in address_families:
+        if af.afi not in AFI_FAMILIES or not af.routes:
+            continue
+        batch = normalize_prefixes(af.afi, [ro.dest for ro in af.routes])
+        for ro, prefix in zip(af.routes, batch.prefixes):
+            ro.dest = prefix
+        warnings.extend(batch.warnings)
+    return warnings
+
+
+def from_config(config):
+    """ Convert the config dictionaries into the model
+
+    :param config: the static routes as a list of dictionaries
+    :rtype: A list
+    :returns: a Vrf for every dictionary
+    """
+    return [Vrf.from_dict(vrf) for vrf in config or []]
+
+
+def to_config(vrfs):
+    """ Convert the model into the config dictionaries
+
+    :param vrfs: a list of Vrf
+    :rtype: A list
+    :returns: the static routes as a list of dictionaries
+    """
+    return [vrf.to_dict() for vrf in vrfs]
@@ -9,20 +9,91 @@ It is in this file the configuration is collected from the device
 for a given resource, parsed, and the facts tree is populated
 based on the configuration.
 """
+import json
+import mmap
+import os
 import re
-from copy import deepcopy
+from collections import namedtuple, OrderedDict
+from itertools import chain
+from ansible.module_utils._text import to_text
+from ansible.module_utils.six import string_types
+from ansible.module_utils.common.collections import ImmutableDict
 from ansible.module_utils.network.common import utils
 from ansible.module_utils.network.nxos.argspec.static_routes.static_routes import Static_routesArgs
+from ansible.module_utils.network.nxos.facts.cache import FactsStore, get_facts_store
+from ansible.module_utils.network.nxos.facts.static_routes.model import NEXT_HOP_KEYS, NextHop, Route, AddressFamily, Vrf, normalize_routes
+from ansible.module_utils.network.nxos.utils.utils import spec_validator, SpecValidationError
+from ansible.module_utils.network.nxos.utils.trace import get_tracer
 
+# keywords of an 'ip(v6) route' line and the next hop keys their values map to
+ROUTE_KEYWORDS = {
+    'vrf': 'dest_vrf',
+    'name': 'route_name',
+    'tag': 'tag',
+    'track': 'track',
+}
 
-class Static_routesFacts(object):
-    """ The nxos static_routes fact class
-    """
+# the commands that fetch the static routes config for each gather_mode
+GATHER_COMMANDS = {
+    'section': ["show running-config | section '^ip(v6)* route|^vrf context'"],
+    'full': ['show running-config'],
+    'split': ["show running-config | include '^ip(v6)* route'",
+              "show running-config | section '^vrf context'"],
+}
 
-    def __init__(self, module, subspec='config', options='options'):
-        self._module = module
-        self.argument_spec = Static_routesArgs.argument_spec
-        spec = deepcopy(self.argument_spec)
+# the start of a top level line of a config file, it ends a vrf context block
+TOP_LEVEL_RE = re.compile(br'\n[^\s]')
+
+# the prefix of the FactsStore keys, bumped whenever the facts parsed from
+# the same config change
+STORE_KEY_PREFIX = 'static_routes/2:'
+
+# the commands that fetch the static routes as JSON, by afi, for the 'json'
+# gather_mode. It falls back to the 'section' commands
+JSON_GATHER_COMMANDS = [
+    ('ipv4', 'show ip static-route vrf all | json'),
+    ('ipv6', 'show ipv6 static-route vrf all | json'),
+]
+
+# the keys of a ROW_path of the JSON output, for every next hop key
+JSON_NEXT_HOP_KEYS = {
+    'forward_router_address': ('ipnexthop', 'ipv6nexthop', 'nexthop'),
+    'interface': ('ifname', 'interface'),
+    'dest_vrf': ('nhvrf', 'nh_vrf'),
+    'route_name': ('rtname', 'name'),
+    'tag': ('tag',),
+    'track': ('track',),
+    'admin_distance': ('pref',),
+}
+
+# the values the JSON output shows for next hop keys that are not configured
+JSON_DEFAULTS = {
+    'route_name': '',
+    'tag': 0,
+    'track': 0,
+    'admin_distance': 1,
+}
+
+# the structures derived from the argspec for a (subspec, options), see get_spec
+_SPEC_CACHE = {}
+
+DerivedSpec = namedtuple('DerivedSpec', ['generated_spec', 'validator'])
+
+
+def get_spec(subspec='config', options='options'):
+    """ The structures derived from the static_routes argspec
+
+    They are built on first use and shared, read only, by every instance
+    of this process instead of being derived again for each of them.
+
+    :param subspec: The argspec key of the facts, None for the whole argspec
+    :param options: The key of the options of the subspec, None for the subspec
+    :rtype: DerivedSpec
+    :returns: the generated spec of the facts and the validator of the config
+    """
+    derived = _SPEC_CACHE.get((subspec, options))
+    if derived is None:
+        spec = Static_routesArgs.argument_spec
         if subspec:
             if options:
                 facts_argument_spec = spec[subspec][options]
@@ -30,8 +101,35 @@ class Static_routesFacts(object):
                 facts_argument_spec = spec[subspec]
         else:
             facts_argument_spec = spec
+        derived = DerivedSpec(
+            ImmutableDict(utils.generate_dict(facts_argument_spec)),
+            spec_validator({'config': spec['config']}))
+        _SPEC_CACHE[(subspec, options)] = derived
+    return derived
+
+
+class Static_routesFacts(object):
+    """ The nxos static_routes fact class
+    """
+
+    # the address families parsed from each vrf block, by block text hash.
+    # A module process parses a config once, so it is only set on the
+    # instances of long lived processes, e.g. the batch parsing. None
+    # disables it
+    block_cache = None
 
-        self.generated_spec = utils.generate_dict(facts_argument_spec)
+    # the FactsStore used when the module sets no facts_store_path, set on
+    # an instance e.g. by the offline batch parsing. None disables it
+    facts_store = None
+
+    def __init__(self, module, subspec='config', options='options'):
+        self._module = module
+        self.argument_spec = Static_routesArgs.argument_spec
+        self.spec = get_spec(subspec, options)
+        self.generated_spec = self.spec.generated_spec
+        # the warnings handed to the module while rendering facts to
+        # store, None when they are not stored
+        self._warnings = None
 
     def populate_facts(self, connection, ansible_facts, data=None):
         """ Populate the facts for static_routes
@@ -41,130 +139,414 @@ class Static_routesFacts(object):
         :rtype: dictionary
         :returns: facts
         """
-        vrf_data = []
-        non_vrf_data = []
-        if not data:
-            non_vrf_data = connection.get(
-                "show running-config | include '^ip(v6)* route'")
-            vrf_data = connection.get(
-                "show running-config | section '^vrf context'")
-            non_vrf_data = non_vrf_data.split('\n')
-            vrf_data = vrf_data.split('\nvrf context')
-            # as we split based on 'vrf context', it is stripped from the data except the first element
-        else:
-            # used for parsed state where data is from the 'running-config' key
-            data = data.split('\n')
-            i = 0
-            while i <= (len(data)-1):
-                if 'vrf context ' in data[i]:
-                    vrf_conf = data[i]
-                    j = i+1
-                    while j < len(data) and 'vrf context ' not in data[j]:
-                        vrf_conf += '\n'+data[j]
-                        j += 1
-                    i = j
-                    vrf_data.append(vrf_conf)
-                else:
-                    non_vrf_data.append(data[i])
-                    i += 1
-        objs = []
-        new_vrf_data = []
-        for v in vrf_data:
-            if re.search('\n\s*ip(v6)? route', v):
-                new_vrf_data.append(v)
-                # dont consider vrf if it does not have routes
-        for i in range(len(new_vrf_data)):
-            if not re.search('^vrf context', new_vrf_data[i]):
-                new_vrf_data[i] = 'vrf context'+new_vrf_data[i]
-
-        resources = non_vrf_data+new_vrf_data
-        objs = self.render_config(self.generated_spec, resources)
+        tracer = get_tracer(self._module)
+        with tracer.span('gather', resource='static_routes'):
+            vrfs = lines = raw = None
+            if data:
+                # used for parsed state where data is from the 'running-config' key
+                lines = self.get_config_lines(data)
+                raw = data
+            else:
+                if self.get_gather_mode() == 'json':
+                    vrfs = self.get_json_model(connection)
+                if vrfs is None:
+                    commands = self.get_gather_commands()
+                    with tracer.span('fetch', resource='static_routes', commands=len(commands)):
+                        outputs = [connection.get(command) for command in commands]
+                    lines = self.get_output_lines(outputs)
+                    raw = outputs
+            return self.render_facts(ansible_facts, vrfs, lines, raw, self.get_device(connection))
+
+    def render_facts(self, ansible_facts, vrfs=None, lines=None, raw=None, device=None):
+        """ Render the routes fetched from the device, or given as data,
+            as validated facts
+
+        With a facts store, the facts of config text parsed before are
+        loaded from the store instead of being parsed again. The warnings
+        of the parse are stored with them and handed to the module again.
+
+        :param ansible_facts: Facts dictionary
+        :param vrfs: The routes as a list of Vrf, e.g. from the JSON output
+        :param lines: The routes as config lines, when vrfs is None
+        :param raw: The config text the lines are from, as the data or the
+                    outputs of the gather commands, it keys the facts store
+        :param device: The device the config is from, stored for reference
+        :rtype: dictionary
+        :returns: facts
+        """
+        tracer = get_tracer(self._module)
+        store = key = None
+        if vrfs is None and raw is not None:
+            store = self.get_facts_store()
+        if store is not None:
+            key = FactsStore.digest(raw)
+        if key is not None:
+            key = STORE_KEY_PREFIX + key
+            stored = store.get(key)
+            if stored is not None:
+                routes, warnings = stored
+                self.warn(warnings)
+                ansible_facts['ansible_network_resources'].pop('static_routes', None)
+                if routes:
+                    ansible_facts['ansible_network_resources']['static_routes'] = routes
+                return ansible_facts
+            self._warnings = []
+
+        try:
+            if vrfs is not None:
+                objs = self.render_vrfs(vrfs)
+            else:
+                with tracer.span('parse', resource='static_routes'):
+                    objs = self.render_config(self.generated_spec, lines)
+        finally:
+            warnings, self._warnings = self._warnings, None
 
         ansible_facts['ansible_network_resources'].pop('static_routes', None)
         facts = {}
         if objs:
-            params = utils.validate_config(
-                self.argument_spec, {'config': objs})
-            params = utils.remove_empties(params)
+            with tracer.span('validate', resource='static_routes'):
+                params = self.validate_facts(objs)
             for c in params['config']:
                 if c == {'vrf': '__global__'}:
                     params['config'].remove(c)
             facts['static_routes'] = params['config']
         ansible_facts['ansible_network_resources'].update(facts)
+        if key is not None:
+            store.set(key, (facts.get('static_routes', []), warnings), device)
         return ansible_facts
 
+    def get_facts_store(self):
+        """ The FactsStore of the facts_store_path of the module, or the
+            facts_store of the class
+
+        :rtype: FactsStore or None
+        :returns: the store, None without one
+        """
+        if self._module:
+            path = self._module.params.get('facts_store_path')
+            if path:
+                return get_facts_store(
+                    path, self._module.params.get('facts_store_max_bytes') or 64 * 1024 * 1024)
+        return self.facts_store
+
+    def get_device(self, connection):
+        """ The host of the connection, None if it is not known
+        """
+        try:
+            return connection.get_option('host')
+        except Exception:
+            return None
+
+    def validate_facts(self, objs):
+        """ Validate the rendered config against the argspec
+
+        By default the config is validated by the validator built once from
+        the argspec, see get_spec. Data it cannot validate, and the 'strict'
+        facts_validation, go through the generic validate_config.
+
+        :param objs: The rendered config
+        :rtype: dictionary
+        :returns: the validated params, without empty values
+        """
+        mode = None
+        if self._module:
+            mode = self._module.params.get('facts_validation')
+        if mode != 'strict':
+            try:
+                return self.spec.validator({'config': objs})
+            except SpecValidationError:
+                pass
+        params = utils.validate_config(
+            self.argument_spec, {'config': objs})
+        return utils.remove_empties(params)
+
     def get_inner_dict(self, conf, inner_dict):
-        ''' 
+        '''
         This method parses the command to create the innermost dictionary of the config
+
+        The line is walked token by token in a single pass, i.e.
+        ip(v6) route <dest> [<interface>] <next hop> [vrf <vrf>] [name <name>]
+        [tag <tag>] [track <track>] [<pref>]
         '''
-        conf = re.sub('\s*ip(v6)? route', '', conf)
-        # strip 'ip route'
-        inner_dict['dest'] = re.match("^\s*(\S+\/\d+) .*", conf).group(1)
-        # ethernet1/2/23
-        iface = re.match(".* ([a-zA-Z0-9]+\d*\/\d+(\/?\.?\d*)*) .*", conf)
-        if iface:
-            inner_dict['interface'] = (iface.group(1))
-            conf = re.sub(inner_dict['interface'], '', conf)
-
-        if '.' in inner_dict['dest']:
+        tokens = conf.split()
+        # skip 'ip route' / 'ipv6 route'
+        i = tokens.index('route') + 1
+        inner_dict['dest'] = tokens[i]
+        if ':' in inner_dict['dest']:
+            inner_dict['afi'] = 'ipv6'
+        else:
             inner_dict['afi'] = 'ipv4'
-            ipv4 = re.match(r'.* (\d+\.\d+\.\d+\.\d+).*',
-                            conf)  # gets next hop ip
-            inner_dict['forward_router_address'] = ipv4.group(1)
 
-        else:
-            inner_dict['afi'] = 'ipv6'
-            ipv6 = re.match(r'.* (\S*:\S*:\S*).*', conf)
-            inner_dict['forward_router_address'] = ipv6.group(1)
-        conf = re.sub(inner_dict['forward_router_address'], '', conf)
-
-        nullif = re.search('null0', conf, re.IGNORECASE)
-        if nullif:
-            inner_dict['interface'] = 'Null0'
-            inner_dict['forward_router_address'] = None
-            return inner_dict  # dest IP not needed for null if
-
-        keywords = ['vrf', 'name', 'tag', 'track']
-        for key in keywords:
-            pattern = re.match('.* (?:%s) (\S+).*' % key, conf)
-            if pattern:
-                if key == 'vrf':
-                    key = 'dest_vrf'
-                elif key == 'name':
-                    key = 'route_name'
-                inner_dict[key] = pattern.group(1).strip()
-                conf = re.sub(key + ' ' + inner_dict[key], '', conf)
-
-        pref = re.match('(?:.*) (\d+)$', conf)
-        if pref:
-            # if something is left at the end without any key, it is the pref
-            inner_dict['admin_distance'] = pref.group(1)
+        for i in range(i + 1, len(tokens)):
+            token = tokens[i]
+            if token is None:
+                # value of a keyword consumed on the previous token
+                continue
+            key = ROUTE_KEYWORDS.get(token)
+            if key and i + 1 < len(tokens):
+                inner_dict[key] = tokens[i + 1]
+                tokens[i + 1] = None
+            elif token.lower() == 'null0':
+                inner_dict['interface'] = 'Null0'
+                inner_dict['forward_router_address'] = None
+                return inner_dict  # dest IP not needed for null if
+            elif token.isdigit():
+                # a number without any key is the pref
+                inner_dict['admin_distance'] = token
+            elif ':' in token or token[0].isdigit():
+                inner_dict['forward_router_address'] = token
+            else:
+                # ethernet1/2/23
+                inner_dict['interface'] = token
         return inner_dict
 
-    def get_command(self, conf, afi_list, dest_list, af):
-        inner_dict = {}
-        inner_dict = self.get_inner_dict(conf, inner_dict)
-        if inner_dict['afi'] not in afi_list:
-            af.append({'afi': inner_dict['afi'], 'routes': []})
-            afi_list.append(inner_dict['afi'])
-
-        next_hop = {}
-        params = ['forward_router_address', 'interface',
-                  'admin_distance', 'route_name', 'tag', 'track', 'dest_vrf']
-        for p in params:
-            if p in inner_dict.keys():
-                next_hop.update({p: inner_dict[p]})
-
-        if inner_dict['dest'] not in dest_list:
-            dest_list.append(inner_dict['dest'])
-            af[-1]['routes'].append({'dest': inner_dict['dest'],
-                                     'next_hops': []})
-            # if 'dest' is new, create new list under 'routes'
-            af[-1]['routes'][-1]['next_hops'].append(next_hop)
+    def get_gather_mode(self):
+        """ The gather_mode of the module, 'section' without a module
+        """
+        mode = None
+        if self._module:
+            mode = self._module.params.get('gather_mode')
+        return mode or 'section'
+
+    def get_gather_commands(self):
+        """ The show commands for the gather_mode of the module
+
+        'section' fetches the global routes and the vrf blocks in one
+        command, 'full' fetches the whole running config and leaves the
+        split to the parser, 'split' uses one command for each. 'json'
+        falls back to 'section' here.
+
+        :rtype: A list
+        :returns: the commands to run on the device
+        """
+        return GATHER_COMMANDS.get(self.get_gather_mode(), GATHER_COMMANDS['section'])
+
+    def get_output_lines(self, outputs):
+        """ Iterate over the lines of the outputs of the gather commands
+
+        :param outputs: The outputs of get_gather_commands
+        :rtype: generator
+        :returns: the lines of the configuration
+        """
+        return chain.from_iterable(
+            self.get_config_lines(output) for output in outputs)
+
+    def get_json_model(self, connection):
+        """ Fetch the static routes as JSON and render them as the model
+
+        :param connection: the device connection
+        :rtype: A list or None
+        :returns: A Vrf for every vrf with routes, the global routes last,
+                  None if the device does not answer in JSON
+        """
+        outputs = []
+        with get_tracer(self._module).span('fetch', resource='static_routes', commands=len(JSON_GATHER_COMMANDS)):
+            for afi, command in JSON_GATHER_COMMANDS:
+                try:
+                    output = connection.get(command)
+                except Exception:
+                    # e.g. a platform without JSON output for the command
+                    return None
+                outputs.append((afi, output))
+        return self.parse_json_outputs(outputs)
+
+    def parse_json_outputs(self, outputs):
+        """ Decode the outputs of the JSON gather commands and render them
+            as the model
+
+        :param outputs: (afi, output) for every JSON_GATHER_COMMANDS
+        :rtype: A list or None
+        :returns: A Vrf for every vrf with routes, the global routes last,
+                  None if an output is not JSON
+        """
+        with get_tracer(self._module).span('parse', resource='static_routes', backend='json'):
+            decoded = []
+            for afi, output in outputs:
+                if isinstance(output, string_types):
+                    if not output.strip():
+                        output = {}
+                    else:
+                        try:
+                            output = json.loads(output)
+                        except ValueError:
+                            return None
+                if not isinstance(output, dict):
+                    return None
+                decoded.append((afi, output))
+            return self.render_json(decoded)
+
+    def render_json(self, outputs):
+        """ Render the JSON output of 'show ip(v6) static-route vrf all'
+            as the static routes model
+
+        The next hop values the output shows for keys that are not
+        configured, e.g. a preference of 1, are left out like they are
+        left out of the config.
+
+        :param outputs: (afi, decoded JSON output) for every afi
+        :rtype: A list
+        :returns: A Vrf for every vrf with routes, the global routes last
+        """
+        vrfs = OrderedDict()
+        for afi, output in outputs:
+            for row_vrf in _json_rows(output, 'vrf'):
+                name = row_vrf.get('vrf_name') or 'default'
+                if name == 'default':
+                    name = '__global__'
+                routes = []
+                for row_addrf in _json_rows(row_vrf, 'addrf') or [row_vrf]:
+                    for row_prefix in _json_rows(row_addrf, 'prefix'):
+                        dest = row_prefix.get('ipprefix') or row_prefix.get('ipv6prefix') or row_prefix.get('prefix')
+                        route = Route(dest)
+                        for row_path in _json_rows(row_prefix, 'path'):
+                            route.next_hops.append(self.render_json_path(row_path, name))
+                        routes.append(route)
+                if routes:
+                    vrf = vrfs.get(name)
+                    if vrf is None:
+                        vrf = vrfs[name] = Vrf(name)
+                    af = AddressFamily(afi, routes)
+                    self.warn(normalize_routes([af]))
+                    vrf.address_families.append(af)
+        global_vrf = vrfs.pop('__global__', None)
+        vrfs = list(vrfs.values())
+        if global_vrf is not None:
+            vrfs.append(global_vrf)
+        return vrfs
+
+    def render_json_path(self, row_path, vrf):
+        """ Render a ROW_path of the JSON output as a NextHop
+
+        :param row_path: the ROW_path
+        :param vrf: the vrf the route is in
+        :rtype: NextHop
+        :returns: the next hop
+        """
+        # the output names the vrf of every next hop, the vrf of the route
+        # itself is left out like it is in the config
+        own_vrf = 'default' if vrf == '__global__' else vrf
+        values = []
+        for key in NEXT_HOP_KEYS:
+            value = None
+            for json_key in JSON_NEXT_HOP_KEYS[key]:
+                if row_path.get(json_key) not in (None, ''):
+                    value = row_path[json_key]
+                    break
+            if isinstance(value, string_types) and value.isdigit():
+                value = int(value)
+            if value == JSON_DEFAULTS.get(key) or (key == 'dest_vrf' and value == own_vrf):
+                value = None
+            values.append(value)
+        next_hop = NextHop(*values)
+        if next_hop.forward_router_address == '0.0.0.0' or next_hop.forward_router_address == '::':
+            # a route out of an interface only, e.g. Null0
+            next_hop.forward_router_address = None
+        return next_hop
+
+    def get_config_lines(self, data):
+        """ Iterate over the lines of the config without splitting all of
+            it into a list first
+
+        :param data: The configuration as a string, the path of a file
+                     holding it, a file-like object or an iterable of lines
+        :rtype: generator
+        :returns: the lines of the configuration
+        """
+        if not isinstance(data, string_types):
+            for line in data:
+                yield line
+        elif '\n' not in data and os.path.isfile(data):
+            for line in self.get_file_lines(data):
+                yield line
         else:
-            af[-1]['routes'][-1]['next_hops'].append(next_hop)
-            # just append if dest already exists
-        return af
+            start = 0
+            while start < len(data):
+                end = data.find('\n', start)
+                if end == -1:
+                    end = len(data)
+                yield data[start:end]
+                start = end + 1
+
+    def get_file_lines(self, path):
+        """ Scan a config file for the lines the routes are parsed from
+
+        The file is memory mapped and searched as bytes for 'route ' and
+        'vrf context ', only the route and 'vrf context ..' lines are
+        decoded. The end of a vrf context block is yielded as '!'. The rest
+        of the file, e.g. ACL entries, is never turned into strings.
+
+        :param path: The path of the config file
+        :rtype: generator
+        :returns: the lines get_route_lines needs
+        """
+        with open(path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                for line in self._scan_file_lines(data):
+                    yield line
+            finally:
+                data.close()
+
+    def _scan_file_lines(self, data):
+        size = len(data)
+        context = 0 if data[:12] == b'vrf context ' else data.find(b'\nvrf context ')
+        block_end = size
+        in_context = False
+        route = data.find(b'route ')
+        while route != -1:
+            start = data.rfind(b'\n', 0, route) + 1
+            end = data.find(b'\n', route)
+            if end == -1:
+                end = size
+            while context != -1 and context < start:
+                # the vrf context blocks before the route
+                context += 1 if data[context:context + 1] == b'\n' else 0
+                context_end = data.find(b'\n', context)
+                if context_end == -1:
+                    context_end = size
+                yield to_text(data[context:context_end].rstrip())
+                in_context = True
+                top_level = TOP_LEVEL_RE.search(data, context_end)
+                block_end = top_level.start() + 1 if top_level else size
+                context = data.find(b'\nvrf context ', context_end)
+            if data[start:route].strip() in (b'ip', b'ipv6'):
+                if in_context and start >= block_end:
+                    in_context = False
+                    yield '!'
+                yield to_text(data[start:end].rstrip())
+            route = data.find(b'route ', end)
+
+    def get_route_lines(self, lines):
+        """ Stream the static routes out of the config lines
+
+        A 'vrf context ..' line opens the block of that vrf, the block
+        ends at the next line that is not indented.
+
+        :param lines: The configuration lines
+        :rtype: generator
+        :returns: (vrf, line) for every route, vrf is None for global routes
+        """
+        vrf = None
+        for line in lines:
+            if line.startswith('vrf context '):
+                vrf = line.split()[2]
+            elif line.strip() and not line[0].isspace():
+                vrf = None
+            if line.lstrip().startswith(('ip route ', 'ipv6 route ')):
+                yield vrf, line
+
+    def get_command(self, conf):
+        """ Parse a route line
+
+        :param conf: The 'ip(v6) route' line
+        :rtype: tuple
+        :returns: the afi, the destination and the NextHop of the route
+        """
+        inner_dict = self.get_inner_dict(conf, {})
+        next_hop = NextHop(*[inner_dict.get(key) for key in NEXT_HOP_KEYS])
+        return inner_dict['afi'], inner_dict['dest'], next_hop
 
     def render_config(self, spec, con):
         """
@@ -172,36 +554,107 @@ class Static_routesFacts(object):
           from spec for null values
 
         :param spec: The facts tree, generated from the argspec
-        :param conf: The configuration
+        :param con: The configuration, as an iterable of lines
         :rtype: dictionary
         :returns: The generated config
         """
-        # config=deepcopy(spec)
+        return self.render_vrfs(self.render_model(con))
+
+    def render_vrfs(self, vrfs):
+        """
+        Render the static routes model as the config dictionaries
+
+        :param vrfs: A list of Vrf, the global routes last
+        :rtype: A list
+        :returns: The generated config
+        """
         config = []
-        global_afi_list = []
         global_af = []
-        global_dest_list = []
-        if con:
-            for conf in con:
-                if conf.startswith('vrf context'):
-                    svrf = re.match('vrf context (\S+)\n', conf).group(1)
-                    afi_list = []
-                    af = []
-                    dest_list = []
-                    config_dict = {'vrf': svrf, 'address_families': []}
-                    conf = conf.split('\n')
-                    # considering from the second line as first line is 'vrf context..'
-                    conf = conf[1:]
-                    for c in conf:
-                        if 'ip route' in c or 'ipv6 route' in c:
-                            self.get_command(
-                                c, afi_list, dest_list, af)
-                            config_dict['address_families'] = af
-                    config.append(config_dict)
-                else:
-                    if 'ip route' in conf or 'ipv6 route' in conf:
-                        self.get_command(
-                            conf, global_afi_list, global_dest_list, global_af)
-            config.append(utils.remove_empties(
-                {'address_families': global_af}))
+        for vrf in vrfs:
+            if vrf.name == '__global__':
+                global_af = [af.to_dict() for af in vrf.address_families]
+            else:
+                config.append(vrf.to_dict())
+        # not through remove_empties, which would drop the None
+        # forward_router_address of the Null0 routes
+        config.append({'address_families': global_af} if global_af else {})
         return config
+
+    def render_model(self, con):
+        """
+        Render config as the static routes model
+
+        :param con: The configuration, as an iterable of lines
+        :rtype: A list
+        :returns: A Vrf for every vrf with routes, the global routes last
+        """
+        blocks = OrderedDict()
+        for vrf, conf in self.get_route_lines(con):
+            blocks.setdefault(vrf, []).append(conf.strip())
+        global_routes = blocks.pop(None, None)
+        vrfs = [Vrf(vrf, self.render_block(block))
+                for vrf, block in blocks.items()]
+        if global_routes:
+            vrfs.append(Vrf('__global__', self.render_block(global_routes)))
+        return vrfs
+
+    def render_block(self, block):
+        """ Render the routes of a vrf as its address families, reusing
+            the result of an earlier parse of the same block text when
+            the block_cache is set
+
+        The destinations are normalized once per address family, see
+        normalize_routes.
+
+        :param block: The route lines of the vrf
+        :rtype: A list
+        :returns: The AddressFamily list of the vrf
+        """
+        key = None
+        if self.block_cache is not None:
+            key = self.block_cache.digest('\n'.join(block))
+            cached = self.block_cache.get(key)
+            if cached is not None:
+                address_families, warnings = cached
+                self.warn(warnings)
+                return address_families
+        address_families = []
+        afs = {}
+        routes = {}
+        for conf in block:
+            afi, dest, next_hop = self.get_command(conf)
+            route = routes.get((afi, dest))
+            if route is None:
+                af = afs.get(afi)
+                if af is None:
+                    af = afs[afi] = AddressFamily(afi)
+                    address_families.append(af)
+                route = routes[(afi, dest)] = Route(dest)
+                af.routes.append(route)
+            route.next_hops.append(next_hop)
+        warnings = normalize_routes(address_families)
+        self.warn(warnings)
+        if key is not None:
+            self.block_cache.set(key, (address_families, warnings))
+        return address_families
+
+    def warn(self, warnings):
+        """ Hand the warnings to the module, which returns them with its
+            result
+        """
+        if self._warnings is not None:
+            self._warnings.extend(warnings)
+        warn = getattr(self._module, 'warn', None)
+        if warn is not None:
+            for warning in warnings:
+                warn(warning)
+
+
+def _json_rows(output, table):
+    """ The rows of a TABLE_<table> of NX-OS JSON output, which holds a
+        single row as a dictionary and many as a list
+    """
+    rows = (output.get('TABLE_' + table) or {}).get('ROW_' + table) or []
+    if isinstance(rows, dict):
+        return [rows]
+    return rows
@@ -0,0 +1,123 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# nxapi
+
+import json
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.urls import open_url
+
+
+class NxapiError(Exception):
+    pass
+
+
+def nxapi_request(method, commands):
+    """ The JSON-RPC body of an NX-API request
+
+    :param method: cli for the structured output and for config commands,
+                   cli_ascii for the output as text
+    :param commands: the commands, run one after another in one CLI context
+    :rtype: str
+    :returns: the request body
+    """
+    return json.dumps([
+        {'jsonrpc': '2.0', 'method': method,
+         'params': {'cmd': command, 'version': 1}, 'id': i + 1}
+        for i, command in enumerate(commands)])
+
+
+def nxapi_results(payload):
+    """ The results of an NX-API response, in the order of the commands
+
+    :param payload: the response body
+    :rtype: A list
+    :returns: the result of every command
+    """
+    responses = json.loads(to_text(payload, errors='surrogate_or_strict'))
+    if isinstance(responses, dict):
+        responses = [responses]
+    results = []
+    for response in responses:
+        if 'error' in response:
+            error = response['error']
+            raise NxapiError((error.get('data') or {}).get('msg') or error.get('message'))
+        results.append(response.get('result') or {})
+    return results
+
+
+class NxapiConnection(object):
+    """ A connection to the NX-API JSON-RPC endpoint of a device, for
+        running the config and facts classes without a persistent
+        connection, one HTTP request per call
+
+    NX-API keeps no state between requests: a configure session entered
+    in one request is gone in the next, stateless tells submit_batches to
+    send the session in a single request.
+    """
+    stateless = True
+
+    def __init__(self, host, username, password, port=None, use_ssl=True,
+                 validate_certs=True, timeout=30):
+        self.host = host
+        self.port = port or (443 if use_ssl else 80)
+        self.url = '%s://%s:%d/ins' % ('https' if use_ssl else 'http', host, self.port)
+        self.username = username
+        self.password = password
+        self.validate_certs = validate_certs
+        self.timeout = timeout
+
+    def get_option(self, option):
+        return {'host': self.host, 'port': self.port,
+                'remote_user': self.username, 'timeout': self.timeout}[option]
+
+    def send_request(self, method, commands):
+        """ Run the commands in one request
+
+        :param method: the JSON-RPC method, cli or cli_ascii
+        :param commands: the commands
+        :rtype: A list
+        :returns: the result of every command
+        """
+        try:
+            response = open_url(
+                self.url, data=nxapi_request(method, commands), method='POST',
+                headers={'Content-Type': 'application/json-rpc'},
+                url_username=self.username, url_password=self.password,
+                force_basic_auth=True, validate_certs=self.validate_certs,
+                timeout=self.timeout)
+            payload = response.read()
+        except NxapiError:
+            raise
+        except Exception as exc:
+            raise NxapiError('NX-API request to %s failed: %s' % (self.host, exc))
+        return nxapi_results(payload)
+
+    def get(self, command):
+        """ Run a show command
+
+        :param command: the command, ending in '| json' for the output as
+                        JSON
+        :returns: the output, as text, or decoded when it is JSON
+        """
+        if command.endswith('| json'):
+            result = self.send_request('cli', [command[:-len('| json')].strip()])
+            return result[0].get('body') or {}
+        return self.send_request('cli_ascii', [command])[0].get('msg', '')
+
+    def edit_config(self, candidate=None, *args, **kwargs):
+        """ Apply config commands, as they are and in one request
+        """
+        return self.send_request('cli', list(candidate or []))
+
+    def run_commands(self, commands=None, *args, **kwargs):
+        """ Run commands, in one request
+
+        :rtype: A list
+        :returns: the output of every command, as text
+        """
+        return [r.get('msg', '') for r in self.send_request('cli_ascii', list(commands or []))]
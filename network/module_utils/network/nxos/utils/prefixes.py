@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# prefixes
+
+import socket
+from array import array
+from binascii import hexlify
+
+from ansible.module_utils.six import string_types
+
+# the socket family and the bit length of the addresses of every afi
+AFI_FAMILIES = {
+    'ipv4': (socket.AF_INET, 32),
+    'ipv6': (socket.AF_INET6, 128),
+}
+
+
+class PrefixBatch(object):
+    """ The destinations of an address family, validated and normalized
+
+    prefixes holds the canonical form of every destination, e.g.
+    10.0.0.0/8 for 10.0.0.1/8 and 4011::db1/128 for 4011::0DB1/128, or the
+    destination as given when it is invalid. packed holds the network
+    addresses back to back, 4 or 16 bytes each, and lengths the prefix
+    lengths, with zeros for the invalid destinations listed in invalid.
+    """
+    __slots__ = ('afi', 'prefixes', 'packed', 'lengths', 'invalid', 'warnings')
+
+    def __init__(self, afi):
+        self.afi = afi
+        self.prefixes = []
+        self.packed = bytearray()
+        self.lengths = array('B')
+        self.invalid = []
+        self.warnings = []
+
+    def network(self, index):
+        """ The network address of a destination as an int
+        """
+        size = AFI_FAMILIES[self.afi][1] // 8
+        return int(hexlify(self.packed[index * size:(index + 1) * size]), 16)
+
+    def __len__(self):
+        return len(self.prefixes)
+
+
+def normalize_prefixes(afi, values):
+    """ Validate and normalize the destinations of an address family in
+        one pass, without building an ipaddress object for each of them
+
+    The addresses are parsed and formatted by inet_pton and inet_ntop,
+    host bits are cleared, and prefix lengths beyond the address length
+    are rejected.
+
+    :param afi: ipv4 or ipv6
+    :param values: the destinations, e.g. 10.0.0.0/8
+    :rtype: PrefixBatch
+    :returns: the canonical destinations and their packed form, with a
+              warning for every destination that is invalid or had host
+              bits set
+    """
+    family, bits = AFI_FAMILIES[afi]
+    size = bits // 8
+    zero = bytes(bytearray(size))
+    batch = PrefixBatch(afi)
+    inet_pton = socket.inet_pton
+    inet_ntop = socket.inet_ntop
+    for index, value in enumerate(values):
+        try:
+            if not isinstance(value, string_types):
+                raise TypeError('a destination must be a string')
+            address, sep, length = value.partition('/')
+            if not sep:
+                raise ValueError('a prefix length is required')
+            if not length.isdigit() or int(length) > bits:
+                raise ValueError('the prefix length must be 0 to %d' % bits)
+            length = int(length)
+            packed = inet_pton(family, address)
+        except (socket.error, ValueError, TypeError) as exc:
+            batch.prefixes.append(value)
+            batch.packed.extend(zero)
+            batch.lengths.append(0)
+            batch.invalid.append(index)
+            batch.warnings.append('invalid %s destination %s: %s' % (afi, value, exc))
+            continue
+        network = _mask(packed, length, size)
+        prefix = '%s/%d' % (inet_ntop(family, network), length)
+        if network != packed:
+            batch.warnings.append('%s destination %s has host bits set, using %s' % (afi, value, prefix))
+        batch.prefixes.append(prefix)
+        batch.packed.extend(network)
+        batch.lengths.append(length)
+    return batch
+
+
+def normalize_prefix(value):
+    """ The canonical form of a single destination of either afi
+
+    :param value: the destination, e.g. 4011::0DB1/128
+    :rtype: str
+    :returns: the canonical destination, the value itself if it is invalid
+    """
+    afi = 'ipv6' if isinstance(value, string_types) and ':' in value else 'ipv4'
+    return normalize_prefixes(afi, [value]).prefixes[0]
+
+
+def normalize_address(value):
+    """ The canonical form of an address of either afi
+
+    :param value: the address, e.g. 2001:0db8::1
+    :rtype: str
+    :returns: the canonical address, the value itself if it is invalid
+    """
+    family = socket.AF_INET6 if ':' in value else socket.AF_INET
+    try:
+        return socket.inet_ntop(family, socket.inet_pton(family, value))
+    except (socket.error, ValueError, TypeError):
+        return value
+
+
+def _mask(packed, length, size):
+    full, rest = divmod(length, 8)
+    if full == size:
+        return packed
+    network = bytearray(packed)
+    if rest:
+        network[full] &= (0xff << (8 - rest)) & 0xff
+        full += 1
+    for i in range(full, size):
+        network[i] = 0
+    return bytes(network)
@@ -0,0 +1,137 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# submit
+
+import time
+
+
+CONTEXT_PREFIX = 'vrf context '
+
+
+def split_batches(commands, batch_size):
+    """ Split the commands into batches of at most batch_size commands
+
+    The commands are a list of 'vrf context ..' headers, each followed by
+    the commands entered in it. Batches end at a header where possible, a
+    context too large for one batch is split, and every batch after the
+    first of it starts with the header again.
+
+    :param commands: the commands
+    :param batch_size: the most commands in a batch, headers included,
+                       no limit if it is not a positive int
+    :rtype: A list
+    :returns: the batches, as lists of commands
+    """
+    if not batch_size or batch_size < 1 or len(commands) <= batch_size:
+        return [list(commands)] if commands else []
+    # a header and at least one command fit in every batch
+    batch_size = max(batch_size, 2)
+    groups = []
+    for command in commands:
+        if command.startswith(CONTEXT_PREFIX) or not groups:
+            groups.append([command])
+        else:
+            groups[-1].append(command)
+
+    batches = []
+    batch = []
+    for group in groups:
+        if batch and len(batch) + len(group) > batch_size:
+            batches.append(batch)
+            batch = []
+        if len(group) <= batch_size:
+            batch.extend(group)
+            continue
+        header = group[0] if group[0].startswith(CONTEXT_PREFIX) else None
+        body = group[1:] if header else group
+        step = batch_size - 1 if header else batch_size
+        for start in range(0, len(body), step):
+            batch = ([header] if header else []) + body[start:start + step]
+            if start + step < len(body):
+                batches.append(batch)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def submit_batches(connection, batches, session=None):
+    """ Send the batches to the device one after another
+
+    Without a session every batch is applied by its own edit_config. With
+    a session the batches are entered in the NX-OS configure session of
+    that name and committed together once the last one is in, so either
+    all of them are applied or, if one fails, none (the session is
+    aborted). A stateless connection, e.g. NX-API, forgets the session
+    between calls, so the session, all the batches and the commit are sent
+    in one edit_config instead.
+
+    :param connection: the device connection
+    :param batches: the batches, as lists of commands
+    :param session: the configure session name, None to not use one
+    :rtype: A list
+    :returns: the number of commands and the seconds it took for every
+              batch, with the commit as a last entry when using a session
+    """
+    if session and getattr(connection, 'stateless', False):
+        return submit_session_request(connection, batches, session)
+    stats = []
+    if session:
+        connection.run_commands(['configure session ' + session])
+    try:
+        for batch in batches:
+            start = time.time()
+            if session:
+                connection.run_commands(batch)
+            else:
+                connection.edit_config(batch)
+            stats.append({'commands': len(batch), 'elapsed': time.time() - start})
+        if session:
+            start = time.time()
+            connection.run_commands(['commit'])
+            stats.append({'commands': 0, 'commit': True, 'elapsed': time.time() - start})
+    except Exception:
+        if session:
+            connection.run_commands(['abort'])
+        raise
+    return stats
+
+
+def session_request(batches, session):
+    """ The commands entering the batches in a configure session and
+        committing them, for a stateless connection
+
+    :param batches: the batches, as lists of commands
+    :param session: the configure session name
+    :rtype: A list
+    :returns: the commands, the session first and the commit last
+    """
+    commands = ['configure session ' + session]
+    for batch in batches:
+        commands.extend(batch)
+    commands.append('commit')
+    return commands
+
+
+def submit_session_request(connection, batches, session):
+    """ Send the batches in a configure session in one edit_config, and
+        abort the session in another if it fails
+
+    :param connection: the stateless device connection
+    :param batches: the batches, as lists of commands
+    :param session: the configure session name
+    :rtype: A list
+    :returns: one entry, the number of commands and the seconds it took
+    """
+    commands = session_request(batches, session)
+    start = time.time()
+    try:
+        connection.edit_config(commands)
+    except Exception:
+        connection.edit_config(['configure session ' + session, 'abort'])
+        raise
+    return [{'commands': len(commands) - 2, 'commit': True, 'elapsed': time.time() - start}]
+
@@ -0,0 +1,148 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# trace
+
+import itertools
+import json
+import threading
+import time
+
+
+class Span(object):
+    """ A timed phase of a run, recorded by its tracer when it ends
+    """
+    __slots__ = ('tracer', 'name', 'attrs', 'start', 'id', 'parent')
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start = None
+        self.id = None
+        self.parent = None
+
+    def __enter__(self):
+        self.id, self.parent = self.tracer.open(self)
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        elapsed = time.time() - self.start
+        self.tracer.close(self)
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        attrs = dict(self.attrs, id=self.id)
+        if self.parent is not None:
+            attrs['parent'] = self.parent
+        self.tracer.record(self.name, self.start, elapsed, attrs)
+        return False
+
+
+class NullSpan(object):
+    """ The span of a disabled tracer, it records nothing
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Tracer(object):
+    """ Records timed spans of the phases of a run, e.g. gather, fetch,
+        parse, validate, diff and edit_config
+
+    A disabled tracer hands out NULL_SPAN and keeps nothing. An enabled
+    tracer keeps every span in spans, and appends it as a JSON line to
+    path if one is given. Every span has an id, and the id of the span it
+    is nested in as its parent, i.e. of the innermost span open in the
+    same thread when it started.
+    """
+
+    def __init__(self, enabled=False, path=None):
+        self.enabled = enabled or bool(path)
+        self.path = path
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+
+    def span(self, name, **attrs):
+        """ A span to time a phase with, as a context manager
+
+        :param name: the phase
+        :param attrs: extra values recorded with the span
+        :rtype: Span or NullSpan
+        :returns: the span
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, attrs)
+
+    def open(self, span):
+        """ Enter a span in the spans open in this thread
+
+        :param span: the span
+        :rtype: tuple
+        :returns: the id of the span and the id of its parent, None at
+                  the top level
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        parent = stack[-1].id if stack else None
+        stack.append(span)
+        return next(self._ids), parent
+
+    def close(self, span):
+        """ Leave a span of the spans open in this thread
+        """
+        self._local.stack.remove(span)
+
+    def record(self, name, start, elapsed, attrs=None):
+        """ Record a finished span
+
+        :param name: the phase
+        :param start: the epoch time the phase started at
+        :param elapsed: the seconds the phase took
+        :param attrs: extra values recorded with the span
+        """
+        span = {'name': name, 'start': start, 'elapsed': elapsed}
+        if attrs:
+            span.update(attrs)
+        self.spans.append(span)
+        if self.path:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(span, sort_keys=True) + '\n')
+
+
+NULL_TRACER = Tracer()
+
+
+def get_tracer(module):
+    """ The tracer of a module run, built from the trace and trace_path
+        params on first use and shared by the config and facts classes
+
+    :param module: the AnsibleModule, or None
+    :rtype: Tracer
+    :returns: the tracer, NULL_TRACER when tracing is off
+    """
+    if module is None:
+        return NULL_TRACER
+    tracer = getattr(module, '_nxos_tracer', None)
+    if tracer is None:
+        params = getattr(module, 'params', None) or {}
+        if params.get('trace') or params.get('trace_path'):
+            tracer = Tracer(True, params.get('trace_path'))
+        else:
+            tracer = NULL_TRACER
+        module._nxos_tracer = tracer
+    return tracer
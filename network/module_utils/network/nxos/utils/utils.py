@@ -5,3 +5,225 @@
 # (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 # utils
+
+import os
+from collections import OrderedDict
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.module_utils.six import integer_types, string_types
+
+
+class ContextCommands(object):
+    """ An ordered, duplicate free list of commands grouped under the
+        context header (e.g. 'vrf context Test') they must be entered in
+
+    Groups and the commands within a group keep the order in which they
+    were first added, every add is a constant time operation.
+    """
+
+    def __init__(self):
+        self._groups = OrderedDict()
+        self._count = 0
+
+    def add(self, header, command):
+        """ Add a command under the given context header
+
+        :param header: the context the command is entered in
+        :param command: the command
+        """
+        group = self._groups.get(header)
+        if group is None:
+            group = self._groups[header] = OrderedDict()
+        if command not in group:
+            group[command] = None
+            self._count += 1
+
+    def discard(self, header, command):
+        """ Remove a command from under the given context header
+
+        :param header: the context the command is entered in
+        :param command: the command
+        """
+        group = self._groups.get(header)
+        if group and command in group:
+            del group[command]
+            self._count -= 1
+
+    def groups(self):
+        """ Iterate over the context headers and their commands
+
+        :rtype: generator
+        :returns: (header, list of commands) for every non-empty context
+        """
+        for header, group in self._groups.items():
+            if group:
+                yield header, list(group)
+
+    def extend(self, other):
+        """ Add all the commands of another ContextCommands
+
+        :param other: the ContextCommands to merge in
+        """
+        for header, group in other._groups.items():
+            for command in group:
+                self.add(header, command)
+
+    def __iter__(self):
+        for header, group in self._groups.items():
+            if group:
+                yield header
+                for command in group:
+                    yield command
+
+    def __len__(self):
+        return self._count
+
+
+class SpecValidationError(ValueError):
+    """ Raised by a validator built by spec_validator for data it cannot
+        validate, the generic validator reports the actual failure
+    """
+    pass
+
+
+def spec_validator(spec, context=()):
+    """ Build a validator for data of an argspec
+
+    The validator checks unsupported options, required options, types,
+    choices and then the suboptions, in the order AnsibleModule does and
+    with its messages, and drops the empty values, i.e. it does what
+    validate_config followed by remove_empties does, in one pass over the
+    data and without building an AnsibleModule. It only knows the types the
+    resource argspecs use, any other type raises SpecValidationError.
+
+    :param spec: the argspec options, e.g. argument_spec['config']['options']
+    :param context: the names of the options the spec is nested in
+    :rtype: function
+    :returns: a function taking the data dictionary and returning it validated
+    """
+    keys = frozenset(spec)
+    required = [key for key, option in spec.items() if option.get('required', False)]
+    scalars = []
+    suboptions = []
+    choices = []
+    choice_keys = frozenset(key for key, option in spec.items() if option.get('choices'))
+    for key, option in spec.items():
+        if option.get('options'):
+            suboptions.append((key, option.get('default'), _spec_suboptions(key, option, context)))
+        else:
+            scalars.append((key, option.get('default'), option.get('type', 'str'), _spec_coercer(key, option)))
+        if option.get('choices'):
+            choices.append((key, option['choices'], frozenset(option['choices'])))
+    found_in = ''
+    if context:
+        found_in = ' found in %s' % ' -> '.join(context)
+
+    def validate(data):
+        if not isinstance(data, dict):
+            raise SpecValidationError('%r is not a dictionary%s' % (data, found_in))
+        if not keys.issuperset(data):
+            raise SpecValidationError('unsupported parameters: %s%s Supported parameters include: %s' % (
+                ', '.join(sorted(set(data) - keys)), found_in + '.' if context else '', ', '.join(sorted(keys))))
+        # like AnsibleModule, a required option given as None is present
+        for key in required:
+            if key not in data:
+                raise SpecValidationError('missing required arguments: %s%s' % (
+                    ', '.join(key for key in required if key not in data), found_in))
+        validated = {}
+        for key, default, option_type, coerce in scalars:
+            value = data.get(key)
+            if value is None:
+                value = default
+                if value is None:
+                    continue
+            try:
+                value = coerce(value)
+            except SpecValidationError:
+                raise
+            except (TypeError, ValueError) as exc:
+                raise SpecValidationError('argument %s is of type %s%s and we were unable to convert to %s: %s' % (
+                    key, type(value), " found in '%s'." % ' -> '.join(context) if context else '',
+                    option_type, exc))
+            # an empty value is dropped once its choices are checked
+            if value != '' or key in choice_keys:
+                validated[key] = value
+        for key, values, allowed in choices:
+            value = validated.get(key)
+            if value is not None and value not in allowed:
+                raise SpecValidationError('value of %s must be one of: %s, got: %s%s' % (
+                    key, ', '.join(values), value, found_in))
+            if value == '':
+                del validated[key]
+        for key, default, validate_suboptions in suboptions:
+            value = data.get(key)
+            if value is None:
+                value = default
+                if value is None:
+                    continue
+            value = validate_suboptions(value)
+            if value:
+                validated[key] = value
+        return validated
+    return validate
+
+
+def _spec_suboptions(key, option, context):
+    option_type = option.get('type', 'str')
+    validate = spec_validator(option['options'], context + (key,))
+    if option_type == 'list' and option.get('elements') == 'dict':
+        def coerce(value):
+            if not isinstance(value, list):
+                raise SpecValidationError('%s must be a list' % key)
+            return [validate(element) for element in value]
+        return coerce
+    if option_type == 'dict':
+        return validate
+
+    def unsupported(value):
+        raise SpecValidationError('type %s of %s is not supported' % (option_type, key))
+    return unsupported
+
+
+def _spec_coercer(key, option):
+    option_type = option.get('type', 'str')
+    if option_type == 'str':
+        return _coerce_str
+    if option_type == 'int':
+        return _coerce_int
+    if option_type == 'bool':
+        return _coerce_bool
+    if option_type == 'path':
+        return _coerce_path
+
+    def unsupported(value):
+        raise SpecValidationError('type %s of %s is not supported' % (option_type, key))
+    return unsupported
+
+
+def _coerce_str(value):
+    if isinstance(value, string_types):
+        return value
+    return str(value)
+
+
+def _coerce_int(value):
+    if isinstance(value, integer_types):
+        return value
+    if isinstance(value, string_types):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise TypeError('%s cannot be converted to an int' % type(value))
+
+
+def _coerce_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, string_types) or isinstance(value, (int, float)):
+        return boolean(value)
+    raise TypeError('%s cannot be converted to a bool' % type(value))
+
+
+def _coerce_path(value):
+    return os.path.expanduser(os.path.expandvars(_coerce_str(value)))
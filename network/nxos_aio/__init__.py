@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The async counterparts of the nxos static_routes facts and config classes
+It is in this package, outside the module_utils that modules ship to
+devices and that stay python 2 compatible, that the static routes of many
+devices are gathered and configured from one event loop. Python 3.5+ only,
+it imports the module_utils of the installed ansible or of the role.
+"""
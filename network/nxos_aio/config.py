@@ -0,0 +1,84 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The nxos_static_routes async class
+It is in this file where Static_routes runs over an AsyncConnection, so
+that the device I/O of many devices, or of many commands, overlaps in
+one event loop.
+"""
+import time
+
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+from ansible.module_utils.network.nxos.facts.facts import Facts
+from ansible.module_utils.network.nxos.utils.submit import split_batches
+from ansible.module_utils.network.nxos.utils.trace import get_tracer
+from nxos_aio.connection import submit_batches_async
+from nxos_aio.facts import AsyncStatic_routesFacts
+
+
+class AsyncStatic_routes(Static_routes):
+    """
+    The nxos_static_routes class, over an AsyncConnection
+    """
+
+    def __init__(self, module, connection):
+        # get_resource_connection hands ConfigBase the connection set on the module
+        module._connection = connection
+        super(AsyncStatic_routes, self).__init__(module)
+
+    async def fetch_static_routes_facts(self):
+        """ Get the 'facts' (the current configuration) from the device
+
+        :rtype: A list
+        :returns: The current configuration as a list of dictionaries
+        """
+        facts = {'ansible_network_resources': {}}
+        await AsyncStatic_routesFacts(self._module).populate_facts(self._connection, facts)
+        return facts['ansible_network_resources'].get('static_routes') or []
+
+    async def execute_module_async(self):
+        """ Execute the module
+
+        Unlike execute_module it reads the facts from the device, not
+        through the facts cache, but like it drops the cached facts of the
+        device once the commands are pushed.
+
+        :rtype: A dictionary
+        :returns: The result from module execution
+        """
+        tracer = get_tracer(self._module)
+        existing_static_routes_facts = await self.fetch_static_routes_facts()
+        result, commands = self.get_result(existing_static_routes_facts)
+        if result['changed'] and not self._module.check_mode:
+            start = time.time()
+            with tracer.span('edit_config', commands=len(commands)):
+                result['plan']['batches'] = await self.edit_config_async(commands)
+            result['plan']['apply_time'] = time.time() - start
+            Facts(self._module).invalidate_cache()
+        if result['changed']:
+            if self._module.params.get('verify_after'):
+                result['after'] = await self.fetch_static_routes_facts()
+            else:
+                result['after'] = self.get_after_facts(
+                    existing_static_routes_facts, commands)
+        if tracer.enabled:
+            result['timings'] = tracer.spans
+        return result
+
+    async def edit_config_async(self, commands):
+        """ The async counterpart of edit_config
+
+        :param commands: the commands
+        :rtype: A list
+        :returns: the number of commands and the seconds it took for every batch
+        """
+        batch_size = self._module.params.get('batch_size')
+        session = self._module.params.get('config_session')
+        if not batch_size and not session:
+            start = time.time()
+            await self._connection.edit_config(commands)
+            return [{'commands': len(commands), 'elapsed': time.time() - start}]
+        return await submit_batches_async(self._connection, split_batches(commands, batch_size), session)
@@ -0,0 +1,191 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+# connection
+
+import asyncio
+import base64
+import ssl
+import time
+
+from ansible.module_utils.network.nxos.utils.nxapi import NxapiError, nxapi_request, nxapi_results
+from ansible.module_utils.network.nxos.utils.submit import session_request
+
+# the loop of the running coroutine, get_event_loop returns it too before
+# python 3.7
+_get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncConnection(object):
+    """ The connection the async facts and config classes talk to the
+        device through, a subclass implements the three coroutines
+
+    A stateless connection, one that keeps no configure session between
+    calls, sets stateless.
+    """
+    stateless = False
+
+    async def get(self, command):
+        """ Run a show command
+
+        :param command: the command
+        :returns: the output, as text, or decoded when it is JSON
+        """
+        raise NotImplementedError
+
+    async def edit_config(self, candidate):
+        """ Apply config commands
+
+        :param candidate: the commands
+        """
+        raise NotImplementedError
+
+    async def run_commands(self, commands):
+        """ Run commands as they are, e.g. to enter a configure session
+
+        :param commands: the commands
+        :rtype: A list
+        :returns: the output of every command
+        """
+        raise NotImplementedError
+
+    def get_option(self, option):
+        """ An option of the connection, like the get_option of a
+            persistent connection, e.g. host
+
+        :param option: the option name
+        :returns: the value, KeyError for an option it does not have
+        """
+        raise KeyError(option)
+
+
+class SyncConnectionAdapter(AsyncConnection):
+    """ An AsyncConnection over a blocking connection, e.g. the persistent
+        connection of a module, its calls run in an executor
+    """
+
+    def __init__(self, connection, executor=None):
+        self.connection = connection
+        self.executor = executor
+        self.stateless = getattr(connection, 'stateless', False)
+
+    def _run(self, method, *args):
+        return _get_running_loop().run_in_executor(self.executor, method, *args)
+
+    def get_option(self, option):
+        return self.connection.get_option(option)
+
+    async def get(self, command):
+        return await self._run(self.connection.get, command)
+
+    async def edit_config(self, candidate):
+        return await self._run(self.connection.edit_config, candidate)
+
+    async def run_commands(self, commands):
+        return await self._run(self.connection.run_commands, commands)
+
+
+class NxapiConnection(AsyncConnection):
+    """ An AsyncConnection to the NX-API JSON-RPC endpoint of a device,
+        one HTTP request per call on asyncio streams, the counterpart of
+        nxapi.NxapiConnection
+    """
+    stateless = True
+
+    def __init__(self, host, username, password, port=None, use_ssl=True,
+                 validate_certs=True, timeout=30):
+        self.host = host
+        self.port = port or (443 if use_ssl else 80)
+        self.timeout = timeout
+        self._auth = base64.b64encode(
+            ('%s:%s' % (username, password)).encode('utf-8')).decode('ascii')
+        self._ssl = None
+        if use_ssl:
+            self._ssl = ssl.create_default_context()
+            if not validate_certs:
+                self._ssl.check_hostname = False
+                self._ssl.verify_mode = ssl.CERT_NONE
+
+    def get_option(self, option):
+        return {'host': self.host, 'port': self.port, 'timeout': self.timeout}[option]
+
+    async def _request(self, method, commands):
+        body = nxapi_request(method, commands).encode('utf-8')
+        head = ('POST /ins HTTP/1.0\r\n'
+                'Host: %s\r\n'
+                'Authorization: Basic %s\r\n'
+                'Content-Type: application/json-rpc\r\n'
+                'Content-Length: %d\r\n\r\n') % (self.host, self._auth, len(body))
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl), self.timeout)
+        try:
+            writer.write(head.encode('ascii') + body)
+            data = await asyncio.wait_for(reader.read(), self.timeout)
+        finally:
+            writer.close()
+        head, _sep, payload = data.partition(b'\r\n\r\n')
+        status = head.split(b'\r\n', 1)[0].split()
+        if len(status) < 2 or status[1] != b'200':
+            raise NxapiError('NX-API request to %s failed: %s' % (
+                self.host, head.split(b'\r\n', 1)[0].decode('latin-1')))
+        return nxapi_results(payload)
+
+    async def get(self, command):
+        if command.endswith('| json'):
+            result = await self._request('cli', [command[:-len('| json')].strip()])
+            return result[0].get('body') or {}
+        result = await self._request('cli_ascii', [command])
+        return result[0].get('msg', '')
+
+    async def edit_config(self, candidate):
+        return await self._request('cli', list(candidate))
+
+    async def run_commands(self, commands):
+        result = await self._request('cli_ascii', list(commands))
+        return [r.get('msg', '') for r in result]
+
+
+async def submit_batches_async(connection, batches, session=None):
+    """ The async counterpart of submit.submit_batches, a stateless
+        connection gets the session, the batches and the commit in one
+        edit_config
+
+    :param connection: the AsyncConnection
+    :param batches: the batches, as lists of commands
+    :param session: the configure session name, None to not use one
+    :rtype: A list
+    :returns: the number of commands and the seconds it took for every
+              batch, with the commit as a last entry when using a session
+    """
+    if session and connection.stateless:
+        commands = session_request(batches, session)
+        start = time.time()
+        try:
+            await connection.edit_config(commands)
+        except Exception:
+            await connection.edit_config(['configure session ' + session, 'abort'])
+            raise
+        return [{'commands': len(commands) - 2, 'commit': True, 'elapsed': time.time() - start}]
+    stats = []
+    if session:
+        await connection.run_commands(['configure session ' + session])
+    try:
+        for batch in batches:
+            start = time.time()
+            if session:
+                await connection.run_commands(batch)
+            else:
+                await connection.edit_config(batch)
+            stats.append({'commands': len(batch), 'elapsed': time.time() - start})
+        if session:
+            start = time.time()
+            await connection.run_commands(['commit'])
+            stats.append({'commands': 0, 'commit': True, 'elapsed': time.time() - start})
+    except Exception:
+        if session:
+            await connection.run_commands(['abort'])
+        raise
+    return stats
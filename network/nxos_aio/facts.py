@@ -0,0 +1,52 @@
+#
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The nxos static_routes async fact class
+It is in this file the configuration is collected from the device over
+an AsyncConnection, with the show commands in flight together, and then
+parsed like Static_routesFacts does.
+"""
+import asyncio
+
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts, JSON_GATHER_COMMANDS
+from ansible.module_utils.network.nxos.utils.trace import get_tracer
+
+
+class AsyncStatic_routesFacts(Static_routesFacts):
+    """ The nxos static_routes fact class, over an AsyncConnection
+    """
+
+    async def populate_facts(self, connection, ansible_facts, data=None):
+        """ Populate the facts for static_routes
+        :param connection: the AsyncConnection of the device
+        :param ansible_facts: Facts dictionary
+        :param data: previously collected conf
+        :rtype: dictionary
+        :returns: facts
+        """
+        tracer = get_tracer(self._module)
+        with tracer.span('gather', resource='static_routes'):
+            vrfs = lines = raw = None
+            if data:
+                lines = self.get_config_lines(data)
+                raw = data
+            else:
+                if self.get_gather_mode() == 'json':
+                    with tracer.span('fetch', resource='static_routes', commands=len(JSON_GATHER_COMMANDS)):
+                        outputs = await asyncio.gather(
+                            *[connection.get(command) for _afi, command in JSON_GATHER_COMMANDS],
+                            return_exceptions=True)
+                    if not any(isinstance(output, Exception) for output in outputs):
+                        vrfs = self.parse_json_outputs(
+                            [(afi, output) for (afi, _command), output in zip(JSON_GATHER_COMMANDS, outputs)])
+                if vrfs is None:
+                    commands = self.get_gather_commands()
+                    with tracer.span('fetch', resource='static_routes', commands=len(commands)):
+                        outputs = await asyncio.gather(
+                            *[connection.get(command) for command in commands])
+                    lines = self.get_output_lines(outputs)
+                    raw = outputs
+            return self.render_facts(ansible_facts, vrfs, lines, raw, self.get_device(connection))
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Reconcile the static routes of the devices of an inventory
+
+Every device is brought to its desired state from one process, with
+reconcile_files.
+
+    python nxos_fanout.py inventory.json desired.json \\
+        [--output results.jsonl] [--concurrency 32] [--check] \\
+        [--connection nxapi|socket]
+
+The inventory is a JSON object of {device name: inventory variables}, the
+desired state one of {device name: module options}, whose 'default' entry
+applies to the devices without one. Every result is written as a JSON line,
+the summary goes to stderr and the exit status is 1 when a device failed.
+It runs with ansible installed, the module_utils of this tree take
+precedence over the ones of the installed ansible, like in
+tests/unit/conftest.py.
+"""
+import argparse
+import json
+import os
+import sys
+
+import ansible.module_utils.network
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+MODULE_UTILS = os.path.join(ROOT, 'module_utils', 'network')
+
+if MODULE_UTILS not in ansible.module_utils.network.__path__:
+    ansible.module_utils.network.__path__.insert(0, MODULE_UTILS)
+
+from ansible.module_utils.network.nxos.config.static_routes.fanout import (  # noqa: E402
+    nxapi_connection, reconcile_files, socket_connection)
+
+CONNECTIONS = {'nxapi': nxapi_connection, 'socket': socket_connection}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('inventory', help='JSON file of {device name: inventory variables}')
+    parser.add_argument('desired_state', help='JSON file of {device name: module options}')
+    parser.add_argument('--output', help='file the results are written to, stdout by default')
+    parser.add_argument('--concurrency', type=int, default=32, help='the most devices in flight')
+    parser.add_argument('--check', action='store_true', help='only compute the commands')
+    parser.add_argument('--connection', choices=sorted(CONNECTIONS), default='nxapi',
+                        help='NX-API from the inventory variables, or the socket_path '
+                             'of a running ansible-connection')
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        summary = reconcile_files(args.inventory, args.desired_state, output,
+                                  connection_factory=CONNECTIONS[args.connection],
+                                  concurrency=args.concurrency, check_mode=args.check)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    sys.stderr.write(json.dumps(summary, sort_keys=True) + '\n')
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The throughput of pushing a plan in batches of every size, to a
+simulated device with a fixed latency per call and a cost per command.
+
+    python tests/bench/bench_batches.py --routes 20000 \\
+        --batch-sizes 0 100 1000 5000 [--session bench]
+"""
+import argparse
+import json
+import time
+
+from benchlib import clock
+
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+from ansible.module_utils.network.nxos.utils.submit import split_batches, submit_batches
+
+from synth import generate_config
+from tests.unit.nxos.nxos_module import FakeModule
+
+
+class SimulatedConnection(object):
+    """ A connection standing in for a device to measure the throughput of
+        batch sizes with, every call takes latency seconds plus
+        per_command seconds for each command it sends
+    """
+
+    def __init__(self, latency=0.05, per_command=0.0005):
+        self.latency = latency
+        self.per_command = per_command
+        self.calls = 0
+        self.commands = 0
+
+    def _send(self, commands):
+        commands = list(commands)
+        self.calls += 1
+        self.commands += len(commands)
+        time.sleep(self.latency + self.per_command * len(commands))
+        return [''] * len(commands)
+
+    def edit_config(self, candidate=None, *args, **kwargs):
+        return self._send(candidate or [])
+
+    def run_commands(self, commands=None, *args, **kwargs):
+        return self._send(commands or [])
+
+
+def measure_batch_sizes(commands, batch_sizes, latency=0.05, per_command=0.0005, session=None):
+    """ Submit the commands to a SimulatedConnection in batches of every
+        size and measure the throughput
+
+    :param commands: the commands
+    :param batch_sizes: the batch sizes to measure
+    :param latency: the seconds of every call
+    :param per_command: the seconds of every command in a call
+    :param session: the configure session name, None to not use one
+    :rtype: A list
+    :returns: the batch size, the number of batches, the seconds and the
+              commands per second of every run
+    """
+    results = []
+    for batch_size in batch_sizes:
+        connection = SimulatedConnection(latency, per_command)
+        batches = split_batches(commands, batch_size)
+        start = clock()
+        submit_batches(connection, batches, session)
+        elapsed = clock() - start
+        results.append({
+            'batch_size': batch_size,
+            'batches': len(batches),
+            'calls': connection.calls,
+            'elapsed': elapsed,
+            'commands_per_sec': len(commands) / elapsed if elapsed else 0.0,
+        })
+    return results
+
+
+def plan_commands(routes, vrfs):
+    """ The commands configuring a synthetic config on an empty device
+    """
+    facts = {'ansible_network_resources': {}}
+    Static_routesFacts(FakeModule()).populate_facts(None, facts, data=generate_config(routes, vrfs))
+    config = facts['ansible_network_resources']['static_routes']
+    result, _commands = Static_routes(FakeModule(state='rendered', config=config)).get_result([])
+    return result['rendered']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--routes', type=int, default=20000)
+    parser.add_argument('--vrfs', type=int, default=10)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[0, 100, 1000, 5000])
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--per-command', type=float, default=0.0005)
+    parser.add_argument('--session')
+    args = parser.parse_args()
+    commands = plan_commands(args.routes, args.vrfs)
+    results = measure_batch_sizes(commands, args.batch_sizes, args.latency,
+                                  args.per_command, args.session)
+    print(json.dumps({'commands': len(commands), 'results': results}, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
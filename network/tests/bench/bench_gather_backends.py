@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The parse time of the static routes, per 10k routes, from the running
+config text and from the JSON output of 'show ip(v6) static-route vrf all',
+on a synthetic config and the JSON output the device shows for it.
+
+Then the end to end gather time of every gather_mode against a stand-in
+device that replays a transcript, the output of every show command, with
+the latency of a round trip, the time the device takes to render the
+running config for every 'show running-config' (whatever its filter) and
+the time to send the output.
+
+    python tests/bench/bench_gather_backends.py [--routes 20000] \
+        [--record transcript.json | --transcript transcript.json]
+
+--record writes the synthetic transcript, --transcript replays one
+recorded from a device instead, {command: output}.
+"""
+import argparse
+import json
+import re
+import time
+
+from benchlib import best_of, per_call
+
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import GATHER_COMMANDS, Static_routesFacts
+
+from synth import generate_config
+from tests.unit.nxos.nxos_module import FakeConnection, FakeModule
+
+JSON_COMMANDS = {
+    'ipv4': 'show ip static-route vrf all | json',
+    'ipv6': 'show ipv6 static-route vrf all | json',
+}
+
+
+def to_json_output(static_routes, afi):
+    """ The output of 'show ip(v6) static-route vrf all | json' for the
+        static_routes facts
+    """
+    prefix_key, next_hop_key = ('ipprefix', 'ipnexthop') if afi == 'ipv4' else ('ipv6prefix', 'ipv6nexthop')
+    rows = []
+    for vrf in static_routes:
+        name = 'default' if vrf['vrf'] == '__global__' else vrf['vrf']
+        prefixes = []
+        for af in vrf.get('address_families', []):
+            if af['afi'] != afi:
+                continue
+            for route in af['routes']:
+                paths = []
+                for next_hop in route['next_hops']:
+                    path = {next_hop_key: next_hop.get('forward_router_address') or ('0.0.0.0' if afi == 'ipv4' else '::'),
+                            'nhvrf': next_hop.get('dest_vrf', name),
+                            'pref': str(next_hop.get('admin_distance', 1)),
+                            'tag': str(next_hop.get('tag', 0)),
+                            'rtname': next_hop.get('route_name', '')}
+                    if 'interface' in next_hop:
+                        path['ifname'] = next_hop['interface']
+                    if 'track' in next_hop:
+                        path['track'] = str(next_hop['track'])
+                    paths.append(path)
+                prefixes.append({prefix_key: route['dest'], 'TABLE_path': {'ROW_path': paths}})
+        if prefixes:
+            rows.append({'vrf_name': name, 'TABLE_addrf': {'ROW_addrf': {
+                'addrf': afi, 'TABLE_prefix': {'ROW_prefix': prefixes}}}})
+    return json.dumps({'TABLE_vrf': {'ROW_vrf': rows}})
+
+
+class TranscriptConnection(object):
+    """ A device replaying the output of every command of a transcript,
+        every command takes a round trip, the render of the running config
+        for 'show running-config' commands, and the transfer of its output
+    """
+
+    def __init__(self, transcript, rtt=0.05, render_per_byte=1e-7, transfer_per_byte=1e-8):
+        self.transcript = transcript
+        self.rtt = rtt
+        self.render_per_byte = render_per_byte
+        self.transfer_per_byte = transfer_per_byte
+        self.config_bytes = len(transcript.get('show running-config', ''))
+        self.commands = 0
+        self.bytes = 0
+
+    def get(self, command):
+        output = self.transcript.get(command)
+        if output is None:
+            raise ValueError('invalid command: %s' % command)
+        size = len(output) if isinstance(output, str) else len(json.dumps(output))
+        seconds = self.rtt + size * self.transfer_per_byte
+        if command.startswith('show running-config'):
+            seconds += self.config_bytes * self.render_per_byte
+        time.sleep(seconds)
+        self.commands += 1
+        self.bytes += size
+        return output
+
+
+def filter_config(config, pattern, section):
+    """ The output of 'show running-config | include/section pattern'
+    """
+    regex = re.compile(pattern)
+    lines = []
+    in_section = False
+    for line in config.splitlines():
+        if not line.startswith(' '):
+            in_section = bool(regex.search(line))
+            if in_section:
+                lines.append(line)
+        elif section and in_section:
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def other_config(lines):
+    """ Interface config standing in for the rest of a running config
+    """
+    blocks = []
+    for index in range(lines // 3):
+        blocks.append('interface Ethernet%d/%d\n  description uplink %d\n  no shutdown'
+                      % (index // 48 + 1, index % 48 + 1, index))
+    return '\n'.join(blocks) + '\n' if blocks else ''
+
+
+def synthetic_transcript(routes, vrfs, next_hops, other_lines):
+    """ The output of the gather commands of every gather_mode for a
+        synthetic config
+    """
+    routes_config = generate_config(routes, vrfs, next_hops)
+    # the global routes, then the rest of the config, then the vrf blocks
+    head, sep, vrf_blocks = routes_config.partition('vrf context ')
+    config = head + other_config(other_lines) + sep + vrf_blocks
+    transcript = {'show running-config': config}
+    for command in set(c for commands in GATHER_COMMANDS.values() for c in commands):
+        match = re.match(r"show running-config \| (include|section) '(.*)'$", command)
+        if match:
+            transcript[command] = filter_config(config, match.group(2), match.group(1) == 'section')
+    text = gather('full', FakeConnection(transcript))
+    for afi, command in JSON_COMMANDS.items():
+        transcript[command] = to_json_output(text, afi)
+    return transcript
+
+
+def gather(gather_mode, connection):
+    facts = {'ansible_network_resources': {}}
+    Static_routesFacts(FakeModule(connection, gather_mode=gather_mode)).populate_facts(connection, facts)
+    return facts['ansible_network_resources'].get('static_routes')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--routes', type=int, default=20000)
+    parser.add_argument('--vrfs', type=int, default=10)
+    parser.add_argument('--next-hops', type=int, default=2)
+    parser.add_argument('--other-lines', type=int, default=30000,
+                        help='lines of non route config in the running config')
+    parser.add_argument('--rtt', type=float, default=0.05)
+    parser.add_argument('--render-per-byte', type=float, default=1e-7)
+    parser.add_argument('--transfer-per-byte', type=float, default=1e-8)
+    parser.add_argument('--transcript')
+    parser.add_argument('--record')
+    args = parser.parse_args()
+    if args.transcript:
+        with open(args.transcript) as f:
+            transcript = json.load(f)
+    else:
+        transcript = synthetic_transcript(args.routes, args.vrfs, args.next_hops, args.other_lines)
+    if args.record:
+        with open(args.record, 'w') as f:
+            json.dump(transcript, f, indent=1, sort_keys=True)
+    connection = FakeConnection(transcript)
+    text = gather('section', connection)
+    routes = sum(len(af['routes']) for vrf in text for af in vrf.get('address_families', []))
+    results = {'routes': routes, 'gather': {}}
+    if gather('json', connection) != text:
+        raise SystemExit('the json backend does not match the text backend')
+    for gather_mode in ('section', 'json'):
+        seconds = per_call(lambda: gather(gather_mode, connection))
+        results[gather_mode + '_parse_seconds_per_10k_routes'] = seconds * 10000 / max(routes, 1)
+    for gather_mode in ('section', 'full', 'split', 'json'):
+        device = TranscriptConnection(transcript, args.rtt, args.render_per_byte, args.transfer_per_byte)
+        if gather(gather_mode, device) != text:
+            raise SystemExit('gather_mode %s does not match section' % gather_mode)
+        results['gather'][gather_mode] = {'commands': device.commands, 'bytes': device.bytes}
+        results['gather'][gather_mode]['seconds'] = best_of(lambda: gather(gather_mode, device), repeat=3)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The gather time of several resources against a connection with a fixed
+latency per command, for every gather_concurrency.
+
+    python tests/bench/bench_gather_concurrency.py [--resources 6] \\
+        [--commands 3] [--latency 0.05] [--concurrency 1 2 4 8]
+"""
+import argparse
+import json
+
+from benchlib import clock
+
+from ansible.module_utils.network.nxos.facts.facts import Facts
+
+from tests.unit.nxos.nxos_module import FakeModule, LatencyConnection, slow_resource
+
+
+def gather(resources, outputs, latency, gather_concurrency):
+    connection = LatencyConnection(outputs, latency)
+    facts = Facts(FakeModule(connection, gather_concurrency=gather_concurrency))
+    start = clock()
+    facts.get_network_resources_facts(resources, ['all'])
+    return facts.ansible_facts['ansible_network_resources'], clock() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resources', type=int, default=6)
+    parser.add_argument('--commands', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    names = ['resource%d' % i for i in range(args.resources)]
+    resources = dict((name, slow_resource(name, args.commands)) for name in names)
+    outputs = dict(('show %s %d' % (name, i), '%s %d' % (name, i))
+                   for name in names for i in range(args.commands))
+    serial, _seconds = gather(resources, outputs, args.latency, 1)
+    results = {'resources': args.resources, 'commands': args.commands,
+               'latency': args.latency, 'gather': {}}
+    for concurrency in args.concurrency:
+        facts, seconds = gather(resources, outputs, args.latency, concurrency)
+        if facts != serial:
+            raise SystemExit('gather_concurrency %d does not match the serial gather' % concurrency)
+        results['gather'][concurrency] = seconds
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The time to validate and normalize the destinations of an address family
+with normalize_prefixes, against an ipaddress object built for every route.
+
+    python tests/bench/bench_prefixes.py [--prefixes 100000]
+"""
+import argparse
+import ipaddress
+import json
+
+from benchlib import best_of
+
+from ansible.module_utils.network.nxos.utils.prefixes import normalize_prefixes
+
+
+def destinations(afi, count):
+    """ count /24 or /64 destinations, one in ten with host bits set
+    """
+    if afi == 'ipv4':
+        return ['10.%d.%d.%d/24' % (i >> 16 & 255, i >> 8 & 255, 5 if i % 10 == 0 else 0)
+                for i in range(count)]
+    return ['2001:db8:%x:%x::%s/64' % (i >> 16 & 0xffff, i & 0xffff, '1' if i % 10 == 0 else '')
+            for i in range(count)]
+
+
+def with_ip_network(values):
+    return [str(ipaddress.ip_network(value, strict=False)) for value in values]
+
+
+def with_ip_interface(values):
+    return [str(ipaddress.ip_interface(value).network) for value in values]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--prefixes', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    results = {'prefixes': args.prefixes}
+    for afi in ('ipv4', 'ipv6'):
+        values = destinations(afi, args.prefixes)
+        if normalize_prefixes(afi, values).prefixes != with_ip_network(values):
+            raise SystemExit('normalize_prefixes does not match ipaddress for %s' % afi)
+        results[afi] = {
+            'normalize_prefixes': best_of(lambda: normalize_prefixes(afi, values), args.repeat),
+            'ip_network': best_of(lambda: with_ip_network(values), args.repeat),
+            'ip_interface': best_of(lambda: with_ip_interface(values), args.repeat),
+        }
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The throughput of the static route line tokenizer, in routes/sec, against
+the regex based get_inner_dict it replaced.
+
+    python tests/bench/bench_route_parser.py [--repeat 5]
+"""
+import argparse
+import json
+import re
+
+from benchlib import FIXTURE_PATH, best_of
+
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+
+
+def regex_inner_dict(conf, inner_dict):
+    """ The get_inner_dict of the regex based parser, as it was
+    """
+    conf = re.sub(r'\s*ip(v6)? route', '', conf)
+    inner_dict['dest'] = re.match(r"^\s*(\S+\/\d+) .*", conf).group(1)
+    iface = re.match(r".* ([a-zA-Z0-9]+\d*\/\d+(\/?\.?\d*)*) .*", conf)
+    if iface:
+        inner_dict['interface'] = (iface.group(1))
+        conf = re.sub(inner_dict['interface'], '', conf)
+    if '.' in inner_dict['dest']:
+        inner_dict['afi'] = 'ipv4'
+        ipv4 = re.match(r'.* (\d+\.\d+\.\d+\.\d+).*', conf)
+        inner_dict['forward_router_address'] = ipv4.group(1)
+    else:
+        inner_dict['afi'] = 'ipv6'
+        ipv6 = re.match(r'.* (\S*:\S*:\S*).*', conf)
+        inner_dict['forward_router_address'] = ipv6.group(1)
+    conf = re.sub(inner_dict['forward_router_address'], '', conf)
+    nullif = re.search('null0', conf, re.IGNORECASE)
+    if nullif:
+        inner_dict['interface'] = 'Null0'
+        inner_dict['forward_router_address'] = None
+        return inner_dict
+    for key in ['vrf', 'name', 'tag', 'track']:
+        pattern = re.match(r'.* (?:%s) (\S+).*' % key, conf)
+        if pattern:
+            if key == 'vrf':
+                key = 'dest_vrf'
+            elif key == 'name':
+                key = 'route_name'
+            inner_dict[key] = pattern.group(1).strip()
+            conf = re.sub(key + ' ' + inner_dict[key], '', conf)
+    pref = re.match(r'(?:.*) (\d+)$', conf)
+    if pref:
+        inner_dict['admin_distance'] = pref.group(1)
+    return inner_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    with open(FIXTURE_PATH + '/nxos_static_routes_lines.cfg') as f:
+        lines = f.read().splitlines() * 50
+    facts = Static_routesFacts(None)
+    results = {'routes': len(lines)}
+    for name, inner_dict in (('regex', regex_inner_dict), ('tokenizer', facts.get_inner_dict)):
+        elapsed = best_of(lambda: [inner_dict(line, {}) for line in lines], args.repeat)
+        results[name] = {'seconds': elapsed, 'routes_per_sec': int(len(lines) / elapsed)}
+    results['speedup'] = results['regex']['seconds'] / results['tokenizer']['seconds']
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Scaling curves of the static_routes parse, diff and render, the time and
+peak memory of every stage against the number of routes, on synthetic
+configs with a mocked module and connection.
+
+    python tests/bench/bench_scaling.py --routes 1000 10000 50000 \\
+        --output scaling.json
+    python tests/bench/bench_scaling.py --routes 1000 10000 50000 \\
+        --baseline scaling.json --threshold 1.5
+
+With --baseline the run fails when a stage takes more than threshold
+times its baseline time, for a route count both runs measured. The times
+are compared relative to the calibration workload of each run, so that
+a slower or busier machine is not taken for a regression.
+"""
+import argparse
+import copy
+import gc
+import json
+import sys
+
+from benchlib import calibration, clock, per_call
+
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+
+from synth import generate_config
+from tests.unit.nxos.nxos_module import FakeConnection, FakeModule
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+SECTION_COMMAND = "show running-config | section '^ip(v6)* route|^vrf context'"
+
+STATES = ('merged', 'replaced', 'overridden', 'deleted', 'rendered')
+
+# the seconds under which a stage is too quick to compare against a baseline
+MIN_SECONDS = 0.001
+
+
+def get_want(have):
+    """ The desired config: every tenth route with an extra next hop and
+        every tenth route gone
+    """
+    want = copy.deepcopy(have)
+    for vrf in want:
+        for af in vrf.get('address_families', []):
+            routes = []
+            for index, route in enumerate(af['routes']):
+                if index % 10 == 5:
+                    continue
+                if index % 10 == 0:
+                    next_hop = dict(route['next_hops'][0])
+                    next_hop['admin_distance'] = 254
+                    route['next_hops'].append(next_hop)
+                routes.append(route)
+            af['routes'] = routes
+    return want
+
+
+def get_stages(config):
+    """ The stages to measure, as functions of no arguments
+    """
+    connection = FakeConnection({SECTION_COMMAND: config})
+    lines = config.splitlines()
+    facts = Static_routesFacts(FakeModule(connection))
+    populated = {'ansible_network_resources': {}}
+    facts.populate_facts(connection, populated)
+    have = populated['ansible_network_resources']['static_routes']
+    want = get_want(have)
+
+    def populate_facts():
+        facts.populate_facts(connection, {'ansible_network_resources': {}})
+
+    stages = [
+        ('render_config', lambda: facts.render_config(facts.generated_spec, lines)),
+        ('populate_facts', populate_facts),
+    ]
+    for state in STATES:
+        module = FakeModule(connection, state=state, config=want)
+        if state == 'deleted':
+            module.params['config'] = [{'vrf': vrf.get('vrf', '__global__')} for vrf in want]
+
+        def set_state(module=module):
+            Static_routes(module).set_state(
+                copy.deepcopy(module.params['config']), have)
+        stages.append(('set_state_' + state, set_state))
+    return stages
+
+
+def peak_memory(func):
+    """ The peak bytes allocated while func runs
+    """
+    if tracemalloc is None:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(routes, vrfs, next_hops, repeat):
+    """ The seconds and peak bytes of every stage for a route count
+    """
+    start = clock()
+    config = generate_config(routes, vrfs, next_hops)
+    results = {}
+    for name, func in get_stages(config):
+        results[name] = {
+            'seconds': per_call(func, repeat),
+            'peak_bytes': peak_memory(func),
+        }
+    sys.stderr.write('%d routes measured in %.1fs\n' % (routes, clock() - start))
+    return results
+
+
+def get_regressions(report, baseline, threshold):
+    """ The stages slower than threshold times their baseline, relative
+        to the calibration of each run
+    """
+    regressions = []
+    scale = baseline['calibration_seconds'] / report['calibration_seconds']
+    for routes, stages in sorted(report['curves'].items(), key=lambda item: int(item[0])):
+        for name, result in sorted(stages.items()):
+            before = baseline.get('curves', {}).get(routes, {}).get(name)
+            if not before or before['seconds'] < MIN_SECONDS:
+                continue
+            ratio = result['seconds'] * scale / before['seconds']
+            if ratio > threshold:
+                regressions.append({'routes': int(routes), 'stage': name, 'ratio': ratio,
+                                    'seconds': result['seconds'], 'baseline': before['seconds']})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--routes', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--vrfs', type=int, default=10)
+    parser.add_argument('--next-hops', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the curves to this JSON file')
+    parser.add_argument('--baseline', help='a JSON file of an earlier run to compare with')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='the slowdown against the baseline that fails the run')
+    args = parser.parse_args()
+
+    curves = {}
+    before = calibration()
+    for routes in args.routes:
+        curves[str(routes)] = measure(routes, args.vrfs, args.next_hops, args.repeat)
+    report = {'vrfs': args.vrfs, 'next_hops': args.next_hops, 'curves': curves,
+              'calibration_seconds': min(before, calibration())}
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['regressions'] = get_regressions(report, json.load(f), args.threshold)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+    if report.get('regressions'):
+        sys.stderr.write('%d stages regressed beyond %.2fx\n' % (len(report['regressions']), args.threshold))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
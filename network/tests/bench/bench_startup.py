@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The time to build Static_routesFacts and Facts, with the shared derived
+spec, against the deepcopy of the argspec and generate_dict every
+instance used to do.
+
+    python tests/bench/bench_startup.py [--number 20000]
+"""
+import argparse
+import json
+from copy import deepcopy
+
+from benchlib import best_of
+
+from ansible.module_utils.network.common import utils
+from ansible.module_utils.network.nxos.argspec.static_routes.static_routes import Static_routesArgs
+from ansible.module_utils.network.nxos.facts.facts import Facts
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+
+from tests.unit.nxos.nxos_module import FakeModule
+
+
+def per_instance_spec():
+    """ What Static_routesFacts.__init__ derived for every instance
+    """
+    spec = deepcopy(Static_routesArgs.argument_spec)
+    return utils.generate_dict(spec['config']['options'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+    module = FakeModule()
+    results = {}
+    for name, func in (('per_instance_spec', per_instance_spec),
+                       ('Static_routesFacts', lambda: Static_routesFacts(module)),
+                       ('Facts', lambda: Facts(module))):
+        results[name + '_us'] = best_of(func, number=args.number) / args.number * 1e6
+    # what building Static_routesFacts cost when it derived the spec itself
+    results['Static_routesFacts_before_us'] = (
+        results['Static_routesFacts_us'] + results['per_instance_spec_us'])
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
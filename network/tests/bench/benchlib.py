@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Shared by the benchmark scripts, which run as
+    python tests/bench/<script>.py
+with ansible installed. The module_utils of this tree take precedence over
+the ones of the installed ansible, like in tests/unit/conftest.py.
+"""
+import gc
+import os
+import sys
+import time
+
+import ansible.module_utils.network
+
+TESTS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MODULE_UTILS = os.path.join(os.path.dirname(TESTS), 'module_utils', 'network')
+FIXTURE_PATH = os.path.join(TESTS, 'unit', 'nxos', 'fixtures')
+
+if MODULE_UTILS not in ansible.module_utils.network.__path__:
+    ansible.module_utils.network.__path__.insert(0, MODULE_UTILS)
+if os.path.dirname(TESTS) not in sys.path:
+    sys.path.insert(0, os.path.dirname(TESTS))
+
+try:
+    clock = time.perf_counter
+except AttributeError:
+    clock = time.time
+
+
+def best_of(func, repeat=5, number=1):
+    """ The fastest of repeat runs of number calls of func, in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = clock()
+        for _ in range(number):
+            func()
+        elapsed = clock() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def per_call(func, repeat=3, min_seconds=0.2):
+    """ The seconds of a call of func, the best of repeat runs of as many
+        calls as take at least min_seconds, like timeit's autorange
+    """
+    number = 1
+    while True:
+        gc.collect()
+        elapsed = best_of(func, 1, number)
+        if elapsed >= min_seconds:
+            break
+        number *= 2 if elapsed * 10 > min_seconds else 10
+    gc.collect()
+    return min(elapsed, best_of(func, repeat, number)) / number
+
+
+def calibration():
+    """ The seconds of a fixed pure python workload, a measure of the
+        speed of the machine that times can be normalized by
+    """
+    def workload():
+        words = {}
+        for i in range(20000):
+            for word in ('%d route %x' % (i, i)).split():
+                words[word] = words.get(word, 0) + 1
+        return sorted(words)
+    return per_call(workload, 5)
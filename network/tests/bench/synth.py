@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+Synthetic NX-OS static route configs of a given size, for the benchmarks.
+
+    python tests/bench/synth.py --routes 20000 --vrfs 10 --next-hops 2
+"""
+import argparse
+import sys
+
+
+def route_dest(index):
+    """ The destination of the route index, one route in ten is ipv6
+    """
+    if index % 10 == 9:
+        return 'ipv6', '2001:db8:%x:%x::/64' % (index >> 16, index & 0xffff)
+    return 'ipv4', '10.%d.%d.%d/32' % (index >> 16 & 0xff, index >> 8 & 0xff, index & 0xff)
+
+
+def next_hop_line(afi, index, hop):
+    """ The next hop hop of the route index, every fourth one with a name,
+        a tag, a track or a preference
+    """
+    if afi == 'ipv4':
+        line = '192.0.%d.%d' % (hop, index % 250 + 1)
+    else:
+        line = '2001:db8:ffff:%x::%x' % (hop + 1, index % 250 + 1)
+    if index % 4 == 1:
+        line += ' name rt_%d' % (index % 97)
+    elif index % 4 == 2:
+        line += ' tag %d' % (index % 1000 + 1)
+    elif index % 4 == 3:
+        line += ' %d' % (index % 200 + 2)
+    return line
+
+
+def generate_config(routes, vrfs=1, next_hops=1):
+    """ The running config text of routes destinations with next_hops next
+        hops each, spread over vrfs vrfs, the first of which is global
+
+    :param routes: the number of destinations
+    :param vrfs: the number of vrfs, including the global routes
+    :param next_hops: the next hops of every destination
+    :rtype: str
+    :returns: the config, global routes first then the 'vrf context' blocks
+    """
+    blocks = [[] for _ in range(max(vrfs, 1))]
+    for index in range(routes):
+        afi, dest = route_dest(index)
+        command = 'ip route ' if afi == 'ipv4' else 'ipv6 route '
+        for hop in range(next_hops):
+            blocks[index % len(blocks)].append(command + dest + ' ' + next_hop_line(afi, index, hop))
+    lines = list(blocks[0])
+    for vrf, block in enumerate(blocks[1:], 1):
+        lines.append('vrf context V%d' % vrf)
+        lines.extend('  ' + line for line in block)
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--routes', type=int, default=10000)
+    parser.add_argument('--vrfs', type=int, default=1)
+    parser.add_argument('--next-hops', type=int, default=1)
+    args = parser.parse_args()
+    sys.stdout.write(generate_config(args.routes, args.vrfs, args.next_hops))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+"""
+The module_utils of this tree take precedence over the ones of the
+installed ansible, the way ansible loads the module_utils of a role.
+The python 3 only packages of this tree, e.g. nxos_aio, are importable.
+"""
+import os
+import sys
+
+import ansible.module_utils.network
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+MODULE_UTILS = os.path.join(ROOT, 'module_utils', 'network')
+
+if MODULE_UTILS not in ansible.module_utils.network.__path__:
+    ansible.module_utils.network.__path__.insert(0, MODULE_UTILS)
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# async/await is a syntax error before python 3.5
+collect_ignore = ['nxos/test_aio.py'] if sys.version_info < (3, 5) else []
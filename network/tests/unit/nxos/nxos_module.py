@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import json
+import os
+import threading
+import time
+
+from ansible.module_utils.six.moves import BaseHTTPServer
+from ansible.module_utils.network.common.utils import generate_dict
+from ansible.module_utils.network.nxos.argspec.static_routes.static_routes import Static_routesArgs
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+fixture_data = {}
+
+# the desired states the NX-API transcripts were recorded for
+MERGED = {
+    'state': 'merged',
+    'config': [{'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '10.0.0.0/8', 'next_hops': [{'forward_router_address': '192.0.2.1'}]}]}]}],
+}
+
+OVERRIDDEN = {
+    'state': 'overridden',
+    'config_session': 'fanout',
+    'config': [{'vrf': 'B', 'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '172.16.0.0/12', 'next_hops': [
+            {'forward_router_address': '172.16.1.1', 'dest_vrf': 'A', 'route_name': 'foo'}]}]}]}],
+}
+
+
+def requests(transcript):
+    """ The requests of a transcript, without the replies
+    """
+    return [{'method': entry['method'], 'cmd': entry['cmd']} for entry in transcript]
+
+
+def load_fixture(name):
+    """ The content of a fixture file, decoded when it is JSON
+    """
+    path = os.path.join(FIXTURE_PATH, name)
+    if path not in fixture_data:
+        with open(path) as f:
+            data = f.read()
+        try:
+            data = json.loads(data)
+        except ValueError:
+            pass
+        fixture_data[path] = data
+    return fixture_data[path]
+
+
+class AnsibleFailJson(Exception):
+    pass
+
+
+class FakeModule(object):
+    """ Stands in for the AnsibleModule of nxos_static_routes, with the
+        argspec defaults for the params that are not given
+    """
+
+    def __init__(self, connection=None, check_mode=False, **params):
+        self.params = generate_dict(Static_routesArgs.argument_spec)
+        self.params.update(params)
+        self.check_mode = check_mode
+        self.warnings = []
+        # get_resource_connection returns the connection set on the module
+        self._connection = connection
+
+    def warn(self, warning):
+        self.warnings.append(warning)
+
+    def fail_json(self, msg, **kwargs):
+        raise AnsibleFailJson(msg)
+
+
+class FakeConnection(object):
+    """ A device answering the show commands from outputs, by command,
+        and recording the commands it is sent
+    """
+
+    def __init__(self, outputs=None, host='nxos1'):
+        self.outputs = outputs or {}
+        self.host = host
+        self.gets = []
+        self.edits = []
+        self.runs = []
+
+    def get(self, command):
+        self.gets.append(command)
+        output = self.outputs.get(command)
+        if isinstance(output, Exception):
+            raise output
+        if output is None:
+            raise ValueError('invalid command: %s' % command)
+        return output
+
+    def edit_config(self, candidate):
+        self.edits.append(list(candidate))
+
+    def run_commands(self, commands):
+        self.runs.append(list(commands))
+        return ['' for command in commands]
+
+    def get_option(self, option):
+        if option == 'host':
+            return self.host
+        raise KeyError(option)
+
+
+class LatencyConnection(FakeConnection):
+    """ A FakeConnection taking latency seconds to answer every command
+    """
+
+    def __init__(self, outputs=None, latency=0.1, host='nxos1'):
+        super(LatencyConnection, self).__init__(outputs, host)
+        self.latency = latency
+
+    def get(self, command):
+        time.sleep(self.latency)
+        return super(LatencyConnection, self).get(command)
+
+
+def slow_resource(name, commands=1, error=None):
+    """ A resource facts class running commands show commands, its facts
+        are their outputs, or failing with error after them
+    """
+
+    class SlowResourceFacts(object):
+
+        def __init__(self, module):
+            self._module = module
+
+        def populate_facts(self, connection, ansible_facts, data=None):
+            outputs = [connection.get('show %s %d' % (name, i)) for i in range(commands)]
+            if error is not None:
+                raise error
+            ansible_facts['ansible_network_resources'][name] = outputs
+            return ansible_facts
+
+    return SlowResourceFacts
+
+
+class NxapiTranscript(object):
+    """ Replays a recorded NX-API transcript, every request must be the
+        next one of the transcript, or any one left when not ordered
+
+    A transcript entry is the method and the commands of a request, and
+    the result of every command or the error of the request.
+    """
+
+    def __init__(self, transcript, ordered=True):
+        self.transcript = list(transcript)
+        self.ordered = ordered
+        self.requests = []
+
+    def reply(self, body):
+        """ The HTTP status and the JSON-RPC reply to a request body
+        """
+        calls = json.loads(body.decode('utf-8'))
+        request = {'method': calls[0]['method'],
+                   'cmd': [call['params']['cmd'] for call in calls]}
+        self.requests.append(request)
+        expected = None
+        for index, entry in enumerate(self.transcript):
+            if request == {'method': entry['method'], 'cmd': entry['cmd']}:
+                expected = self.transcript.pop(index)
+                break
+            if self.ordered:
+                break
+        if expected is None:
+            reply = (500, {'error': 'unexpected request %r' % (request,)})
+        elif 'error' in expected:
+            reply = (200, [{'jsonrpc': '2.0', 'error': expected['error'], 'id': 1}])
+        else:
+            reply = (200, [{'jsonrpc': '2.0', 'result': result, 'id': i + 1}
+                           for i, result in enumerate(expected['result'])])
+        return reply[0], json.dumps(reply[1]).encode('utf-8')
+
+
+class FakeNxapiDevice(NxapiTranscript):
+    """ An NX-API endpoint on localhost, in a thread, replaying a recorded
+        transcript
+    """
+
+    def __init__(self, transcript):
+        super(FakeNxapiDevice, self).__init__(transcript)
+        device = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                status, payload = device.reply(
+                    self.rfile.read(int(self.headers['Content-Length'])))
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json-rpc')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def host_vars(self):
+        return {'ansible_host': '127.0.0.1', 'ansible_port': self.port,
+                'ansible_user': 'admin', 'ansible_password': 'admin',
+                'nxos_use_ssl': False}
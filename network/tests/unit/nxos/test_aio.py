@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import asyncio
+import re
+
+from ansible.module_utils.network.nxos.facts.cache import FactsCache
+from ansible.module_utils.network.nxos.facts.facts import Facts
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+from ansible.module_utils.network.nxos.utils import nxapi
+from nxos_aio.config import AsyncStatic_routes
+from nxos_aio.connection import NxapiConnection, SyncConnectionAdapter
+from nxos_aio.facts import AsyncStatic_routesFacts
+
+from .nxos_module import MERGED, OVERRIDDEN, FakeConnection, FakeModule, NxapiTranscript, load_fixture, requests
+
+SECTION_COMMAND = "show running-config | section '^ip(v6)* route|^vrf context'"
+
+
+class AsyncFakeNxapiDevice(NxapiTranscript):
+    """ An NX-API endpoint on localhost, served by the event loop of the
+        test, replaying a recorded transcript
+    """
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = int(re.search(br'Content-Length: (\d+)', head, re.I).group(1))
+        status, payload = self.reply(await reader.readexactly(length))
+        writer.write(b'HTTP/1.0 %d OK\r\nContent-Type: application/json-rpc\r\n'
+                     b'Content-Length: %d\r\n\r\n' % (status, len(payload)) + payload)
+        await writer.drain()
+        writer.close()
+
+    def connection(self):
+        return NxapiConnection('127.0.0.1', 'admin', 'admin', port=self.port, use_ssl=False)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def reconcile(transcript, desired):
+    async with AsyncFakeNxapiDevice(transcript) as device:
+        try:
+            module = FakeModule(**desired)
+            result = await AsyncStatic_routes(module, device.connection()).execute_module_async()
+        except Exception as exc:
+            result = exc
+    return device, result
+
+
+def test_merged():
+    transcript = load_fixture('nxapi_fanout_transcript.json')['leaf1']
+    device, result = run(reconcile(transcript, MERGED))
+    assert result['commands'] == ['vrf context default', 'ip route 10.0.0.0/8 192.0.2.1']
+    assert device.requests == requests(transcript)
+
+
+def test_session_is_one_request():
+    transcript = load_fixture('nxapi_fanout_transcript.json')['leaf2']
+    device, result = run(reconcile(transcript, OVERRIDDEN))
+    assert result['changed']
+    assert device.requests == requests(transcript)
+    assert result['plan']['batches'] == [
+        {'commands': 10, 'commit': True, 'elapsed': result['plan']['batches'][0]['elapsed']}]
+
+
+def test_session_failure_aborts():
+    transcript = load_fixture('nxapi_fanout_transcript.json')['leaf3']
+    device, result = run(reconcile(transcript, OVERRIDDEN))
+    assert isinstance(result, nxapi.NxapiError)
+    assert 'Failed to commit config session' in str(result)
+    assert device.requests == requests(transcript)
+    assert device.requests[-1]['cmd'] == ['configure session fanout', 'abort']
+
+
+def test_many_devices_in_one_loop():
+    transcript = load_fixture('nxapi_fanout_transcript.json')['leaf1']
+
+    async def reconcile_all():
+        return await asyncio.gather(*[reconcile(transcript, MERGED) for _i in range(8)])
+
+    for device, result in run(reconcile_all()):
+        assert result['changed']
+        assert device.requests == requests(transcript)
+
+
+def test_json_gather_matches_sync_facts():
+    # both show commands are in flight together, in either order
+    transcript = [
+        {'method': 'cli', 'cmd': ['show ip static-route vrf all'],
+         'result': [{'body': load_fixture('show_ip_static-route_vrf_all.json')}]},
+        {'method': 'cli', 'cmd': ['show ipv6 static-route vrf all'],
+         'result': [{'body': load_fixture('show_ipv6_static-route_vrf_all.json')}]},
+    ]
+
+    async def gather():
+        async with AsyncFakeNxapiDevice(transcript, ordered=False) as device:
+            facts = {'ansible_network_resources': {}}
+            await AsyncStatic_routesFacts(FakeModule(gather_mode='json')).populate_facts(
+                device.connection(), facts)
+        return device, facts['ansible_network_resources'].get('static_routes')
+
+    device, facts = run(gather())
+    assert device.transcript == []
+    expected = {'ansible_network_resources': {}}
+    Static_routesFacts(FakeModule(gather_mode='section')).populate_facts(FakeConnection(
+        {SECTION_COMMAND: load_fixture('nxos_static_routes_running.cfg')}), expected)
+    assert facts == expected['ansible_network_resources']['static_routes']
+
+
+def test_sync_adapter_session():
+    connection = FakeConnection({SECTION_COMMAND: load_fixture('nxos_static_routes_running.cfg')})
+    module = FakeModule(**OVERRIDDEN)
+    result = run(AsyncStatic_routes(module, SyncConnectionAdapter(connection)).execute_module_async())
+    # a persistent connection keeps the session between calls
+    assert connection.runs == ([['configure session fanout'], result['commands'], ['commit']])
+    assert connection.edits == []
+
+
+def test_adapter_stateless():
+    assert not SyncConnectionAdapter(FakeConnection()).stateless
+    assert SyncConnectionAdapter(nxapi.NxapiConnection('127.0.0.1', 'admin', 'admin')).stateless
+
+
+def test_change_invalidates_the_facts_cache(monkeypatch):
+    cache = FactsCache()
+    monkeypatch.setattr(Facts, 'cache', cache)
+    cache.set('127.0.0.1', 'static_routes', [{'vrf': 'stale'}], '42')
+    cache.set('127.0.0.2', 'static_routes', [{'vrf': 'other'}], '42')
+    transcript = load_fixture('nxapi_fanout_transcript.json')['leaf1']
+    _device, result = run(reconcile(transcript, MERGED))
+    assert result['changed']
+    assert cache.get('127.0.0.1', 'static_routes', '42') is None
+    assert cache.get('127.0.0.2', 'static_routes', '42') == [{'vrf': 'other'}]
+
+
+def test_sync_adapter_change_invalidates_the_facts_cache(monkeypatch):
+    cache = FactsCache()
+    monkeypatch.setattr(Facts, 'cache', cache)
+    connection = FakeConnection({SECTION_COMMAND: load_fixture('nxos_static_routes_running.cfg')})
+    cache.set(connection.host, 'static_routes', [{'vrf': 'stale'}], '42')
+    result = run(AsyncStatic_routes(FakeModule(**OVERRIDDEN), SyncConnectionAdapter(connection)).execute_module_async())
+    assert result['changed']
+    assert cache.get(connection.host, 'static_routes', '42') is None
+
+
+def test_check_mode_keeps_the_facts_cache(monkeypatch):
+    cache = FactsCache()
+    monkeypatch.setattr(Facts, 'cache', cache)
+    connection = FakeConnection({SECTION_COMMAND: load_fixture('nxos_static_routes_running.cfg')})
+    cache.set(connection.host, 'static_routes', [{'vrf': 'stale'}], '42')
+    module = FakeModule(check_mode=True, **OVERRIDDEN)
+    result = run(AsyncStatic_routes(module, SyncConnectionAdapter(connection)).execute_module_async())
+    assert result['changed']
+    assert cache.get(connection.host, 'static_routes', '42') == [{'vrf': 'stale'}]
+
+
+def test_sync_adapter_uses_the_running_loop(monkeypatch):
+    # the loop running the coroutine is not the current event loop of
+    # the thread
+    monkeypatch.setattr(asyncio, 'get_event_loop', None)
+    connection = FakeConnection({'show version': 'NX-OS'})
+    assert run(SyncConnectionAdapter(connection).get('show version')) == 'NX-OS'
+
+
+def test_connection_options():
+    nxapi_connection = NxapiConnection('192.0.2.1', 'admin', 'admin', use_ssl=False)
+    assert nxapi_connection.get_option('host') == '192.0.2.1'
+    assert nxapi_connection.get_option('port') == 80
+    assert SyncConnectionAdapter(FakeConnection(host='leaf1')).get_option('host') == 'leaf1'
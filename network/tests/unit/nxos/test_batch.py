@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import os
+import shutil
+
+import pytest
+
+from ansible.module_utils.network.nxos.facts.cache import FactsStore
+from ansible.module_utils.network.nxos.facts.static_routes import batch
+from ansible.module_utils.network.nxos.facts.static_routes.batch import parse_config_file, parse_configs
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+
+from .nxos_module import FIXTURE_PATH, FakeModule, load_fixture
+
+CONFIGS = {
+    'leaf1.cfg': 'nxos_static_routes_lines',
+    'leaf2.cfg': 'nxos_static_routes_null0',
+    'leaf3.cfg': 'nxos_static_routes_lines',
+}
+
+
+@pytest.fixture
+def configs(tmp_path):
+    configs = tmp_path / 'configs'
+    configs.mkdir()
+    for name, fixture in CONFIGS.items():
+        shutil.copy(os.path.join(FIXTURE_PATH, fixture + '.cfg'), str(configs / name))
+    return configs
+
+
+def get_facts(fixture):
+    facts = {'ansible_network_resources': {}}
+    Static_routesFacts(FakeModule()).populate_facts(None, facts, data=load_fixture(fixture + '.cfg'))
+    return facts['ansible_network_resources']['static_routes']
+
+
+def expected_routes(configs):
+    return dict((str(configs / name), get_facts(fixture)) for name, fixture in CONFIGS.items())
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_parse_configs(configs, processes):
+    summary = parse_configs(str(configs), processes=processes, chunksize=1)
+    assert summary['static_routes'] == expected_routes(configs)
+    assert summary['errors'] == {}
+    assert summary['files'] == 3
+    assert sorted(summary['timings']) == sorted(expected_routes(configs))
+    assert all(elapsed >= 0 for elapsed in summary['timings'].values())
+    assert summary['files_per_sec'] == pytest.approx(3 / summary['elapsed'])
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_parse_configs_errors(configs, processes):
+    missing = str(configs / 'missing.cfg')
+    summary = parse_configs([str(configs / 'leaf1.cfg'), missing], processes=processes)
+    assert list(summary['static_routes']) == [str(configs / 'leaf1.cfg')]
+    assert list(summary['errors']) == [missing]
+    assert summary['files'] == 2
+    assert missing in summary['timings']
+
+
+def test_parse_configs_store(configs, tmp_path):
+    store_path = str(tmp_path / 'facts.db')
+    first = parse_configs(str(configs), processes=1, store_path=store_path)
+    second = parse_configs(str(configs), processes=1, store_path=store_path)
+    assert second['static_routes'] == first['static_routes'] == expected_routes(configs)
+    # leaf1 and leaf3 hold the same config
+    assert FactsStore(store_path)._db.execute('SELECT COUNT(*) FROM facts').fetchone()[0] == 2
+
+
+def test_parse_config_file_leaves_the_class_alone(configs, tmp_path):
+    result = parse_config_file(str(configs / 'leaf1.cfg'), str(tmp_path / 'facts.db'))
+    assert result['static_routes'] == get_facts('nxos_static_routes_lines')
+    assert Static_routesFacts.block_cache is None
+    assert Static_routesFacts.facts_store is None
+    assert batch._BLOCK_CACHE._entries
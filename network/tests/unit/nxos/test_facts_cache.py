@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import itertools
+import marshal
+
+import pytest
+
+from ansible.module_utils.network.nxos.facts import cache as cache_module
+from ansible.module_utils.network.nxos.facts.cache import FactsCache, FactsStore
+from ansible.module_utils.network.nxos.facts.facts import CHECKSUM_COMMAND, Facts
+
+from .nxos_module import FakeConnection, FakeModule
+
+SECTION_COMMAND = "show running-config | section '^ip(v6)* route|^vrf context'"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FactsCache(ttl=300)
+    monkeypatch.setattr(Facts, 'cache', cache)
+    return cache
+
+
+def gather(connection):
+    facts, _warnings = Facts(FakeModule(connection, state='gathered')).get_facts(
+        ['!all', '!min'], ['static_routes'])
+    return facts['ansible_network_resources'].get('static_routes')
+
+
+def test_cache_hit_with_same_checksum(cache):
+    connection = FakeConnection({SECTION_COMMAND: 'ip route 10.0.0.0/8 192.0.2.1\n',
+                                 CHECKSUM_COMMAND: '42\n'})
+    first = gather(connection)
+    connection.outputs[SECTION_COMMAND] = 'ip route 10.0.0.0/8 192.0.2.2\n'
+    assert gather(connection) == first
+    assert connection.gets.count(SECTION_COMMAND) == 1
+
+
+def test_cache_miss_on_checksum_change(cache):
+    connection = FakeConnection({SECTION_COMMAND: 'ip route 10.0.0.0/8 192.0.2.1\n',
+                                 CHECKSUM_COMMAND: '42\n'})
+    gather(connection)
+    connection.outputs[SECTION_COMMAND] = 'ip route 10.0.0.0/8 192.0.2.2\n'
+    connection.outputs[CHECKSUM_COMMAND] = '43\n'
+    routes = gather(connection)
+    assert routes[0]['address_families'][0]['routes'][0]['next_hops'] == [
+        {'forward_router_address': '192.0.2.2'}]
+
+
+@pytest.mark.parametrize('checksum', [None, '', ValueError('unsupported')])
+def test_cache_bypassed_without_checksum(cache, checksum):
+    connection = FakeConnection({SECTION_COMMAND: 'ip route 10.0.0.0/8 192.0.2.1\n',
+                                 CHECKSUM_COMMAND: checksum})
+    gather(connection)
+    connection.outputs[SECTION_COMMAND] = 'ip route 10.0.0.0/8 192.0.2.2\n'
+    routes = gather(connection)
+    assert connection.gets.count(SECTION_COMMAND) == 2
+    assert routes[0]['address_families'][0]['routes'][0]['next_hops'] == [
+        {'forward_router_address': '192.0.2.2'}]
+    assert cache.get(connection.host, 'static_routes', None) is None
+
+
+class FakeTime(object):
+    """ A clock that ticks one second every time it is read
+    """
+
+    def __init__(self):
+        self.ticks = itertools.count(1)
+
+    def time(self):
+        return float(next(self.ticks))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, 'time', FakeTime())
+    return FactsStore(str(tmp_path / 'facts.db'))
+
+
+def test_store_round_trip(store):
+    facts = ([{'vrf': 'A', 'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '10.0.0.0/8', 'next_hops': [{'forward_router_address': '192.0.2.1',
+                                              'admin_distance': 5}]}]}]}],
+             ['a warning'])
+    store.set('k', facts, 'leaf1')
+    assert store.get('k') == facts
+    assert store.get('other') is None
+
+
+def test_store_other_format_is_a_miss(store):
+    store.set('k', ['facts'])
+    store._db.execute("UPDATE facts SET format = '2.6/1'")
+    assert store.get('k') is None
+
+
+def test_store_corrupt_entry_is_a_miss(store):
+    store.set('k', ['facts'])
+    store._db.execute('UPDATE facts SET data = ?', (b'\xff',))
+    assert store.get('k') is None
+
+
+def test_store_evicts_least_recently_used(store):
+    size = len(marshal.dumps('x' * 100))
+    store.max_bytes = 2 * size
+    store.set('a', 'a' * 100)
+    store.set('b', 'b' * 100)
+    # reading 'a' makes 'b' the least recently used
+    assert store.get('a') == 'a' * 100
+    store.set('c', 'c' * 100)
+    assert store.get('b') is None
+    assert store.get('a') == 'a' * 100
+    assert store.get('c') == 'c' * 100
+
+
+def test_store_evicts_down_to_max_bytes(store):
+    size = len(marshal.dumps('x' * 100))
+    store.max_bytes = 3 * size
+    for key in 'abcd':
+        store.set(key, key * 100)
+    store.set('e', 'e' * 300)
+    assert [key for key in 'abcde' if store.get(key) is not None] == ['e']
+
+
+def test_store_digest_of_a_path_is_of_its_text(tmp_path):
+    text = 'ip route 10.0.0.0/8 192.0.2.1\n'
+    path = tmp_path / 'running.cfg'
+    path.write_text(u'ip route 10.0.0.0/8 192.0.2.1\n')
+    assert FactsStore.digest(str(path)) == FactsStore.digest(text)
+    assert FactsStore.digest([text]) != FactsStore.digest('ip route 10.0.0.0/8 192.0.2.2\n')
+    assert FactsStore.digest(object()) is None
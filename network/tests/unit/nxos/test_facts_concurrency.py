@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import time
+
+import pytest
+
+from ansible.module_utils.network.nxos.facts.facts import Facts
+
+from .nxos_module import FakeModule, LatencyConnection, slow_resource
+
+LATENCY = 0.1
+
+OUTPUTS = dict(('show %s %d' % (name, i), '%s %d' % (name, i))
+               for name in ('interfaces', 'static_routes') for i in range(2))
+
+
+def gather(resources, gather_concurrency):
+    connection = LatencyConnection(OUTPUTS, LATENCY)
+    facts = Facts(FakeModule(connection, gather_concurrency=gather_concurrency))
+    start = time.time()
+    facts.get_network_resources_facts(resources, ['all'])
+    return facts.ansible_facts, time.time() - start
+
+
+def test_concurrent_gather_matches_serial_gather():
+    resources = {'static_routes': slow_resource('static_routes', 2),
+                 'interfaces': slow_resource('interfaces', 2)}
+    serial, serial_time = gather(resources, 1)
+    concurrent, concurrent_time = gather(resources, 2)
+    assert concurrent['ansible_network_resources'] == serial['ansible_network_resources']
+    assert sorted(concurrent['ansible_net_gather_network_resources']) == ['interfaces', 'static_routes']
+    # two resources of two round trips each, in flight together
+    assert serial_time >= 4 * LATENCY
+    assert concurrent_time < 3 * LATENCY
+
+
+def test_concurrent_gather_merges_in_name_order():
+    # interfaces finishes last, its facts still come first
+    resources = {'static_routes': slow_resource('static_routes', 1),
+                 'interfaces': slow_resource('interfaces', 2)}
+    facts, _elapsed = gather(resources, 2)
+    assert list(facts['ansible_network_resources']) == ['interfaces', 'static_routes']
+
+
+def test_concurrent_gather_reraises_resource_error():
+    resources = {'static_routes': slow_resource('static_routes', 1),
+                 'interfaces': slow_resource('interfaces', 1, error=ValueError('no interfaces'))}
+    with pytest.raises(ValueError) as exc:
+        gather(resources, 2)
+    assert str(exc.value) == 'no interfaces'
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import json
+
+import pytest
+
+from ansible.module_utils.network.nxos.config.static_routes.fanout import (
+    ReconcileError, get_params, reconcile_files, reconcile_host)
+
+import nxos_fanout
+
+from .nxos_module import MERGED, OVERRIDDEN, FakeNxapiDevice, load_fixture, requests
+
+
+def test_reconcile_files(tmp_path):
+    transcripts = load_fixture('nxapi_fanout_transcript.json')
+    desired_state = {'leaf1': MERGED, 'leaf2': OVERRIDDEN, 'leaf3': OVERRIDDEN,
+                     'leaf4': dict(MERGED, state='merge')}
+    devices = dict((host, FakeNxapiDevice(transcripts.get(host, [])))
+                   for host in desired_state)
+    inventory = dict((host, device.host_vars()) for host, device in devices.items())
+    inventory_path = tmp_path / 'inventory.json'
+    inventory_path.write_text(json.dumps(inventory))
+    desired_state_path = tmp_path / 'desired.json'
+    desired_state_path.write_text(json.dumps(desired_state))
+    output_path = tmp_path / 'results.jsonl'
+
+    for device in devices.values():
+        device.__enter__()
+    try:
+        with open(str(output_path), 'w') as output:
+            summary = reconcile_files(str(inventory_path), str(desired_state_path),
+                                      output, concurrency=4)
+    finally:
+        for device in devices.values():
+            device.__exit__(None, None, None)
+
+    assert summary == {'hosts': 4, 'changed': 2, 'failed': 2}
+    results = dict((r['host'], r) for r in map(json.loads, output_path.read_text().splitlines()))
+    assert results['leaf1']['commands'] == ['vrf context default', 'ip route 10.0.0.0/8 192.0.2.1']
+    assert results['leaf2']['changed'] is True
+    assert 'Failed to commit config session' in results['leaf3']['msg']
+    assert 'value of state must be one of' in results['leaf4']['msg']
+    for host, device in devices.items():
+        assert device.requests == requests(transcripts.get(host, []))
+        assert device.transcript == []
+
+
+def test_main(tmp_path, capsys):
+    transcripts = load_fixture('nxapi_fanout_transcript.json')
+    desired_state = {'leaf1': MERGED, 'leaf4': dict(MERGED, state='merge')}
+    with FakeNxapiDevice(transcripts['leaf1']) as device:
+        inventory = {'leaf1': device.host_vars(), 'leaf4': device.host_vars()}
+        inventory_path = tmp_path / 'inventory.json'
+        inventory_path.write_text(json.dumps(inventory))
+        desired_state_path = tmp_path / 'desired.json'
+        desired_state_path.write_text(json.dumps(desired_state))
+        output_path = tmp_path / 'results.jsonl'
+        status = nxos_fanout.main([str(inventory_path), str(desired_state_path),
+                                   '--output', str(output_path), '--concurrency', '1'])
+
+    assert status == 1
+    assert json.loads(capsys.readouterr().err) == {'hosts': 2, 'changed': 1, 'failed': 1}
+    results = dict((r['host'], r) for r in map(json.loads, output_path.read_text().splitlines()))
+    assert results['leaf1']['commands'] == ['vrf context default', 'ip route 10.0.0.0/8 192.0.2.1']
+    assert 'value of state must be one of' in results['leaf4']['msg']
+    assert device.transcript == []
+
+
+def test_session_is_one_request():
+    transcript = load_fixture('nxapi_fanout_transcript.json')['leaf2']
+    with FakeNxapiDevice(transcript) as device:
+        result = reconcile_host('leaf2', device.host_vars(), OVERRIDDEN)
+    assert 'failed' not in result
+    # the session, every batch and the commit in one request
+    assert len(device.requests) == 2
+    assert device.requests[1]['cmd'][0] == 'configure session fanout'
+    assert device.requests[1]['cmd'][-1] == 'commit'
+
+
+@pytest.mark.parametrize('desired, error', [
+    ({'state': 'merge'}, 'value of state must be one of'),
+    ({'stat': 'merged'}, 'unsupported parameters: stat'),
+    ({'batch_size': 'many'}, 'cannot be converted to an int'),
+    ({'verify_after': 'maybe'}, 'not a valid boolean'),
+    ({'config': [{'address_families': [{'routes': []}]}]}, 'missing required arguments: afi'),
+])
+def test_get_params_rejects_invalid_options(desired, error):
+    with pytest.raises(ReconcileError) as exc:
+        get_params(desired)
+    assert error in str(exc.value)
+
+
+def test_get_params_defaults():
+    params = get_params({'state': 'deleted', 'verify_after': 'yes'})
+    assert params['state'] == 'deleted'
+    assert params['verify_after'] is True
+    assert params['gather_mode'] == 'section'
+    assert params['config'] is None
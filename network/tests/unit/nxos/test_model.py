@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import pytest
+
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+from ansible.module_utils.network.nxos.facts.static_routes import model
+from ansible.module_utils.network.nxos.facts.static_routes.model import NextHop, Route, canonical_address
+
+from .nxos_module import FakeConnection, FakeModule
+
+SECTION_COMMAND = "show running-config | section '^ip(v6)* route|^vrf context'"
+
+
+@pytest.mark.parametrize('one, other', [
+    ({'forward_router_address': '2001:db8::1'}, {'forward_router_address': '2001:0DB8:0::0001'}),
+    ({'forward_router_address': '2001:db8::1'}, {'forward_router_address': '2001:db8:0:0:0:0:0:1'}),
+    ({'forward_router_address': '192.0.2.1', 'interface': 'Ethernet1/1'},
+     {'forward_router_address': '192.0.2.1', 'interface': 'eth1/1'}),
+    ({'forward_router_address': None, 'interface': 'port-channel10'},
+     {'forward_router_address': None, 'interface': 'Po10'}),
+    ({'forward_router_address': '192.0.2.1', 'admin_distance': 5, 'tag': 12, 'track': 3},
+     {'forward_router_address': '192.0.2.1', 'admin_distance': '5', 'tag': '12', 'track': '3'}),
+], ids=['ipv6-zeros', 'ipv6-expanded', 'interface', 'port-channel', 'numbers'])
+def test_next_hop_spellings_share_a_key(one, other):
+    keys = set([NextHop.from_dict(one).key(), NextHop.from_dict(other).key()])
+    assert len(keys) == 1
+
+
+@pytest.mark.parametrize('one, other', [
+    ({'forward_router_address': '192.0.2.1'}, {'forward_router_address': '192.0.2.2'}),
+    ({'forward_router_address': '192.0.2.1', 'admin_distance': 5},
+     {'forward_router_address': '192.0.2.1', 'admin_distance': 6}),
+    ({'forward_router_address': '192.0.2.1', 'dest_vrf': 'A'},
+     {'forward_router_address': '192.0.2.1', 'dest_vrf': 'B'}),
+    ({'forward_router_address': '192.0.2.1', 'interface': 'Ethernet1/1'},
+     {'forward_router_address': '192.0.2.1', 'interface': 'Ethernet1/2'}),
+])
+def test_different_next_hops_have_different_keys(one, other):
+    assert NextHop.from_dict(one).key() != NextHop.from_dict(other).key()
+
+
+@pytest.mark.parametrize('one, other', [
+    ('2001:DB8::/32', '2001:db8::/32'),
+    ('2001:0db8:0000::/32', '2001:db8::/32'),
+    ('10.0.0.1/8', '10.0.0.0/8'),
+])
+def test_route_spellings_share_a_key(one, other):
+    assert Route(one).key() == Route(other).key()
+
+
+def test_merged_spelled_differently_is_unchanged():
+    connection = FakeConnection({SECTION_COMMAND: (
+        'ip route 10.0.0.0/8 Ethernet1/1 192.0.2.1 5\n'
+        'ipv6 route 2001:db8::/32 2001:db8::1\n')})
+    module = FakeModule(connection, state='merged', config=[{'address_families': [
+        {'afi': 'ipv4', 'routes': [{'dest': '10.0.0.0/8', 'next_hops': [
+            {'forward_router_address': '192.0.2.1', 'interface': 'eth1/1', 'admin_distance': 5}]}]},
+        {'afi': 'ipv6', 'routes': [{'dest': '2001:DB8::/32', 'next_hops': [
+            {'forward_router_address': '2001:0db8::0001'}]}]}]}])
+    result = Static_routes(module).execute_module()
+    assert not result['changed']
+    assert connection.edits == []
+
+
+def test_canonical_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(model, '_CANONICAL', {})
+    monkeypatch.setattr(model, '_CANONICAL_MAX', 8)
+    for i in range(1, 100):
+        assert canonical_address('2001:db8::%x' % i) == '2001:db8::%x' % i
+        assert len(model._CANONICAL) <= 8
+    # the memo starts over once full, a value seen before is computed again
+    assert ('address', '2001:db8::1') not in model._CANONICAL
+    assert canonical_address('2001:db8::1') == '2001:db8::1'
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import pytest
+
+from ansible.module_utils.network.nxos.utils.prefixes import normalize_address, normalize_prefix, normalize_prefixes
+
+
+@pytest.mark.parametrize('afi, value, prefix', [
+    ('ipv4', '192.0.2.0/24', '192.0.2.0/24'),
+    ('ipv4', '0.0.0.0/0', '0.0.0.0/0'),
+    ('ipv4', '10.0.0.0/08', '10.0.0.0/8'),
+    ('ipv6', '4011::0DB1/128', '4011::db1/128'),
+    ('ipv6', '2001:0db8:0000::/32', '2001:db8::/32'),
+    ('ipv6', '::ffff:10.0.0.1/128', '::ffff:10.0.0.1/128'),
+    ('ipv6', '::/0', '::/0'),
+])
+def test_canonical_prefix(afi, value, prefix):
+    batch = normalize_prefixes(afi, [value])
+    assert batch.prefixes == [prefix]
+    assert batch.warnings == []
+    assert batch.invalid == []
+
+
+@pytest.mark.parametrize('afi, value, prefix, network', [
+    ('ipv4', '192.0.2.5/24', '192.0.2.0/24', 0xc0000200),
+    ('ipv4', '10.255.255.255/9', '10.128.0.0/9', 0x0a800000),
+    ('ipv6', '2001:db8::1/64', '2001:db8::/64', 0x20010db8 << 96),
+    ('ipv6', '::ffff:10.0.0.1/96', '::ffff:0.0.0.0/96', 0xffff << 32),
+])
+def test_host_bits_are_cleared_with_a_warning(afi, value, prefix, network):
+    batch = normalize_prefixes(afi, [value])
+    assert batch.prefixes == [prefix]
+    assert batch.network(0) == network
+    assert batch.warnings == ['%s destination %s has host bits set, using %s' % (afi, value, prefix)]
+
+
+@pytest.mark.parametrize('afi, value, error', [
+    ('ipv4', '10.0.0.0/33', 'the prefix length must be 0 to 32'),
+    ('ipv4', '10.0.0.0/abc', 'the prefix length must be 0 to 32'),
+    ('ipv4', '10.0.0.0/-1', 'the prefix length must be 0 to 32'),
+    ('ipv4', '10.0.0.0/', 'the prefix length must be 0 to 32'),
+    ('ipv4', '10.0.0.0', 'a prefix length is required'),
+    ('ipv4', '010.0.0.0/8', ''),
+    ('ipv4', '2001:db8::/32', ''),
+    ('ipv4', 'foo/8', ''),
+    ('ipv4', None, 'a destination must be a string'),
+    ('ipv6', '2001:db8::/129', 'the prefix length must be 0 to 128'),
+    ('ipv6', '2001:db8:::1/64', ''),
+    ('ipv6', '10.0.0.0/8', ''),
+])
+def test_invalid_destination_is_a_warning(afi, value, error):
+    valid = {'ipv4': '192.0.2.0/24', 'ipv6': '2001:db8::/48'}[afi]
+    batch = normalize_prefixes(afi, [valid, value, valid])
+    assert batch.invalid == [1]
+    assert batch.prefixes[1] is value
+    assert list(batch.lengths)[1] == 0
+    assert len(batch.warnings) == 1
+    assert batch.warnings[0].startswith('invalid %s destination %s: %s' % (afi, value, error))
+
+
+def test_batch_layout():
+    batch = normalize_prefixes('ipv4', ['10.0.0.0/8', 'bad', '192.0.2.0/24'])
+    assert len(batch) == 3
+    assert len(batch.packed) == 3 * 4
+    assert list(batch.lengths) == [8, 0, 24]
+    assert [batch.network(i) for i in range(3)] == [0x0a000000, 0, 0xc0000200]
+    batch = normalize_prefixes('ipv6', ['2001:db8::/32'])
+    assert len(batch.packed) == 16
+
+
+def test_normalize_prefix_and_address():
+    assert normalize_prefix('10.1.1.1/16') == '10.1.0.0/16'
+    assert normalize_prefix('4011::0DB1/128') == '4011::db1/128'
+    assert normalize_prefix('bad') == 'bad'
+    assert normalize_prefix(None) is None
+    assert normalize_address('2001:0db8::1') == '2001:db8::1'
+    assert normalize_address('::FFFF:10.0.0.1') == '::ffff:10.0.0.1'
+    assert normalize_address('bad') == 'bad'
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import ast
+import inspect
+import io
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+MODULE_UTILS = os.path.join(ROOT, 'module_utils')
+LIBRARY = os.path.join(ROOT, 'library')
+
+FACTS_MODULE = 'ansible.module_utils.network.nxos.facts.facts'
+CONFIG_MODULE = 'ansible.module_utils.network.nxos.config.static_routes.static_routes'
+STATIC_ROUTES_FACTS_MODULE = 'ansible.module_utils.network.nxos.facts.static_routes.static_routes'
+
+# the most microseconds importing the nxos module_utils of the config
+# module may take by themselves, the ansible and python modules they
+# import aside. They take about half of it on one core of a laptop
+NXOS_IMPORT_BUDGET_US = 50000
+
+# modules a task must not import just to load the config module
+NOT_IMPORTED = ('q', 'multiprocessing.pool', 'asyncio', 'nxos_aio')
+
+# the module_utils of the static_routes facts, every one of them has to
+# be in the AnsiballZ payload of nxos_facts
+STATIC_ROUTES_PAYLOAD = [
+    'ansible/module_utils/network/nxos/facts/static_routes/static_routes.py',
+    'ansible/module_utils/network/nxos/facts/static_routes/model.py',
+    'ansible/module_utils/network/nxos/utils/prefixes.py',
+    'ansible/module_utils/network/nxos/utils/trace.py',
+    'ansible/module_utils/network/nxos/utils/utils.py',
+]
+
+
+def run_import(module, *options):
+    """ Import a module in a fresh interpreter, with the module_utils of
+        this tree first
+
+    :returns: the names of the modules imported, and the stderr
+    """
+    code = ('import sys; import ansible.module_utils.network as network; '
+            'network.__path__.insert(0, %r); import %s; '
+            'print(" ".join(sorted(sys.modules)))') % (
+                os.path.join(MODULE_UTILS, 'network'), module)
+    process = subprocess.Popen([sys.executable] + list(options) + ['-c', code],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate()
+    assert process.returncode == 0, stderr
+    return set(stdout.decode('utf-8').split()), stderr.decode('utf-8')
+
+
+def test_facts_imports_resources_lazily():
+    modules, _stderr = run_import(FACTS_MODULE)
+    assert STATIC_ROUTES_FACTS_MODULE not in modules
+    assert 'multiprocessing.pool' not in modules
+
+
+def own_import_time(stderr):
+    """ The microseconds the nxos module_utils took to import by
+        themselves, from the -X importtime report
+    """
+    own = 0
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split('|')
+        if line.startswith('import time:') and fields[-1].strip().startswith('ansible.module_utils.network.nxos.'):
+            own += int(fields[0].split(':')[1])
+    return own
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='-X importtime needs python 3.7')
+def test_config_import_budget():
+    # the best of a few runs, a busy machine slows any single one
+    runs = [run_import(CONFIG_MODULE, '-X', 'importtime') for _i in range(3)]
+    assert 0 < min(own_import_time(stderr) for _modules, stderr in runs) <= NXOS_IMPORT_BUDGET_US
+    for module in NOT_IMPORTED:
+        assert module not in runs[0][0]
+
+
+def test_lazy_facts_classes_use_literal_imports():
+    # the AnsiballZ dependency finder only follows import statements
+    with open(os.path.join(MODULE_UTILS, 'network', 'nxos', 'facts', 'facts.py')) as f:
+        tree = ast.parse(f.read())
+    imported = set(node.module for node in ast.walk(tree) if isinstance(node, ast.ImportFrom))
+    assert STATIC_ROUTES_FACTS_MODULE in imported
+
+
+def module_utils_payload(module_name):
+    """ The files AnsiballZ ships along with a module of library/
+    """
+    module_common = pytest.importorskip('ansible.executor.module_common')
+    from ansible.plugins.loader import module_utils_loader
+    module_utils_loader.add_directory(MODULE_UTILS)
+    with open(os.path.join(LIBRARY, module_name + '.py'), 'rb') as f:
+        data = f.read()
+    zf = zipfile.ZipFile(io.BytesIO(), mode='w')
+    getargspec = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+    args = getargspec(module_common.recursive_finder).args
+    kwargs = {'name': module_name, 'zf': zf}
+    kwargs['data' if 'data' in args else 'module_data'] = data
+    if 'module_fqn' in args:
+        kwargs['module_fqn'] = 'ansible.modules.' + module_name
+    if 'py_module_names' in args:
+        # the packages AnsiballZ writes itself, before it scans the module
+        kwargs['py_module_names'] = set([('ansible', '__init__'),
+                                         ('ansible', 'module_utils', '__init__')])
+        kwargs['py_module_cache'] = {}
+    module_common.recursive_finder(**kwargs)
+    return set(zf.namelist())
+
+
+@pytest.mark.parametrize('module_name', ['nxos_facts', 'nxos_static_routes'])
+def test_payload_has_static_routes_facts(module_name):
+    payload = module_utils_payload(module_name)
+    for path in STATIC_ROUTES_PAYLOAD:
+        assert path in payload
+    assert not any(path.startswith('nxos_aio') for path in payload)
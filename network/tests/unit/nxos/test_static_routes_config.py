@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+
+from .nxos_module import FakeConnection, FakeModule
+
+SECTION_COMMAND = "show running-config | section '^ip(v6)* route|^vrf context'"
+
+RUNNING_CONFIG = """ip route 10.0.0.0/8 192.0.2.1 5
+ip route 10.0.0.0/8 192.0.2.2
+vrf context Test
+  ip route 172.16.0.0/12 172.16.1.1 name foo
+"""
+
+
+def run(state, config, running_config=RUNNING_CONFIG, **params):
+    connection = FakeConnection({SECTION_COMMAND: running_config})
+    module = FakeModule(connection, state=state, config=config, **params)
+    return Static_routes(module).execute_module(), connection
+
+
+def test_merged_after_replaces_next_hop_preference():
+    result, connection = run('merged', [{'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '10.0.0.0/8', 'next_hops': [
+            {'forward_router_address': '192.0.2.1', 'admin_distance': 10}]}]}]}])
+    assert result['commands'] == ['vrf context default', 'ip route 10.0.0.0/8 192.0.2.1 10']
+    assert connection.edits == [result['commands']]
+    assert result['after'][-1] == {'vrf': '__global__', 'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '10.0.0.0/8', 'next_hops': [
+            {'forward_router_address': '192.0.2.2'},
+            {'forward_router_address': '192.0.2.1', 'admin_distance': 10}]}]}]}
+
+
+def test_merged_after_matches_device():
+    # the after computed locally is what a read back of the device shows
+    result, _connection = run('merged', [{'vrf': 'Test', 'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '172.16.0.0/12', 'next_hops': [
+            {'forward_router_address': '172.16.1.1', 'route_name': 'bar'}]}]}]}])
+    device = RUNNING_CONFIG.replace('name foo', 'name bar')
+    read_back, _connection = run('gathered', None, device)
+    assert result['after'] == read_back['gathered']
+
+
+def test_deleted_spells_out_next_hops():
+    result, _connection = run('deleted', [{'vrf': 'Test'}])
+    assert result['commands'] == ['vrf context Test', 'no ip route 172.16.0.0/12 172.16.1.1 name foo']
+    assert result['plan'] == {'commands': 2, 'bytes': sum(len(c) + 1 for c in result['commands']),
+                              'batches': result['plan']['batches'],
+                              'apply_time': result['plan']['apply_time']}
+    assert result['after'] == [{'vrf': '__global__', 'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '10.0.0.0/8', 'next_hops': [
+            {'forward_router_address': '192.0.2.1', 'admin_distance': 5},
+            {'forward_router_address': '192.0.2.2'}]}]}]}]
+
+
+def test_replaced_commands_grouped_once_per_vrf():
+    # the same vrf twice and the same next hop twice make one group
+    # holding every command once, the removals first
+    next_hop = {'forward_router_address': '192.0.2.3'}
+    result, connection = run('replaced', [
+        {'vrf': 'Test', 'address_families': [{'afi': 'ipv4', 'routes': [
+            {'dest': '172.16.0.0/12', 'next_hops': [next_hop, next_hop]}]}]},
+        {'address_families': [{'afi': 'ipv4', 'routes': [
+            {'dest': '10.0.0.0/8', 'next_hops': [next_hop]}]}]},
+        {'vrf': 'Test', 'address_families': [{'afi': 'ipv4', 'routes': [
+            {'dest': '172.16.0.0/12', 'next_hops': [{'forward_router_address': '192.0.2.4'}]}]}]}])
+    assert result['commands'] == [
+        'vrf context Test',
+        'no ip route 172.16.0.0/12 172.16.1.1 name foo',
+        'ip route 172.16.0.0/12 192.0.2.3',
+        'ip route 172.16.0.0/12 192.0.2.4',
+        'vrf context default',
+        'no ip route 10.0.0.0/8 192.0.2.1 5',
+        'no ip route 10.0.0.0/8 192.0.2.2',
+        'ip route 10.0.0.0/8 192.0.2.3']
+    assert connection.edits == [result['commands']]
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import pytest
+
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+from ansible.module_utils.network.nxos.facts.cache import FactsStore, ParseCache
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import STORE_KEY_PREFIX, Static_routesFacts
+
+from .nxos_module import FakeConnection, FakeModule, load_fixture
+
+SECTION_COMMAND = "show running-config | section '^ip(v6)* route|^vrf context'"
+
+
+def get_facts(module, data=None, connection=None):
+    facts = {'ansible_network_resources': {}}
+    Static_routesFacts(module).populate_facts(connection, facts, data)
+    return facts['ansible_network_resources'].get('static_routes')
+
+
+@pytest.mark.parametrize('facts_validation', ['fast', 'strict'])
+def test_null0_routes(facts_validation):
+    config = load_fixture('nxos_static_routes_null0.cfg')
+    module = FakeModule(facts_validation=facts_validation)
+    assert get_facts(module, config) == load_fixture('nxos_static_routes_null0.json')
+
+
+@pytest.mark.parametrize('state', ['merged', 'replaced', 'overridden', 'deleted'])
+def test_null0_routes_every_state(state):
+    connection = FakeConnection({SECTION_COMMAND: load_fixture('nxos_static_routes_null0.cfg')})
+    module = FakeModule(connection, state=state, config=[{'vrf': 'D', 'address_families': [
+        {'afi': 'ipv4', 'routes': [{'dest': '10.5.0.0/16', 'next_hops': [
+            {'forward_router_address': None, 'interface': 'Null0'}]}]}]}])
+    result = Static_routes(module).execute_module()
+    assert result['before'] == load_fixture('nxos_static_routes_null0.json')
+    if state == 'merged':
+        assert not result['changed']
+    elif state == 'deleted':
+        assert 'no ip route 10.5.0.0/16 Null0' in result['commands']
+
+
+def test_block_cache_off_by_default():
+    assert Static_routesFacts.block_cache is None
+
+
+def test_block_cache_hit_warns_again(monkeypatch):
+    monkeypatch.setattr(Static_routesFacts, 'block_cache', ParseCache())
+    config = 'vrf context A\n  ip route 10.0.0.1/8 192.0.2.1\n'
+    for _ in range(2):
+        module = FakeModule()
+        facts = get_facts(module, config)
+        assert facts[0]['address_families'][0]['routes'][0]['dest'] == '10.0.0.0/8'
+        assert module.warnings == ['ipv4 destination 10.0.0.1/8 has host bits set, using 10.0.0.0/8']
+    assert len(Static_routesFacts.block_cache._entries) == 1
+
+
+def test_facts_store_hit_warns_again(tmp_path):
+    path = str(tmp_path / 'facts.db')
+    config = 'vrf context A\n  ip route 10.0.0.1/8 192.0.2.1\n'
+    for _ in range(2):
+        module = FakeModule(facts_store_path=path)
+        facts = get_facts(module, config)
+        assert facts[0]['address_families'][0]['routes'][0]['dest'] == '10.0.0.0/8'
+        assert module.warnings == ['ipv4 destination 10.0.0.1/8 has host bits set, using 10.0.0.0/8']
+    store = FactsStore(path)
+    assert store.get(STORE_KEY_PREFIX + FactsStore.digest(config)) == (facts, module.warnings)
+
+
+def test_facts_store_ignores_other_key_prefixes(tmp_path):
+    path = str(tmp_path / 'facts.db')
+    config = 'ip route 10.0.0.0/8 192.0.2.1\n'
+    # an entry of an earlier layout of the stored facts
+    FactsStore(path).set('static_routes/1:' + FactsStore.digest(config), [{'vrf': 'stale'}])
+    facts = get_facts(FakeModule(facts_store_path=path), config)
+    assert facts[0]['address_families'][0]['routes'][0]['dest'] == '10.0.0.0/8'
+
+
+def json_connection(text=None):
+    outputs = {
+        'show ip static-route vrf all | json': load_fixture('show_ip_static-route_vrf_all.json'),
+        'show ipv6 static-route vrf all | json': load_fixture('show_ipv6_static-route_vrf_all.json'),
+    }
+    if text is not None:
+        outputs[SECTION_COMMAND] = text
+    return FakeConnection(outputs)
+
+
+def test_json_backend_matches_text_backend():
+    text = get_facts(FakeModule(gather_mode='section'), connection=FakeConnection(
+        {SECTION_COMMAND: load_fixture('nxos_static_routes_running.cfg')}))
+    connection = json_connection()
+    assert get_facts(FakeModule(gather_mode='json'), connection=connection) == text
+    assert SECTION_COMMAND not in connection.gets
+
+
+def test_json_backend_keeps_route_leak_to_default():
+    facts = get_facts(FakeModule(gather_mode='json'), connection=json_connection())
+    vrf_a = [vrf for vrf in facts if vrf['vrf'] == 'A'][0]
+    routes = vrf_a['address_families'][0]['routes']
+    assert routes[0] == {'dest': '10.1.0.0/16', 'next_hops': [
+        {'forward_router_address': '192.0.2.1', 'dest_vrf': 'default'}]}
+    assert routes[1]['next_hops'] == [{'forward_router_address': '10.2.255.1', 'tag': 40}]
+
+
+def test_json_backend_falls_back_to_text():
+    text = load_fixture('nxos_static_routes_running.cfg')
+    connection = FakeConnection({SECTION_COMMAND: text})
+    facts = get_facts(FakeModule(gather_mode='json'), connection=connection)
+    assert facts == get_facts(FakeModule(), text)
+    assert connection.gets[-1] == SECTION_COMMAND
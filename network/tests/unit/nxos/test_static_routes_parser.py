@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import io
+import sys
+
+import pytest
+
+from ansible.module_utils.network.nxos.facts.static_routes.static_routes import Static_routesFacts
+
+from .nxos_module import FakeModule, load_fixture
+
+# the route lines, and what the regex based parser the tokenizer replaced
+# made of each of them
+LINES = load_fixture('nxos_static_routes_lines.cfg').splitlines()
+EXPECTED = load_fixture('nxos_static_routes_lines.json')
+
+
+@pytest.fixture
+def facts():
+    return Static_routesFacts(FakeModule())
+
+
+@pytest.mark.parametrize('line, expected', list(zip(LINES, EXPECTED)))
+def test_inner_dict_matches_regex_parser(facts, line, expected):
+    assert facts.get_inner_dict(line, {}) == expected
+
+
+@pytest.mark.parametrize('interface', ['Vlan10', 'mgmt0', 'port-channel5', 'loopback0'])
+def test_inner_dict_interface_without_slash(facts, interface):
+    # the regex parser only recognized interfaces with a '/'
+    inner_dict = facts.get_inner_dict('ip route 10.0.0.0/8 %s 192.0.2.1 3' % interface, {})
+    assert inner_dict['interface'] == interface
+    assert inner_dict['forward_router_address'] == '192.0.2.1'
+    assert inner_dict['admin_distance'] == '3'
+
+
+def test_inner_dict_numeric_name_is_not_admin_distance(facts):
+    # the regex parser also took the '5' of 'name 5' as the preference
+    inner_dict = facts.get_inner_dict('ip route 10.0.0.0/8 192.0.2.1 name 5', {})
+    assert inner_dict['route_name'] == '5'
+    assert 'admin_distance' not in inner_dict
+
+
+def test_inner_dict_ipv4_mapped_ipv6_dest(facts):
+    inner_dict = facts.get_inner_dict('ipv6 route ::ffff:10.0.0.0/104 2001:db8::1', {})
+    assert inner_dict['afi'] == 'ipv6'
+
+
+SCAN_CONFIG = (b'vrf context A\n'
+               b'  description route reflector\n'
+               b'  ip route 10.0.0.0/8 192.0.2.1 name cafe\n'
+               b'  ipv6 route 2001:db8::/32 2001:db8::1\n'
+               b'interface Ethernet1/1\n'
+               b'  description to route 66\n'
+               b'ip route 172.16.0.0/12 Null0\n'
+               b'vrf context B\n'
+               b'  address-family ipv4 unicast\n'
+               b'vrf context C\n'
+               b'  ip route 192.168.0.0/16 192.0.2.9 5\n'
+               b'ip route 0.0.0.0/0 192.0.2.254\n')
+
+
+def parse(data):
+    # the config lines of a path are scanned from the file, of anything
+    # else split from the text
+    parser = Static_routesFacts(FakeModule())
+    facts = {'ansible_network_resources': {}}
+    parser.render_facts(facts, lines=parser.get_config_lines(data))
+    return facts['ansible_network_resources'].get('static_routes')
+
+
+@pytest.mark.parametrize('raw', [
+    SCAN_CONFIG,
+    SCAN_CONFIG.replace(b'\n', b'\r\n'),
+    SCAN_CONFIG.rstrip(b'\n'),
+    SCAN_CONFIG.replace(b'\n', b'\r\n').rstrip(b'\r\n'),
+    b'ip route 10.0.0.0/8 192.0.2.1',
+    b'\n\nvrf context A\n  ip route 10.0.0.0/8 192.0.2.1\n\n',
+    b'hostname leaf1\n',
+    b'',
+], ids=['lf', 'crlf', 'lf-no-trailing-newline', 'crlf-no-trailing-newline',
+        'one-line', 'blank-lines', 'no-routes', 'empty'])
+def test_file_scan_matches_text(tmp_path, raw):
+    path = tmp_path / 'running.cfg'
+    path.write_bytes(raw)
+    assert parse(str(path)) == parse(raw.decode('utf-8'))
+
+
+@pytest.mark.skipif(sys.version_info < (3,), reason='bytes that are not UTF-8 fail to decode on python 2')
+def test_file_scan_keeps_undecodable_bytes(tmp_path):
+    path = tmp_path / 'running.cfg'
+    raw = SCAN_CONFIG.replace(b'name cafe', b'name caf\xe9')
+    path.write_bytes(raw)
+    facts = parse(str(path))
+    assert facts == parse(raw.decode('utf-8', 'surrogateescape'))
+    assert facts[0]['address_families'][0]['routes'][0]['next_hops'][0]['route_name'] == u'caf\udce9'
+
+
+def test_file_scan_lines(tmp_path):
+    path = tmp_path / 'running.cfg'
+    path.write_bytes(SCAN_CONFIG.replace(b'\n', b'\r\n'))
+    assert list(Static_routesFacts(FakeModule()).get_file_lines(str(path))) == [
+        'vrf context A',
+        '  ip route 10.0.0.0/8 192.0.2.1 name cafe',
+        '  ipv6 route 2001:db8::/32 2001:db8::1',
+        '!',
+        'ip route 172.16.0.0/12 Null0',
+        'vrf context B',
+        'vrf context C',
+        '  ip route 192.168.0.0/16 192.0.2.9 5',
+        '!',
+        'ip route 0.0.0.0/0 192.0.2.254',
+    ]
+
+
+CONFIG_TEXT = SCAN_CONFIG.decode('utf-8')
+
+
+def test_config_lines_of_text():
+    parser = Static_routesFacts(FakeModule())
+    assert list(parser.get_config_lines('a\n  b\n\nc\n')) == ['a', '  b', '', 'c']
+    assert list(parser.get_config_lines('a\n  b')) == ['a', '  b']
+    assert list(parser.get_config_lines('\n')) == ['']
+
+
+def test_config_lines_of_a_path(tmp_path):
+    path = tmp_path / 'running.cfg'
+    path.write_bytes(SCAN_CONFIG)
+    parser = Static_routesFacts(FakeModule())
+    # only the lines the routes are parsed from are read
+    assert list(parser.get_config_lines(str(path))) == list(parser.get_file_lines(str(path)))
+    # a line without a file of its name is config text
+    assert list(parser.get_config_lines(str(tmp_path / 'missing.cfg'))) == [str(tmp_path / 'missing.cfg')]
+
+
+def test_config_lines_are_streamed():
+    consumed = []
+
+    def lines():
+        for line in CONFIG_TEXT.splitlines():
+            consumed.append(line)
+            yield line
+
+    config_lines = Static_routesFacts(FakeModule()).get_config_lines(lines())
+    assert consumed == []
+    assert next(config_lines) == 'vrf context A'
+    assert consumed == ['vrf context A']
+
+
+@pytest.mark.parametrize('kind', ['text', 'path', 'file', 'generator', 'list'])
+def test_config_kinds_parse_alike(tmp_path, kind):
+    path = tmp_path / 'running.cfg'
+    path.write_bytes(SCAN_CONFIG)
+    data = {
+        'text': CONFIG_TEXT,
+        'path': str(path),
+        'file': io.StringIO(CONFIG_TEXT),
+        'generator': (line for line in CONFIG_TEXT.splitlines()),
+        'list': CONFIG_TEXT.splitlines(True),
+    }[kind]
+    assert parse(data) == parse(CONFIG_TEXT)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import pytest
+
+from ansible.module_utils.network.nxos.utils.submit import split_batches, submit_batches
+
+COMMANDS = ['vrf context A', 'a1', 'a2', 'a3', 'vrf context B', 'b1']
+
+
+class DeviceError(Exception):
+    pass
+
+
+class RecordingConnection(object):
+    """ Records the calls it is sent, in order, and fails the one numbered
+        fail_at (from 1) with DeviceError
+    """
+
+    def __init__(self, fail_at=None, stateless=False):
+        self.calls = []
+        self.fail_at = fail_at
+        self.stateless = stateless
+
+    def _call(self, method, commands):
+        self.calls.append((method, list(commands)))
+        if len(self.calls) == self.fail_at:
+            raise DeviceError('%s failed' % commands[-1])
+        return ['' for command in commands]
+
+    def edit_config(self, candidate):
+        return self._call('edit_config', candidate)
+
+    def run_commands(self, commands):
+        return self._call('run_commands', commands)
+
+
+@pytest.mark.parametrize('batch_size', [None, 0, -1, 6, 100])
+def test_split_batches_unlimited(batch_size):
+    assert split_batches(COMMANDS, batch_size) == [COMMANDS]
+
+
+def test_split_batches_no_commands():
+    assert split_batches([], 3) == []
+
+
+@pytest.mark.parametrize('batch_size', [1, 2])
+def test_split_batches_one_command_per_batch(batch_size):
+    # a header and at least one command fit in every batch
+    assert split_batches(COMMANDS, batch_size) == [
+        ['vrf context A', 'a1'], ['vrf context A', 'a2'],
+        ['vrf context A', 'a3'], ['vrf context B', 'b1']]
+
+
+def test_split_batches_repeats_header():
+    assert split_batches(COMMANDS, 3) == [
+        ['vrf context A', 'a1', 'a2'], ['vrf context A', 'a3'], ['vrf context B', 'b1']]
+
+
+def test_split_batches_ends_at_header():
+    assert split_batches(COMMANDS, 4) == [
+        ['vrf context A', 'a1', 'a2', 'a3'], ['vrf context B', 'b1']]
+
+
+def test_split_batches_without_header():
+    assert split_batches(['x1', 'x2', 'x3'], 2) == [['x1', 'x2'], ['x3']]
+
+
+def test_submit_batches():
+    connection = RecordingConnection()
+    batches = split_batches(COMMANDS, 4)
+    stats = submit_batches(connection, batches)
+    assert connection.calls == [('edit_config', batch) for batch in batches]
+    assert [s['commands'] for s in stats] == [4, 2]
+
+
+def test_submit_batches_error_stops_the_batches():
+    connection = RecordingConnection(fail_at=1)
+    with pytest.raises(DeviceError):
+        submit_batches(connection, split_batches(COMMANDS, 4))
+    assert connection.calls == [('edit_config', COMMANDS[:4])]
+
+
+def test_submit_batches_session():
+    connection = RecordingConnection()
+    stats = submit_batches(connection, split_batches(COMMANDS, 4), 'plan')
+    assert connection.calls == [
+        ('run_commands', ['configure session plan']),
+        ('run_commands', COMMANDS[:4]),
+        ('run_commands', COMMANDS[4:]),
+        ('run_commands', ['commit'])]
+    assert stats[-1]['commit'] is True
+
+
+def test_submit_batches_session_error_aborts():
+    connection = RecordingConnection(fail_at=3)
+    with pytest.raises(DeviceError) as exc:
+        submit_batches(connection, split_batches(COMMANDS, 4), 'plan')
+    assert str(exc.value) == 'b1 failed'
+    assert connection.calls[-1] == ('run_commands', ['abort'])
+    assert ('run_commands', ['commit']) not in connection.calls
+
+
+def test_submit_batches_stateless_session():
+    connection = RecordingConnection(stateless=True)
+    stats = submit_batches(connection, split_batches(COMMANDS, 4), 'plan')
+    assert connection.calls == [
+        ('edit_config', ['configure session plan'] + COMMANDS + ['commit'])]
+    assert stats == [{'commands': 6, 'commit': True, 'elapsed': stats[0]['elapsed']}]
+
+
+def test_submit_batches_stateless_session_error_aborts():
+    connection = RecordingConnection(fail_at=1, stateless=True)
+    with pytest.raises(DeviceError):
+        submit_batches(connection, split_batches(COMMANDS, 4), 'plan')
+    assert connection.calls[-1] == ('edit_config', ['configure session plan', 'abort'])
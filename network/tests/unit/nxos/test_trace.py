@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import json
+import threading
+
+import pytest
+
+from ansible.module_utils.network.nxos.config.static_routes.static_routes import Static_routes
+from ansible.module_utils.network.nxos.utils.trace import NULL_TRACER, Tracer, get_tracer
+
+from .nxos_module import FakeConnection, FakeModule
+
+SECTION_COMMAND = "show running-config | section '^ip(v6)* route|^vrf context'"
+
+MERGED = [{'address_families': [{'afi': 'ipv4', 'routes': [
+    {'dest': '10.0.0.0/8', 'next_hops': [{'forward_router_address': '192.0.2.2'}]}]}]}]
+
+
+def run(state, **params):
+    connection = FakeConnection({SECTION_COMMAND: 'ip route 10.0.0.0/8 192.0.2.1\n'})
+    module = FakeModule(connection, state=state, config=MERGED, **params)
+    return module, Static_routes(module).execute_module()
+
+
+def read_spans(path):
+    with open(str(path)) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_gathered_trace_path(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    _module, result = run('gathered', trace_path=str(path))
+    spans = read_spans(path)
+    assert result['timings'] == spans
+    # a span is written when it ends, the phases before the gather
+    assert [span['name'] for span in spans] == ['fetch', 'parse', 'validate', 'gather']
+    gather = spans[-1]
+    assert 'parent' not in gather
+    for span in spans[:-1]:
+        assert span['parent'] == gather['id']
+        assert span['resource'] == 'static_routes'
+        assert gather['start'] <= span['start'] <= span['start'] + span['elapsed'] <= gather['start'] + gather['elapsed']
+    assert spans[0]['commands'] == 1
+    assert len(set(span['id'] for span in spans)) == 4
+
+
+def test_merged_trace_path_appends(tmp_path):
+    path = tmp_path / 'trace.jsonl'
+    run('gathered', trace_path=str(path))
+    _module, result = run('merged', trace_path=str(path))
+    spans = read_spans(path)
+    # the after is parsed from the config the commands make, not fetched
+    assert [span['name'] for span in spans[4:]] == [
+        'fetch', 'parse', 'validate', 'gather', 'diff', 'edit_config', 'parse', 'validate', 'gather']
+    assert result['timings'] == spans[4:]
+    assert [span.get('parent') for span in result['timings']] == [1, 1, 1, None, None, None, 7, 7, None]
+    assert result['timings'][5]['commands'] == 2
+
+
+def test_trace_without_path():
+    module, result = run('merged', trace=True)
+    assert [span['name'] for span in result['timings']] == [
+        'fetch', 'parse', 'validate', 'gather', 'diff', 'edit_config', 'parse', 'validate', 'gather']
+    assert get_tracer(module).path is None
+
+
+def test_trace_off(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    module, result = run('merged')
+    assert 'timings' not in result
+    assert get_tracer(module) is NULL_TRACER
+    assert NULL_TRACER.spans == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_span_error():
+    tracer = Tracer(True)
+    with pytest.raises(ValueError):
+        with tracer.span('outer'):
+            with tracer.span('inner', resource='static_routes'):
+                raise ValueError('invalid command')
+    inner, outer = tracer.spans
+    assert inner['error'] == outer['error'] == 'ValueError'
+    assert inner['parent'] == outer['id']
+    assert inner['resource'] == 'static_routes'
+
+
+def test_spans_nest_per_thread():
+    tracer = Tracer(True)
+    started = threading.Event()
+    release = threading.Event()
+
+    def worker():
+        with tracer.span('worker'):
+            started.set()
+            release.wait(5)
+
+    with tracer.span('outer'):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        started.wait(5)
+        # the span open in the worker is not the parent of this one
+        with tracer.span('inner'):
+            pass
+        release.set()
+        thread.join()
+    spans = dict((span['name'], span) for span in tracer.spans)
+    assert spans['inner']['parent'] == spans['outer']['id']
+    assert 'parent' not in spans['worker']
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019 Red Hat
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+import json
+
+import pytest
+
+from ansible.module_utils.network.common.utils import remove_empties, validate_config
+from ansible.module_utils.network.nxos.argspec.static_routes.static_routes import Static_routesArgs
+from ansible.module_utils.network.nxos.utils.utils import ContextCommands, SpecValidationError, spec_validator
+
+SPEC = Static_routesArgs.argument_spec
+
+
+def route(**next_hop):
+    return {'config': [{'vrf': 'A', 'address_families': [{'afi': 'ipv4', 'routes': [
+        {'dest': '10.0.0.0/8', 'next_hops': [next_hop]}]}]}]}
+
+
+def generic(data, capsys):
+    """ What validate_config and remove_empties make of the data, or the
+        message AnsibleModule fails with
+    """
+    try:
+        return remove_empties(validate_config(SPEC, data))
+    except SystemExit:
+        return SpecValidationError(json.loads(capsys.readouterr().out)['msg'])
+
+
+def fast(data):
+    try:
+        return spec_validator(SPEC)(data)
+    except SpecValidationError as exc:
+        return exc
+
+
+@pytest.mark.parametrize('data', [
+    {},
+    {'state': 'deleted', 'batch_size': '5'},
+    {'batch_size': 5, 'config_session': 42},
+    {'verify_after': 'yes', 'trace': 'off'},
+    {'verify_after': 1, 'trace': 0},
+    {'verify_after': True, 'trace': 'False'},
+    {'facts_store_path': '~/facts.db', 'trace_path': '$NXOS_TRACE_DIR/trace.jsonl'},
+    {'config': []},
+    route(forward_router_address='192.0.2.1', admin_distance='5', tag=7, route_name=''),
+    route(forward_router_address='192.0.2.1', interface='Ethernet1/1', dest_vrf=None),
+], ids=['empty', 'int-string', 'str-int', 'bool-strings', 'bool-ints', 'bool-mixed',
+        'path', 'empty-config', 'nested-types', 'nested-none'])
+def test_spec_validator_matches_validate_config(data, capsys, monkeypatch):
+    monkeypatch.setenv('HOME', '/home/nxos')
+    monkeypatch.setenv('NXOS_TRACE_DIR', '/var/tmp')
+    assert fast(data) == generic(data, capsys)
+
+
+@pytest.mark.parametrize('data', [
+    {'state': 'merge'},
+    {'gather_mode': 'JSON'},
+    {'batch_size': 'many'},
+    {'batch_size': 2.5},
+    {'verify_after': 'maybe'},
+    {'trace': [True]},
+    {'config': [{'address_families': [{'routes': []}]}]},
+    {'config': [{'address_families': [{'afi': 'ipv5'}]}]},
+    route(admin_distance=5),
+    route(forward_router_address='192.0.2.1', admin_distance='five'),
+    # the first missing option of a level is reported before the types
+    route(admin_distance='five'),
+], ids=['choices', 'choices-case', 'int', 'int-float', 'bool', 'bool-list',
+        'nested-required', 'nested-choices', 'nested-list-required', 'nested-list-int',
+        'required-before-type'])
+def test_spec_validator_fails_like_validate_config(data, capsys):
+    error = fast(data)
+    assert isinstance(error, SpecValidationError)
+    assert str(error) == str(generic(data, capsys))
+
+
+@pytest.mark.parametrize('data', [
+    {'stat': 'merged'},
+    {'config': [{'vrf': 'A', 'afi': 'ipv4'}]},
+], ids=['top', 'nested'])
+def test_spec_validator_unsupported_like_validate_config(data, capsys):
+    # AnsibleModule names the module, there is none here
+    expected = str(generic(data, capsys)).replace(
+        'Unsupported parameters for (basic.py) module:', 'unsupported parameters:')
+    assert str(fast(data)) == expected
+
+
+def test_spec_validator_unsupported_type():
+    validate = spec_validator({'ports': {'type': 'list', 'elements': 'int'}})
+    with pytest.raises(SpecValidationError) as exc:
+        validate({'ports': [1]})
+    assert str(exc.value) == 'type list of ports is not supported'
+
+
+def commands(*pairs):
+    context_commands = ContextCommands()
+    for header, command in pairs:
+        context_commands.add(header, command)
+    return context_commands
+
+
+def test_context_commands_group_by_header():
+    context_commands = commands(
+        ('vrf context A', 'ip route 10.0.0.0/8 192.0.2.1'),
+        ('vrf context default', 'ip route 0.0.0.0/0 192.0.2.254'),
+        ('vrf context A', 'ip route 172.16.0.0/12 192.0.2.2'))
+    # the headers in the order first seen, each with its commands
+    assert list(context_commands.groups()) == [
+        ('vrf context A', ['ip route 10.0.0.0/8 192.0.2.1', 'ip route 172.16.0.0/12 192.0.2.2']),
+        ('vrf context default', ['ip route 0.0.0.0/0 192.0.2.254'])]
+    assert list(context_commands) == [
+        'vrf context A', 'ip route 10.0.0.0/8 192.0.2.1', 'ip route 172.16.0.0/12 192.0.2.2',
+        'vrf context default', 'ip route 0.0.0.0/0 192.0.2.254']
+    assert len(context_commands) == 3
+
+
+def test_context_commands_keep_the_first_of_duplicates():
+    context_commands = commands(
+        ('vrf context A', 'no ip route 10.0.0.0/8 192.0.2.1'),
+        ('vrf context A', 'ip route 10.0.0.0/8 192.0.2.2'),
+        ('vrf context A', 'no ip route 10.0.0.0/8 192.0.2.1'),
+        ('vrf context B', 'ip route 10.0.0.0/8 192.0.2.2'))
+    assert list(context_commands) == [
+        'vrf context A', 'no ip route 10.0.0.0/8 192.0.2.1', 'ip route 10.0.0.0/8 192.0.2.2',
+        'vrf context B', 'ip route 10.0.0.0/8 192.0.2.2']
+    assert len(context_commands) == 3
+
+
+def test_context_commands_discard():
+    context_commands = commands(
+        ('vrf context A', 'ip route 10.0.0.0/8 192.0.2.1'),
+        ('vrf context A', 'ip route 10.0.0.0/8 192.0.2.2'),
+        ('vrf context B', 'ip route 10.0.0.0/8 192.0.2.3'))
+    context_commands.discard('vrf context A', 'ip route 10.0.0.0/8 192.0.2.1')
+    context_commands.discard('vrf context A', 'ip route 10.0.0.0/8 192.0.2.9')
+    context_commands.discard('vrf context C', 'ip route 10.0.0.0/8 192.0.2.1')
+    context_commands.discard('vrf context B', 'ip route 10.0.0.0/8 192.0.2.3')
+    # a group left empty is skipped, a command added again goes last
+    context_commands.add('vrf context A', 'ip route 10.0.0.0/8 192.0.2.1')
+    assert list(context_commands) == [
+        'vrf context A', 'ip route 10.0.0.0/8 192.0.2.2', 'ip route 10.0.0.0/8 192.0.2.1']
+    assert list(context_commands.groups()) == [
+        ('vrf context A', ['ip route 10.0.0.0/8 192.0.2.2', 'ip route 10.0.0.0/8 192.0.2.1'])]
+    assert len(context_commands) == 2
+
+
+def test_context_commands_extend():
+    context_commands = commands(
+        ('vrf context A', 'ip route 10.0.0.0/8 192.0.2.1'))
+    context_commands.extend(commands(
+        ('vrf context B', 'ip route 10.0.0.0/8 192.0.2.2'),
+        ('vrf context A', 'ip route 10.0.0.0/8 192.0.2.1'),
+        ('vrf context A', 'ip route 10.0.0.0/8 192.0.2.3')))
+    assert list(context_commands) == [
+        'vrf context A', 'ip route 10.0.0.0/8 192.0.2.1', 'ip route 10.0.0.0/8 192.0.2.3',
+        'vrf context B', 'ip route 10.0.0.0/8 192.0.2.2']
+    assert len(context_commands) == 3
+
+
+def test_context_commands_empty():
+    assert list(ContextCommands()) == []
+    assert len(ContextCommands()) == 0